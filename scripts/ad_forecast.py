@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+AeyeScan 広告試算&実績シートの着地予測エンジン
+月ごとのシート（広告試算&実績_YYYYMM.csv）をまとめて読み、キャンペーン×月の実績・目標を配列にして、
+消化ペース・月末着地・CPA・リード・商談数の予測を全キャンペーン・全月まとめて計算する
+予算配分を変えた場合の商談数（what-if）も、数千通りの配分をまとめて試算できる
+
+シートごとに列の位置がずれているので、見出し（IMP, Click, COST, ...）の位置から列を探す。
+着地はシートと同じく「実績 × 当月日数 / 更新日」で換算する
+
+使い方:
+    python scripts/ad_forecast.py                                    # 最新月のキャンペーン別着地予測
+    python scripts/ad_forecast.py forecast --all                     # 全月
+    python scripts/ad_forecast.py sweep --budget 3400000 --scenarios 10000 --elasticity 0.8
+"""
+
+import argparse
+import csv
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+import csv_ingest
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT / "クライアント" / "AeyeScan"
+SHEET_GLOB = "*広告試算&実績_*.csv"
+SHEET_MONTH_PATTERN = re.compile(r"_(\d{4})(\d{2})\.csv$")
+
+# シートの見出し: 配列の指標（CTR・CPC・CVR・CPAは合計から計算し直すので読まない）
+COUNT_COLUMNS = {
+    "IMP": "imp",
+    "Click": "click",
+    "COST": "cost",
+    "フォーム到達": "form",
+    "完了": "cv",
+    "AdsCV": "cv",
+    "リード": "lead",
+    "商談数": "deal",
+}
+METRICS = ("imp", "click", "cost", "form", "cv", "lead", "deal")
+M = {metric: i for i, metric in enumerate(METRICS)}
+
+# 完了→リード→商談の遷移率（202511広告試算_商談数込み のプランと同じ値。シートにリード・商談がない月に使う）
+LEAD_RATE = 0.8
+DEAL_RATE = 0.3
+
+# 集計ブロック（キャンペーン別のブロックと重複するので読まない）
+AGGREGATE_TITLES = ("全施策合計着地", "着地見込み", "着地", "当初目標値")
+AGGREGATE_SUFFIX = "_合計"
+WEEK_PATTERN = re.compile(r"^\d+週目")
+
+# what-if の既定値
+DEFAULT_SCENARIOS = 10000
+DEFAULT_ELASTICITY = 1.0  # 1なら予算に比例、1未満なら予算を増やすほど効率が落ちる
+DEFAULT_MIN_SHARE = 0.0  # キャンペーンごとの最低配分比率
+
+
+def parse_number(text):
+    """「¥1,067」「-¥36,288」「12%」「#DIV/0!」を数値にする（空欄・エラーはNaN、%は割合）"""
+    value = csv_ingest.parse_number(text)
+    return np.nan if value is None else float(value)
+
+
+def find_label(row, before):
+    """行のラベル（指標の列より左で最初に値がある列）"""
+    for cell in row[:before]:
+        if cell.strip():
+            return cell.strip()
+    return ""
+
+
+def read_sheet(csv_path):
+    """シート1枚から (更新日, 当月日数, {キャンペーン: {"target", "actual", "sheet_projection", "weeks"}}) を読む"""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+
+    elapsed = days = None
+    for row in rows[:5]:
+        for i, cell in enumerate(row[:-1]):
+            if cell == "更新日":
+                elapsed = parse_number(row[i + 1])
+            elif cell == "当月日数":
+                days = parse_number(row[i + 1])
+    if not elapsed or not days:
+        raise ValueError(f"更新日・当月日数が見つかりません: {csv_path}")
+
+    campaigns = {}
+    i = 0
+    while i < len(rows) - 1:
+        row, header = rows[i], rows[i + 1]
+        cells = [cell.strip() for cell in row if cell.strip()]
+        if len(cells) != 1 or "IMP" not in header or "キャンペーン" in header:
+            i += 1
+            continue
+
+        title = cells[0]
+        columns = {COUNT_COLUMNS[name]: j for j, name in enumerate(header) if name in COUNT_COLUMNS}
+        first_value = min(columns.values())
+        block = {"target": None, "actual": None, "sheet_projection": None, "weeks": []}
+        i += 2
+        while i < len(rows) and any(cell.strip() for cell in rows[i]):
+            label = find_label(rows[i], first_value)
+            values = np.full(len(METRICS), np.nan)
+            for metric, j in columns.items():
+                if j < len(rows[i]):
+                    values[M[metric]] = parse_number(rows[i][j])
+            if label == "目標値":
+                block["target"] = values
+            elif label == "合計":
+                block["actual"] = values
+            elif label == "着地見込み":
+                block["sheet_projection"] = values
+            elif WEEK_PATTERN.match(label):
+                block["weeks"].append(values)
+            i += 1
+
+        if title in AGGREGATE_TITLES or title.endswith(AGGREGATE_SUFFIX):
+            continue
+        if block["actual"] is not None:
+            campaigns[title] = block
+    return elapsed, days, campaigns
+
+
+class AdData:
+    """キャンペーン×月の実績・目標の配列（行: (月, キャンペーン)、列: METRICS）"""
+
+    def __init__(self, months, campaigns, elapsed, days, actual, target, sheet_projection):
+        self.months = months  # 行ごとの "YYYY-MM"
+        self.campaigns = campaigns  # 行ごとのキャンペーン名
+        self.elapsed = elapsed
+        self.days = days
+        self.actual = actual
+        self.target = target
+        self.sheet_projection = sheet_projection
+
+    def __len__(self):
+        return len(self.months)
+
+    def rows_for(self, month):
+        return np.flatnonzero(self.months == month)
+
+    @property
+    def latest_month(self):
+        return max(self.months) if len(self.months) else None
+
+
+def load_sheets(data_dir=DATA_DIR):
+    """全月のシートを読み、AdData にまとめる"""
+    months, campaigns, elapsed, days = [], [], [], []
+    actual, target, projection = [], [], []
+    for csv_path in sorted(Path(data_dir).glob(SHEET_GLOB)):
+        match = SHEET_MONTH_PATTERN.search(csv_path.name)
+        if not match:
+            continue
+        month = f"{match.group(1)}-{match.group(2)}"
+        sheet_elapsed, sheet_days, blocks = read_sheet(csv_path)
+        for name, block in blocks.items():
+            months.append(month)
+            campaigns.append(name)
+            elapsed.append(sheet_elapsed)
+            days.append(sheet_days)
+            actual.append(block["actual"])
+            empty = np.full(len(METRICS), np.nan)
+            target.append(block["target"] if block["target"] is not None else empty)
+            projection.append(block["sheet_projection"] if block["sheet_projection"] is not None else empty)
+
+    shape = (len(months), len(METRICS))
+    return AdData(
+        np.array(months), np.array(campaigns), np.array(elapsed, dtype=float), np.array(days, dtype=float),
+        np.array(actual, dtype=float).reshape(shape), np.array(target, dtype=float).reshape(shape),
+        np.array(projection, dtype=float).reshape(shape),
+    )
+
+
+def divide(numerator, denominator):
+    """0・NaNで割る箇所はNaNにする割り算"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((denominator != 0) & ~np.isnan(denominator), numerator / denominator, np.nan)
+
+
+def funnel(counts, lead_rate=LEAD_RATE, deal_rate=DEAL_RATE):
+    """リード・商談数（シートにない月は 完了×遷移率 で補う）"""
+    cv = counts[:, M["cv"]]
+    lead = np.where(np.isnan(counts[:, M["lead"]]), cv * lead_rate, counts[:, M["lead"]])
+    deal = np.where(np.isnan(counts[:, M["deal"]]), lead * deal_rate, counts[:, M["deal"]])
+    return lead, deal
+
+
+def forecast(data, lead_rate=LEAD_RATE, deal_rate=DEAL_RATE):
+    """全キャンペーン・全月の着地予測を1回の配列演算で計算し、列ごとの配列の辞書を返す"""
+    factor = data.days / data.elapsed
+    projected = data.actual * factor[:, None]
+    lead, deal = funnel(projected, lead_rate, deal_rate)
+    target_lead, target_deal = funnel(data.target, lead_rate, deal_rate)
+
+    cost = projected[:, M["cost"]]
+    target_cost = data.target[:, M["cost"]]
+    return {
+        "month": data.months,
+        "campaign": data.campaigns,
+        "progress": data.elapsed / data.days,
+        # 消化ペース: 経過日数分の目標予算に対する実績コストの比率（1.0なら予定どおり）
+        "pace": divide(data.actual[:, M["cost"]], target_cost * data.elapsed / data.days),
+        "cost": cost,
+        "target_cost": target_cost,
+        "click": projected[:, M["click"]],
+        "cpc": divide(cost, projected[:, M["click"]]),
+        "cv": projected[:, M["cv"]],
+        "target_cv": data.target[:, M["cv"]],
+        "cpa": divide(cost, projected[:, M["cv"]]),
+        "target_cpa": divide(target_cost, data.target[:, M["cv"]]),
+        "lead": lead,
+        "deal": deal,
+        "target_deal": target_deal,
+        "deal_cpa": divide(cost, deal),
+        "target_deal_cpa": divide(target_cost, target_deal),
+    }
+
+
+def campaign_rates(data, month, lead_rate=LEAD_RATE, deal_rate=DEAL_RATE):
+    """
+    what-if の基準（月のキャンペーンごとの着地コスト・商談数）
+
+    実績コストか実績の商談数が0のキャンペーンは目標値を使う（商談0を基準にすると、配分を増やしても商談が増えない扱いになる）
+    """
+    rows = data.rows_for(month)
+    factor = (data.days[rows] / data.elapsed[rows])[:, None]
+    projected = data.actual[rows] * factor
+    _, projected_deal = funnel(projected, lead_rate, deal_rate)
+    use_target = ~(projected[:, M["cost"]] > 0) | ~(projected_deal > 0)
+    base = np.where(use_target[:, None], data.target[rows], projected)
+    _, deal = funnel(base, lead_rate, deal_rate)
+    return data.campaigns[rows], np.nan_to_num(base[:, M["cost"]]), np.nan_to_num(deal), use_target
+
+
+def random_allocations(n_scenarios, n_campaigns, budget, min_share=DEFAULT_MIN_SHARE, seed=0):
+    """合計が budget になる予算配分を n_scenarios 通り生成（各キャンペーンに min_share 以上を配分）"""
+    rng = np.random.default_rng(seed)
+    shares = rng.dirichlet(np.ones(n_campaigns), size=n_scenarios)
+    shares = min_share + shares * (1 - min_share * n_campaigns)
+    return shares * budget
+
+
+def sweep(allocations, base_cost, base_deal, elasticity=DEFAULT_ELASTICITY):
+    """予算配分ごとの商談数・商談CPAをまとめて計算する
+
+    キャンペーンの商談数は 基準の商談数 × (配分 / 基準コスト) ^ elasticity と仮定する。
+    allocations は (配分の数, キャンペーン数) の配列。
+    """
+    scale = divide(allocations, base_cost[None, :])
+    deals = np.nan_to_num(base_deal[None, :] * np.power(np.nan_to_num(scale), elasticity))
+    total_deals = deals.sum(axis=1)
+    total_cost = allocations.sum(axis=1)
+    return deals, total_deals, divide(total_cost, total_deals)
+
+
+def fmt_yen(value):
+    return "-" if np.isnan(value) else f"¥{value:,.0f}"
+
+
+def fmt_count(value, digits=0):
+    return "-" if np.isnan(value) else f"{value:,.{digits}f}"
+
+
+def fmt_ratio(value):
+    return "-" if np.isnan(value) else f"{value:.0%}"
+
+
+def print_forecast(result, rows):
+    print(f"{'月':<8} {'キャンペーン':<28} {'経過':>5} {'ペース':>6} {'着地COST':>12} {'目標COST':>12} "
+          f"{'CV':>6} {'CPA':>10} {'リード':>6} {'商談':>6} {'商談CPA':>11} {'目標商談':>8}")
+    for i in rows:
+        print(f"{result['month'][i]:<8} {result['campaign'][i]:<28} {fmt_ratio(result['progress'][i]):>5} "
+              f"{fmt_ratio(result['pace'][i]):>6} {fmt_yen(result['cost'][i]):>12} "
+              f"{fmt_yen(result['target_cost'][i]):>12} {fmt_count(result['cv'][i], 1):>6} "
+              f"{fmt_yen(result['cpa'][i]):>10} {fmt_count(result['lead'][i], 1):>6} "
+              f"{fmt_count(result['deal'][i], 1):>6} {fmt_yen(result['deal_cpa'][i]):>11} "
+              f"{fmt_count(result['target_deal'][i], 1):>8}")
+
+    months = result["month"][rows]
+    for month in np.unique(months):
+        selected = rows[months == month]
+        cost = np.nansum(result["cost"][selected])
+        deal = np.nansum(result["deal"][selected])
+        print(f"{month:<8} {'合計':<28} {'':>5} {'':>6} {fmt_yen(cost):>12} "
+              f"{fmt_yen(np.nansum(result['target_cost'][selected])):>12} "
+              f"{fmt_count(np.nansum(result['cv'][selected]), 1):>6} {'':>10} "
+              f"{fmt_count(np.nansum(result['lead'][selected]), 1):>6} {fmt_count(deal, 1):>6} "
+              f"{fmt_yen(cost / deal if deal else np.nan):>11} "
+              f"{fmt_count(np.nansum(result['target_deal'][selected]), 1):>8}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AeyeScan 広告試算&実績シートの着地予測")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--lead-rate", type=float, default=LEAD_RATE, help="完了→リードの遷移率")
+    parser.add_argument("--deal-rate", type=float, default=DEAL_RATE, help="リード→商談の遷移率")
+    subparsers = parser.add_subparsers(dest="command")
+
+    forecast_parser = subparsers.add_parser("forecast", help="キャンペーン別の着地予測（既定）")
+    forecast_parser.add_argument("--month", help="対象の年月（例: 2026-01。省略時は最新月）")
+    forecast_parser.add_argument("--all", action="store_true", help="全月を表示")
+
+    sweep_parser = subparsers.add_parser("sweep", help="予算配分を変えた場合の商談数を試算")
+    sweep_parser.add_argument("--month", help="基準にする年月（省略時は最新月）")
+    sweep_parser.add_argument("--budget", type=float, help="総予算（省略時は基準月の着地コスト合計）")
+    sweep_parser.add_argument("--scenarios", type=int, default=DEFAULT_SCENARIOS, help="試す配分の数")
+    sweep_parser.add_argument("--elasticity", type=float, default=DEFAULT_ELASTICITY,
+                              help="予算に対する商談数の弾力性（1で比例）")
+    sweep_parser.add_argument("--min-share", type=float, default=DEFAULT_MIN_SHARE,
+                              help="キャンペーンごとの最低配分比率")
+    sweep_parser.add_argument("--top", type=int, default=5, help="商談数の多い順に表示する配分の数")
+    sweep_parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+    data = load_sheets(args.data_dir)
+    if not len(data):
+        print(f"シートが見つかりません: {args.data_dir / SHEET_GLOB}")
+        return
+    loaded = time.perf_counter()
+    month = getattr(args, "month", None) or data.latest_month
+    if not len(data.rows_for(month)):
+        raise SystemExit(f"{month} のシートがありません（ある月: {', '.join(np.unique(data.months))}）")
+
+    if args.command == "sweep":
+        names, base_cost, base_deal, use_target = campaign_rates(data, month, args.lead_rate, args.deal_rate)
+        if args.min_share < 0 or args.min_share * len(names) > 1:
+            raise SystemExit(f"--min-share は 0 以上 {1 / len(names):.4g} 以下にしてください"
+                             f"（{len(names)}キャンペーンに {args.min_share} ずつ配分すると総予算を超えます）")
+        if args.budget is not None and args.budget <= 0:
+            raise SystemExit(f"--budget は 0 より大きくしてください（指定: {args.budget:g}）")
+        if base_cost.sum() <= 0:
+            raise SystemExit(f"{month} の着地コストの合計が 0 のため、今の配分を基準にできません")
+        budget = args.budget if args.budget is not None else base_cost.sum()
+        current = base_cost / base_cost.sum() * budget
+        allocations = np.vstack([current, random_allocations(args.scenarios, len(names), budget,
+                                                             args.min_share, args.seed)])
+        _, total_deals, deal_cpa = sweep(allocations, base_cost, base_deal, args.elasticity)
+        elapsed = time.perf_counter() - loaded
+
+        print(f"{month} 基準 / 総予算 {fmt_yen(budget)} / {args.scenarios:,}通り / 弾力性 {args.elasticity}")
+        for name, cost, deal, target in zip(names, base_cost, base_deal, use_target):
+            basis = "（目標値）" if target else ""
+            print(f"  {name:<28} 着地COST {fmt_yen(cost):>12}  商談 {deal:5.1f}{basis}")
+        print(f"\n現在の配分: 商談 {total_deals[0]:.1f}件 / 商談CPA {fmt_yen(deal_cpa[0])}")
+        order = np.argsort(-total_deals[1:], kind="stable")[:args.top] + 1
+        for rank, i in enumerate(order, start=1):
+            shares = "  ".join(f"{name} {allocation / budget:.0%}" for name, allocation in zip(names, allocations[i]))
+            print(f"{rank}. 商談 {total_deals[i]:.1f}件 / 商談CPA {fmt_yen(deal_cpa[i])}  |  {shares}")
+        print(f"\n（読み込み {(loaded - start) * 1000:.1f} ms / 試算 {elapsed * 1000:.1f} ms）")
+        return
+
+    result = forecast(data, args.lead_rate, args.deal_rate)
+    computed = time.perf_counter()
+    rows = np.arange(len(data)) if getattr(args, "all", False) else data.rows_for(month)
+    print_forecast(result, rows)
+    print(f"\n（読み込み {(loaded - start) * 1000:.1f} ms / 予測 {(computed - loaded) * 1000:.1f} ms）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+議事録取得パイプライン全体（一覧取得→詳細取得→振り分け→Markdown生成→保存）のベンチマーク
+mock_fireflies.py のローカル代替サーバーに向けて fetch_fireflies.py を別プロセスで実行し、
+件数ごとの処理件数/秒・ピークメモリ（RSS）・書き込んだバイト数を計測する
+
+使い方:
+    python scripts/bench_fireflies_pipeline.py                              # 10 / 1,000 / 10,000件
+    python scripts/bench_fireflies_pipeline.py --sizes 100 --batch-size 20 --latency 0.02
+    python scripts/bench_fireflies_pipeline.py --concurrency 8 --error-rate 0.01
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mock_fireflies import DEFAULT_SENTENCES, MockFireflies, start_server
+
+SCRIPT = Path(__file__).resolve().parent / "fetch_fireflies.py"
+DEFAULT_SIZES = [10, 1000, 10000]
+
+
+def run_pipeline(count, args):
+    """代替サーバーを立てて fetch_fireflies.py を1回実行し、計測結果を返す"""
+    mock = MockFireflies(count, args.sentences, args.latency, args.error_rate,
+                         args.error_status, args.item_error_rate)
+    server, url = start_server(mock)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(
+            os.environ,
+            FIREFLIES_API_URL=url,
+            FIREFLIES_API_KEY="dummy",
+            FIREFLIES_SYNC_STATE=str(Path(tmp_dir) / ".fireflies_sync_state.json"),
+            NOTES_INDEX=str(Path(tmp_dir) / ".notes_index.sqlite"),
+        )
+        command = [sys.executable, str(SCRIPT), "--days", "30",
+                   "--concurrency", str(args.concurrency),
+                   "--rate-limit", str(args.rate_limit),
+                   "--batch-size", str(args.batch_size)]
+
+        log_path = Path(tmp_dir) / "stderr.log"
+        start = time.perf_counter()
+        # 保存先フォルダは相対パスなので一時ディレクトリで実行する
+        with open(log_path, "wb") as log:
+            process = subprocess.Popen(command, cwd=tmp_dir, env=env, stdout=subprocess.DEVNULL, stderr=log)
+            # 子プロセスのピークRSSを取るため wait4 で待つ
+            _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+
+        returncode = os.waitstatus_to_exitcode(status)
+        if returncode != 0:
+            print(log_path.read_text(encoding="utf-8", errors="replace"), file=sys.stderr)
+            raise SystemExit(f"fetch_fireflies.py が異常終了しました（{count}件, code={returncode}）")
+        log_path.unlink()
+
+        notes = list(Path(tmp_dir).rglob("*.md"))
+        written = sum(path.stat().st_size for path in Path(tmp_dir).rglob("*") if path.is_file())
+
+    return {
+        "count": count,
+        "saved": len(notes),
+        "seconds": elapsed,
+        "peak_rss": usage.ru_maxrss * 1024,  # Linuxでは KB 単位
+        "written": written,
+        "requests": mock.stats["requests"],
+        "errors": mock.stats["errors"],
+        "response_bytes": mock.stats["bytes"],
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="議事録取得パイプライン全体のベンチマーク")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="議事録の件数")
+    parser.add_argument("--sentences", type=int, default=DEFAULT_SENTENCES, help="1件あたりの発言数（平均）")
+    parser.add_argument("--latency", type=float, default=0.0, help="1リクエストあたりの遅延（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTPエラーを返す割合")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--item-error-rate", type=float, default=0.0, help="バッチクエリで1件だけnullを返す割合")
+    # fetch_fireflies.py にそのまま渡す設定（レート制限はデフォルトで無効にして処理能力を測る）
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--rate-limit", type=float, default=0)
+    parser.add_argument("--batch-size", type=int, default=0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print(f"発言数/件: {args.sentences} / 遅延: {args.latency}s / エラー率: {args.error_rate} / "
+          f"concurrency={args.concurrency} batch-size={args.batch_size} rate-limit={args.rate_limit}")
+    print(f"{'件数':>8} {'保存':>8} {'秒':>9} {'件/秒':>9} {'ピークRSS':>11} {'書き込み':>11} "
+          f"{'リクエスト':>10} {'エラー':>6}")
+    for count in args.sizes:
+        result = run_pipeline(count, args)
+        print(f"{result['count']:>8,} {result['saved']:>8,} {result['seconds']:>9.2f} "
+              f"{result['count'] / result['seconds']:>9.1f} "
+              f"{result['peak_rss'] / 1024 / 1024:>9.1f}MB {result['written'] / 1024 / 1024:>9.1f}MB "
+              f"{result['requests']:>10,} {result['errors']:>6,}")
+
+
+if __name__ == "__main__":
+    main()
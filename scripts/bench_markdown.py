@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+議事録Markdown生成のベンチマーク
+合成した長時間会議（デフォルト5万発言）で、従来の文字列連結版とストリーミング版を比較する
+
+使い方:
+    python scripts/bench_markdown.py [--sentences 50000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from fetch_fireflies import write_markdown
+
+
+def legacy_create_markdown(transcript):
+    """比較用: 文字列を += で連結していた従来の実装"""
+    title = transcript.get("title", "無題")
+    date = transcript.get("date", "")
+    participants = transcript.get("participants", [])
+    url = transcript.get("transcript_url", "")
+    summary = transcript.get("summary", {})
+    sentences = transcript.get("sentences", [])
+
+    participants_str = ", ".join(participants) if participants else "不明"
+    overview = summary.get("overview", "サマリーなし")
+    action_items = summary.get("action_items", [])
+
+    transcript_text = ""
+    current_speaker = None
+    for sentence in sentences:
+        speaker = sentence.get("speaker_name", "不明")
+        text = sentence.get("text", "")
+        if speaker != current_speaker:
+            transcript_text += f"\n\n**{speaker}**: "
+            current_speaker = speaker
+        transcript_text += text + " "
+
+    md = f"""# {title}
+
+**日時**: {date}
+**参加者**: {participants_str}
+**Fireflies URL**: {url}
+
+---
+
+## サマリー
+{overview}
+
+## 議事録
+{transcript_text.strip()}
+
+---
+
+## アクションアイテム
+"""
+
+    if action_items:
+        for item in action_items:
+            md += f"- {item}\n"
+    else:
+        md += "なし\n"
+
+    return md
+
+
+def make_transcript(n_sentences, seed=0):
+    """合成の議事録データを生成"""
+    rng = random.Random(seed)
+    speakers = ["寺倉", "永田", "Guest A", "Guest B"]
+    words = ["記事", "KPI", "CVR", "改善", "来月", "確認します", "そうですね", "LP", "施策", "検討"]
+    sentences = []
+    speaker = speakers[0]
+    for _ in range(n_sentences):
+        if rng.random() < 0.2:
+            speaker = rng.choice(speakers)
+        text = "、".join(rng.choice(words) for _ in range(rng.randint(3, 15))) + "。"
+        sentences.append({"speaker_name": speaker, "text": text})
+    return {
+        "title": "ベンチマーク定例",
+        "date": "2026-01-20T10:00:00.000Z",
+        "participants": ["a@example.com", "b@example.com"],
+        "transcript_url": "https://app.fireflies.ai/view/bench",
+        "summary": {"overview": "合成データ", "action_items": ["確認", "共有"]},
+        "sentences": sentences,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="議事録Markdown生成のベンチマーク")
+    parser.add_argument("--sentences", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    transcript = make_transcript(args.sentences)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = Path(tmp_dir) / "legacy.md"
+        stream_path = Path(tmp_dir) / "stream.md"
+
+        legacy_times = []
+        stream_times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            legacy_path.write_text(legacy_create_markdown(transcript), encoding="utf-8")
+            legacy_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            write_markdown(transcript, stream_path)
+            stream_times.append(time.perf_counter() - start)
+
+        # 生成時のピークメモリ（入力データ分は除く）
+        tracemalloc.start()
+        legacy_path.write_text(legacy_create_markdown(transcript), encoding="utf-8")
+        legacy_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        write_markdown(transcript, stream_path)
+        stream_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        identical = legacy_path.read_bytes() == stream_path.read_bytes()
+        size = stream_path.stat().st_size
+
+    print(f"発言数: {args.sentences:,} / 出力サイズ: {size / 1024 / 1024:.1f} MB")
+    print(f"従来版（文字列連結）: {min(legacy_times) * 1000:.1f} ms / ピークメモリ {legacy_peak / 1024 / 1024:.2f} MB")
+    print(f"ストリーミング版    : {min(stream_times) * 1000:.1f} ms / ピークメモリ {stream_peak / 1024 / 1024:.2f} MB")
+    print(f"出力一致: {'OK' if identical else 'NG'}")
+    if not identical:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
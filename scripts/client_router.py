@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+議事録の保存先フォルダ（クライアント）判定
+キーワードを1つの正規表現にまとめてコンパイルし、タイトル・参加者・サマリーのキーワードから判定する
+"""
+
+import re
+
+# クライアント判定マッピング
+CLIENT_MAPPING = {
+    # キーワード: (フォルダ名, 優先度)
+    "SHE": ("クライアント/SHE/議事録", 1),
+    "シーライクス": ("クライアント/SHE/議事録", 1),
+    "giftee": ("クライアント/giftee/議事録", 1),
+    "ギフティ": ("クライアント/giftee/議事録", 1),
+    "AeyeScan": ("クライアント/AeyeScan/議事録", 1),
+    "エーアイスキャン": ("クライアント/AeyeScan/議事録", 1),
+    "Dsmart": ("クライアント/Dsmart/議事録", 1),
+    "ディースマート": ("クライアント/Dsmart/議事録", 1),
+    "ミズテック": ("クライアント/ミズテック/議事録", 1),
+    "Mizutec": ("クライアント/ミズテック/議事録", 1),
+    "nikkenhomes": ("クライアント/nikkenhomes/議事録", 1),
+    "日建ホームズ": ("クライアント/nikkenhomes/議事録", 1),
+    "tantan": ("クライアント/tantan/議事録", 1),
+    "寺倉": ("寺倉ナレッジ/会議一覧", 2),
+    "KAAAN": ("社内/議事録", 3),
+    "カーン": ("社内/議事録", 3),
+    "採用": ("採用/議事録", 3),
+    "面談": ("採用/議事録", 3),
+    "面接": ("採用/議事録", 3),
+}
+
+# どのキーワードにも一致しなかった場合の保存先
+DEFAULT_FOLDER = "その他/議事録"
+
+
+class ClientMatcher:
+    """キーワードを1つの正規表現にまとめた判定器
+
+    キーワードは（優先度, マッピング内の順番）の順に並べて選択肢にしているので、
+    同じ位置から始まる候補のうち最も優先度の高いものが選ばれる。
+    先読みで全位置を走査するため、重なり合うキーワードも取りこぼさない。
+    参加者のドメイン・サマリーのキーワードを見るときは、英数字のキーワードを単語単位でだけ一致させる
+    （「fresheyes」「published」に「SHE」が一致しないように）。
+    """
+
+    def __init__(self, mapping=CLIENT_MAPPING):
+        entries = sorted(
+            ((priority, order, keyword.lower(), folder)
+             for order, (keyword, (folder, priority)) in enumerate(mapping.items())),
+            key=lambda entry: (entry[0], entry[1]),
+        )
+        self.entries = entries
+        alternatives = "|".join(f"({re.escape(keyword)})" for _, _, keyword, _ in entries)
+        self.pattern = re.compile(f"(?=(?:{alternatives}))") if entries else None
+        word_alternatives = "|".join(
+            f"((?<![a-z0-9]){re.escape(keyword)}(?![a-z0-9]))" if keyword.isascii() else f"({re.escape(keyword)})"
+            for _, _, keyword, _ in entries
+        )
+        self.word_pattern = re.compile(f"(?=(?:{word_alternatives}))") if entries else None
+
+    def match(self, text, whole_words=False):
+        """テキストに含まれるキーワードのうち最優先のものを返す（whole_wordsなら英数字のキーワードは単語単位。なければNone）"""
+        pattern = self.word_pattern if whole_words else self.pattern
+        if not text or pattern is None:
+            return None
+
+        best = None
+        for m in pattern.finditer(text.lower()):
+            entry = self.entries[m.lastindex - 1]
+            if best is None or entry[:2] < best[:2]:
+                best = entry
+                if best is self.entries[0]:
+                    # これ以上優先度の高い候補はない
+                    break
+        return best
+
+    def detect(self, title, participants=None, keywords=None):
+        """保存先フォルダを判定（タイトル > 参加者・サマリーのキーワードの順で判定）"""
+        match = self.match(title)
+        if match is None and (participants or keywords):
+            # 参加者はメールアドレスのドメイン部分だけを見る（個人名への誤一致を避ける）
+            domains = [p.split("@", 1)[1] for p in participants or [] if "@" in p]
+            match = self.match("\n".join(domains + list(keywords or [])), whole_words=True)
+        return match[3] if match else DEFAULT_FOLDER
+
+
+_default_matcher = ClientMatcher()
+
+
+def detect_client(title, participants=None, keywords=None):
+    """会議タイトル（と参加者・キーワード）からクライアントを判定"""
+    return _default_matcher.detect(title, participants, keywords)
@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""
+クライアントフォルダのCSVをまとめて読み込む共通ライブラリ
+スプレッドシートから書き出したCSVは、文字コード（UTF-8 / BOM付き / Shift_JIS）、見出しの段数
+（タイトル行・期間の行・複数行のセル）、数値の書き方（「6,523」「¥1,067」「12%」「#DIV/0!」）がばらばらなので、
+それらを自動で判定して「列名つきの表」にそろえる
+
+- 見出しの段数: 本文の列の型（数値の列・必ず値がある列）に合わない先頭の行を見出しとみなす
+- 列名: 最下段の見出し。最下段の列名が重複する列（月ごとに同じ指標が並ぶシートなど）だけ上の段を付ける
+- 数値: 桁区切り・通貨記号・全角数字を外して数値に、%は割合にする。全部が数値として読める列だけ数値の列にする
+- 表の区切り: 本文の途中に見出し（期間の行・列名の行）が入るCSVは、そこで別の表に分ける
+- キャッシュ: ファイルの中身のハッシュをキーに解析結果を保存し、変わっていないファイルは読み直さない
+
+使い方（ライブラリ）:
+    import csv_ingest
+    table = csv_ingest.read_table(path, cache)       # 表全体（cache=IngestCache() で解析結果を再利用）
+    tables = csv_ingest.read_tables(path)            # 途中に見出しがあるCSVは表ごとのリスト
+    for record in csv_ingest.iter_records(path):     # 1行ずつ（大きなファイルもメモリに載せない）
+        ...
+    df = table.to_dataframe()                        # pandas（要インストール）
+    tables = csv_ingest.ingest_tree(ROOT / "クライアント")  # フォルダ以下を並列に読む
+
+使い方（CLI）:
+    python scripts/csv_ingest.py                                         # クライアント/ 以下の全CSVの判定結果
+    python scripts/csv_ingest.py クライアント/giftee/data/LP別CVR_2025Q4.csv --head 5
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CLIENTS_DIR = ROOT / "クライアント"
+
+# 解析結果のキャッシュ（生成物なのでリポジトリには含めない）
+CACHE_FILE = Path(os.environ.get("CSV_INGEST_CACHE", ROOT / ".csv_ingest_cache.sqlite"))
+
+# 解析のしかたを変えたら上げる（古いキャッシュを使わないように）
+INGEST_VERSION = 2
+
+# 試す文字コード（スプレッドシートの書き出しはUTF-8、Excelで保存し直したものはShift_JIS）
+ENCODINGS = ("utf-8-sig", "cp932")
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# 見出しを探す行数と、列の型を判定するために読む本文の行数
+HEADER_SEARCH_ROWS = 10
+SAMPLE_ROWS = 200
+
+# 「値がない」を表す書き方（数値の列では空欄と同じ扱い）
+MISSING_MARKERS = {"-", "－", "—", "N/A", "n/a"}
+
+# 見出しの判定で数値の列とみなす割合（途中の見出し行が混ざっても列の型が崩れないように）
+NUMERIC_COLUMN_RATE = 0.9
+
+# 通貨記号（Shift_JISの円記号は「\」として読まれる）
+CURRENCY_SYMBOLS = ("¥", "$", "\\")
+
+# 数値とみなす書き方（符号・数字・桁区切りのカンマ・小数点・末尾の%だけ。「nan」「inf」「1e3」は数値にしない）
+NUMBER_PATTERN = re.compile(r"[+-]?(?:\d[\d,]*(?:\.\d*)?|\.\d+)%?")
+
+# 必ず値がある列とみなす割合（キーワード・パスのような行の見出しの列を探す）
+KEY_COLUMN_FILL_RATE = 0.9
+
+# 列名のつなぎ
+LEVEL_SEPARATOR = " / "
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tables (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    data TEXT NOT NULL,
+    used_at REAL NOT NULL
+);
+"""
+
+
+def parse_number(text):
+    """「6,523」「¥1,067」「-¥36,288」「１２％」を数値にする（%は割合、小数点のない数は int。数値でなければNone）"""
+    text = unicodedata.normalize("NFKC", text).strip()
+    if not text or text in MISSING_MARKERS or text.startswith("#"):
+        return None
+    for symbol in CURRENCY_SYMBOLS:
+        text = text.replace(symbol, "")
+    if not NUMBER_PATTERN.fullmatch(text):
+        return None
+    text = text.replace(",", "")
+    if text.endswith("%"):
+        return float(text[:-1]) / 100
+    return float(text) if "." in text else int(text)
+
+
+def cell_kind(text):
+    """セルの書き方: "empty" / "percent" / "currency" / "number" / "text" """
+    text = unicodedata.normalize("NFKC", text).strip()
+    if not text or text in MISSING_MARKERS or text.startswith("#"):
+        return "empty"  # 空欄・「-」・#DIV/0! などのエラー
+    if parse_number(text) is None:
+        return "text"
+    if text.endswith("%"):
+        return "percent"
+    if any(symbol in text for symbol in CURRENCY_SYMBOLS):
+        return "currency"
+    return "number"
+
+
+def column_kind(kinds):
+    """列のセルの書き方から列の型を決める（数値として読めないセルが1つでもあれば "text"）"""
+    kinds = set(kinds) - {"empty"}
+    if not kinds:
+        return "empty"
+    if "text" in kinds:
+        return "text"
+    for kind in ("percent", "currency"):
+        if kinds == {kind}:
+            return kind
+    return "number"
+
+
+def convert(text, kind):
+    """列の型に合わせてセルを変換（数値の列で数値として読めないセルは文字列のまま残す）"""
+    if kind in ("text", "empty"):
+        return text.strip() or None
+    if cell_kind(text) == "empty":
+        return None
+    value = parse_number(text)
+    return text.strip() if value is None else value
+
+
+def detect_encoding(sample):
+    """先頭のバイト列から文字コードを判定"""
+    if sample.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16"
+    if len(sample) >= ENCODING_SAMPLE_BYTES:
+        sample = sample[:-4]  # 途中で切れたマルチバイト文字は不問にする
+    for encoding in ENCODINGS:
+        try:
+            sample.decode(encoding)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return ENCODINGS[0]
+
+
+def open_csv(path):
+    """文字コードを判定して開き、(ファイル, 文字コード) を返す"""
+    with open(path, "rb") as f:
+        encoding = detect_encoding(f.read(ENCODING_SAMPLE_BYTES))
+    return open(path, newline="", encoding=encoding, errors="replace"), encoding
+
+
+def clean_rows(reader):
+    """BOMの重複（BOM付きで保存し直したファイル）と行末の空セルを取り除く"""
+    for i, row in enumerate(reader):
+        if i == 0 and row:
+            row[0] = row[0].lstrip("\ufeff")
+        while row and not row[-1].strip():
+            row.pop()
+        yield row
+
+
+def is_blank(row):
+    return not any(cell.strip() for cell in row)
+
+
+def body_profile(sample, width):
+    """本文のサンプルから (列ごとの型, 必ず値がある文字列の列) を求める（9割以上が数値なら数値の列）"""
+    kinds = []
+    for j in range(width):
+        cells = [kind for kind in (cell_kind(row[j]) for row in sample if j < len(row)) if kind != "empty"]
+        numeric = [kind for kind in cells if kind != "text"]
+        if cells and len(numeric) / len(cells) >= NUMERIC_COLUMN_RATE:
+            kinds.append(column_kind(numeric))
+        else:
+            kinds.append(column_kind(cells))
+    key_column = None
+    for j, kind in enumerate(kinds):
+        filled = sum(1 for row in sample if j < len(row) and row[j].strip())
+        if kind == "text" and sample and filled / len(sample) >= KEY_COLUMN_FILL_RATE:
+            key_column = j
+            break
+    return kinds, key_column
+
+
+def has_numbers(row, kinds):
+    """数値の列に数値が1つでも入っている行か"""
+    return any(kind not in ("text", "empty") and j < len(row) and cell_kind(row[j]) not in ("text", "empty")
+               for j, kind in enumerate(kinds))
+
+
+def looks_like_data(row, kinds, key_column):
+    """本文の行に見えるか（数値の列に数値があり、行の見出しの列に文字が入っている）"""
+    if not has_numbers(row, kinds):
+        return False
+    if key_column is not None:
+        key = row[key_column].strip() if key_column < len(row) else ""
+        if not key or cell_kind(key) != "text":
+            return False
+    return True
+
+
+def detect_header(head, sample):
+    """先頭の行から見出しの行数を判定する
+
+    本文のサンプルの型に合わない先頭の行を見出しとする。数値の列がない表（文章だけの表）は、
+    最初の空でない行を見出しとする。
+    """
+    width = max((len(row) for row in chain(head, sample)), default=0)
+    kinds, key_column = body_profile(sample, width)
+    if any(kind not in ("text", "empty") for kind in kinds):
+        for i, row in enumerate(head):
+            if looks_like_data(row, kinds, key_column):
+                return i
+    for i, row in enumerate(head):
+        if not is_blank(row):
+            return i + 1
+    return 0
+
+
+def header_names(header, width):
+    """見出しの行から (列名, タイトル・注記) を作る
+
+    セルが1つだけの行と改行を含むセルはタイトル・注記とする。上の段の見出しは結合セルのぶん右に広げ、
+    最下段の列名が重複する列にだけ付ける。
+    """
+    notes = []
+    levels = []
+    for row in header:
+        cells = [cell.strip() for cell in row]
+        filled = [cell for cell in cells if cell]
+        if not filled:
+            continue
+        if len(filled) == 1 and len(levels) == 0 and width > 1:
+            notes.append(filled[0])
+            continue
+        level = []
+        for cell in cells + [""] * (width - len(cells)):
+            if "\n" in cell:
+                notes.append(cell)
+                cell = ""
+            level.append(cell)
+        levels.append(level)
+
+    if not levels:
+        return [f"列{j + 1}" for j in range(width)], notes
+
+    bottom = levels[-1]
+    filled_upper = []
+    for level in levels[:-1]:
+        current = ""
+        filled = []
+        for cell in level:
+            current = cell or current
+            filled.append(current)
+        filled_upper.append(filled)
+
+    counts = {}
+    for name in bottom:
+        counts[name] = counts.get(name, 0) + 1
+    names = []
+    for j, name in enumerate(bottom):
+        parts = [name] if name else []
+        if not name or counts[name] > 1:
+            parts = [level[j] for level in filled_upper if level[j]] + parts
+        names.append(LEVEL_SEPARATOR.join(dict.fromkeys(parts)) or f"列{j + 1}")
+
+    # それでも重複する列名には番号を付ける
+    seen = {}
+    for j, name in enumerate(names):
+        if name in seen:
+            seen[name] += 1
+            names[j] = f"{name}_{seen[name]}"
+        else:
+            seen[name] = 1
+    return names, notes
+
+
+class Table:
+    """CSVの表1つ分（列名・列の型・変換済みの行）"""
+
+    def __init__(self, path, encoding, header_rows, columns, kinds, rows, notes=()):
+        self.path = str(path)
+        self.encoding = encoding
+        self.header_rows = header_rows  # 見出しの行数（ファイル先頭の表は先頭の空行を含む）
+        self.columns = columns
+        self.kinds = kinds  # 列ごとの型: "text" / "number" / "percent" / "currency" / "empty"
+        self.rows = rows
+        self.notes = list(notes)  # 見出しの中のタイトル・注記
+        self.cached = False
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return self.records()
+
+    def records(self):
+        """行を {列名: 値} で1行ずつ返す"""
+        for row in self.rows:
+            yield dict(zip(self.columns, row))
+
+    def column(self, name):
+        j = self.columns.index(name)
+        return [row[j] for row in self.rows]
+
+    def to_dataframe(self):
+        """pandas の DataFrame にする（数値の列はfloat、欠損はNaN）"""
+        import pandas as pd
+
+        frame = pd.DataFrame(self.rows, columns=self.columns)
+        for name, kind in zip(self.columns, self.kinds):
+            if kind not in ("text", "empty"):
+                frame[name] = pd.to_numeric(frame[name], errors="coerce")
+        return frame
+
+    def to_arrow(self):
+        """pyarrow の Table にする（数値の列はfloat64、それ以外は文字列）"""
+        import pyarrow as pa
+
+        arrays = []
+        for j, kind in enumerate(self.kinds):
+            values = [row[j] for row in self.rows]
+            if kind in ("text", "empty"):
+                arrays.append(pa.array([None if v is None else str(v) for v in values], pa.string()))
+            else:
+                arrays.append(pa.array([v if isinstance(v, (int, float)) else None for v in values], pa.float64()))
+        return pa.table(arrays, names=self.columns)
+
+    def to_dict(self):
+        return {"path": self.path, "encoding": self.encoding, "header_rows": self.header_rows,
+                "columns": self.columns, "kinds": self.kinds, "rows": self.rows, "notes": self.notes}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["path"], data["encoding"], data["header_rows"], data["columns"],
+                   data["kinds"], data["rows"], data["notes"])
+
+
+def read_head(rows):
+    """見出しの判定に使う先頭の行と本文のサンプルを読み、(見出しの行数, 先頭の行) を返す"""
+    head = list(islice(rows, HEADER_SEARCH_ROWS + SAMPLE_ROWS))
+    body = [row for row in head[min(HEADER_SEARCH_ROWS, len(head) // 2):] if not is_blank(row)]
+    return detect_header(head[:HEADER_SEARCH_ROWS], body), head
+
+
+def is_names_row(row, kinds):
+    """数値の列に文字が入っている行（列名の行）か"""
+    return any(kind not in ("text", "empty") and j < len(row) and cell_kind(row[j]) == "text"
+               for j, kind in enumerate(kinds))
+
+
+def iter_sections(rows):
+    """行を ("header", (見出しの行のリスト, ファイル上の行数)) / ("row", 行) の順に返す
+
+    1つのCSVに同じ形の表が縦に並んでいる場合（テストの回ごとに期間の見出しが入るシートなど）は、
+    本文の途中の見出しも ("header", ...) で返す。数値のない行が続き、その中に数値の列へ文字が入った行があり、
+    そのあとにまた数値の行が来たら見出しとみなす。途中の見出しに列名の段がなければ、前の表の列名を引き継ぐ。
+    """
+    header_rows, head = read_head(rows)
+    header = head[:header_rows]
+    sample = [row for row in head[header_rows:] if not is_blank(row)]
+    width = max((len(row) for row in head), default=0)
+    kinds, _ = body_profile(sample, width)
+    yield "header", (header, header_rows)
+
+    if not any(kind not in ("text", "empty") for kind in kinds):
+        # 数値の列がない表は途中の見出しを探さない
+        for row in chain(head[header_rows:], rows):
+            if not is_blank(row):
+                yield "row", row
+        return
+
+    pending = []
+    for row in chain(head[header_rows:], rows):
+        if is_blank(row):
+            continue
+        if not has_numbers(row, kinds) and len(pending) < HEADER_SEARCH_ROWS:
+            pending.append(row)
+            continue
+        if any(is_names_row(r, kinds) for r in pending):
+            names_row = next((r for r in reversed(header) if not is_blank(r)), [])
+            filled = sum(1 for cell in pending[-1] if cell.strip())
+            inherited = [names_row] if filled < sum(1 for cell in names_row if cell.strip()) else []
+            header = pending + inherited
+            yield "header", (header, len(pending))
+        else:
+            for r in pending:
+                yield "row", r
+        pending = []
+        yield "row", row
+    for r in pending:
+        yield "row", r
+
+
+def iter_records(path):
+    """CSVを1行ずつ {列名: 値} で返す（キャッシュは使わず、先頭の行だけ読んで型を決めて残りは流す）
+
+    列の型は先頭のサンプルから決めるので、サンプルより後に数値の列へ文字が出てきた場合は文字列のまま返す。
+    途中に見出しがあるCSVは、そこから後の行を新しい列名で返す。
+    """
+    f, _ = open_csv(path)
+    with f:
+        rows = clean_rows(csv.reader(f))
+        header_rows, head = read_head(rows)
+        width = max((len(row) for row in head), default=0)
+        kinds, _ = body_profile([row for row in head[header_rows:] if not is_blank(row)], width)
+        names = []
+        for event, value in iter_sections(chain(head, rows)):
+            if event == "header":
+                names, _ = header_names(value[0], width)
+                continue
+            if len(value) > len(names):
+                extra = range(len(names), len(value))
+                names = names + [f"列{j + 1}" for j in extra]
+                kinds = kinds + ["text"] * (len(names) - len(kinds))
+            yield {name: convert(value[j], kind) if j < len(value) else None
+                   for j, (name, kind) in enumerate(zip(names, kinds))}
+
+
+def parse_file(path):
+    """CSV1ファイルを解析して Table のリスト（途中の見出しで区切った表ごと）にする
+
+    列の型は表ごとに本文の全行から決める。
+    """
+    f, encoding = open_csv(path)
+    with f:
+        sections = []
+        for event, value in iter_sections(clean_rows(csv.reader(f))):
+            if event == "header":
+                sections.append((value, []))
+            else:
+                sections[-1][1].append(value)
+
+    tables = []
+    for (header, header_rows), body in sections:
+        if not body and tables:
+            continue
+        width = max((len(row) for row in chain(header, body)), default=0)
+        names, notes = header_names(header, width)
+        kinds = [column_kind(cell_kind(row[j]) for row in body if j < len(row)) for j in range(width)]
+        converted = [[convert(row[j], kind) if j < len(row) else None for j, kind in enumerate(kinds)]
+                     for row in body]
+        tables.append(Table(path, encoding, header_rows, names, kinds, converted, notes))
+    return tables
+
+
+def file_key(path):
+    """キャッシュのキー（ファイルの中身と解析のバージョンのハッシュ）"""
+    digest = hashlib.sha256(f"csv_ingest:{INGEST_VERSION}:".encode("utf-8"))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestCache:
+    """ファイルのハッシュをキーに解析済みの表を保存するキャッシュ"""
+
+    def __init__(self, cache_file=CACHE_FILE, enabled=True):
+        self.conn = sqlite3.connect(cache_file)
+        self.conn.executescript(SCHEMA)
+        self.enabled = enabled
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        """保存済みの Table のリスト（なければNone）"""
+        if not self.enabled:
+            return None
+        row = self.conn.execute("SELECT data FROM tables WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE tables SET used_at = ? WHERE key = ?", (time.time(), key))
+        tables = [Table.from_dict(data) for data in json.loads(row[0])]
+        for table in tables:
+            table.cached = True
+        return tables
+
+    def put(self, key, path, tables):
+        self.misses += 1
+        data = json.dumps([table.to_dict() for table in tables], ensure_ascii=False)
+        self.conn.execute("INSERT OR REPLACE INTO tables (key, path, data, used_at) VALUES (?, ?, ?, ?)",
+                          (key, str(path), data, time.time()))
+
+    def prune(self, before):
+        """before（UNIX時刻）より前から使われていない表を削除"""
+        with self.conn:
+            return self.conn.execute("DELETE FROM tables WHERE used_at < ?", (before,)).rowcount
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def read_tables(path, cache=None):
+    """CSV1ファイルを Table のリストで返す（cache を渡せば中身が同じファイルは解析し直さない）"""
+    if cache is None:
+        return parse_file(path)
+    key = file_key(path)
+    tables = cache.get(key)
+    if tables is None:
+        tables = parse_file(path)
+        cache.put(key, path, tables)
+    return tables
+
+
+def read_table(path, cache=None):
+    """CSV1ファイルの最初の表を返す（表が1つだけのCSV向け）"""
+    return read_tables(path, cache)[0]
+
+
+def _parse_to_dicts(path):
+    # 別プロセスから返すので、Table ではなく辞書にする
+    return [table.to_dict() for table in parse_file(path)]
+
+
+def ingest_tree(root=CLIENTS_DIR, cache=None, workers=None, pattern="*.csv"):
+    """root 以下のCSVを全部読み、{パス: Table のリスト} を返す（キャッシュにないファイルは複数プロセスで解析）"""
+    paths = sorted(Path(root).rglob(pattern))
+    results = {}
+    keys = {}
+    for path in paths:
+        if cache is not None:
+            keys[path] = file_key(path)
+            tables = cache.get(keys[path])
+            if tables is not None:
+                results[path] = tables
+
+    pending = [path for path in paths if path not in results]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            parsed = [[Table.from_dict(data) for data in dicts]
+                      for dicts in executor.map(_parse_to_dicts, pending)]
+    else:
+        parsed = [parse_file(path) for path in pending]
+
+    for path, tables in zip(pending, parsed):
+        results[path] = tables
+        if cache is not None:
+            cache.put(keys[path], path, tables)
+    return {path: results[path] for path in paths}
+
+
+def relative(path):
+    path = Path(path).resolve()
+    return path.relative_to(ROOT) if path.is_relative_to(ROOT) else path
+
+
+def print_table(table, head):
+    print(f"{relative(table.path)}  ({table.encoding}, 見出し {table.header_rows}行, "
+          f"{len(table):,}行 × {len(table.columns)}列)")
+    for note in table.notes:
+        print(f"  注記: {note.replace(chr(10), ' ')}")
+    for name, kind in zip(table.columns, table.kinds):
+        print(f"  {kind:<8} {name}")
+    if head:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(table.columns)
+        for row in table.rows[:head]:
+            writer.writerow(["" if value is None else value for value in row])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="クライアントフォルダのCSVの読み込み・判定結果の確認")
+    parser.add_argument("paths", nargs="*", type=Path, help="CSVファイルかフォルダ（省略時は クライアント/）")
+    parser.add_argument("--head", type=int, default=0, help="ファイルを指定したとき、先頭の行も表示")
+    parser.add_argument("--workers", type=int, default=None, help="解析するプロセス数（省略時はCPU数）")
+    parser.add_argument("--no-cache", action="store_true", help="キャッシュを使わずに全部解析し直す")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    cache = IngestCache(enabled=not args.no_cache)
+    start = time.perf_counter()
+    try:
+        results = {}
+        for path in args.paths or [CLIENTS_DIR]:
+            if path.is_dir():
+                results.update(ingest_tree(path, cache, args.workers))
+            else:
+                results[path] = read_tables(path, cache)
+    finally:
+        cache.close()
+    elapsed = time.perf_counter() - start
+
+    if len(results) == 1 and args.paths and not args.paths[0].is_dir():
+        for i, table in enumerate(next(iter(results.values()))):
+            if i:
+                print()
+            print_table(table, args.head)
+    else:
+        print(f"{'表':>3} {'見出し':>6} {'行数':>7} {'列数':>5} {'数値列':>6} {'文字コード':<10} ファイル")
+        for path, tables in results.items():
+            for i, table in enumerate(tables, start=1):
+                numeric = sum(1 for kind in table.kinds if kind not in ("text", "empty"))
+                print(f"{i:>3} {table.header_rows:>6} {len(table):>7,} {len(table.columns):>5} {numeric:>6} "
+                      f"{table.encoding:<10} {relative(path)}")
+    print(f"\n{len(results)}ファイル / キャッシュ {cache.hits}件・解析 {cache.misses}件 / {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
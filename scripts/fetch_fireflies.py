@@ -6,111 +6,152 @@ GitHub Actionsで毎日自動実行される
 
 import os
 import json
-import requests
+import time
+import sqlite3
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
-# Fireflies API設定
-FIREFLIES_API_URL = "https://api.fireflies.ai/graphql"
+from client_router import detect_client
+from http_client import HttpClient
+from notes_index import add_to_index
+
+# Fireflies API設定（FIREFLIES_API_URLでローカルの代替サーバーにも向けられる）
+FIREFLIES_API_URL = os.environ.get("FIREFLIES_API_URL", "https://api.fireflies.ai/graphql")
 FIREFLIES_API_KEY = os.environ.get("FIREFLIES_API_KEY")
 
-# クライアント判定マッピング
-CLIENT_MAPPING = {
-    # キーワード: (フォルダ名, 優先度)
-    "SHE": ("クライアント/SHE/議事録", 1),
-    "シーライクス": ("クライアント/SHE/議事録", 1),
-    "giftee": ("クライアント/giftee/議事録", 1),
-    "ギフティ": ("クライアント/giftee/議事録", 1),
-    "AeyeScan": ("クライアント/AeyeScan/議事録", 1),
-    "エーアイスキャン": ("クライアント/AeyeScan/議事録", 1),
-    "Dsmart": ("クライアント/Dsmart/議事録", 1),
-    "ディースマート": ("クライアント/Dsmart/議事録", 1),
-    "ミズテック": ("クライアント/ミズテック/議事録", 1),
-    "Mizutec": ("クライアント/ミズテック/議事録", 1),
-    "nikkenhomes": ("クライアント/nikkenhomes/議事録", 1),
-    "日建ホームズ": ("クライアント/nikkenhomes/議事録", 1),
-    "tantan": ("クライアント/tantan/議事録", 1),
-    "寺倉": ("寺倉ナレッジ/会議一覧", 2),
-    "KAAAN": ("社内/議事録", 3),
-    "カーン": ("社内/議事録", 3),
-    "採用": ("採用/議事録", 3),
-    "面談": ("採用/議事録", 3),
-    "面接": ("採用/議事録", 3),
-}
-
-def get_recent_transcripts(days=1):
-    """過去N日間の議事録を取得"""
-    query = """
-    query Transcripts($fromDate: DateTime) {
-        transcripts(fromDate: $fromDate) {
+# 詳細取得の同時実行数（1なら従来どおり1件ずつ取得）
+FETCH_CONCURRENCY = int(os.environ.get("FIREFLIES_CONCURRENCY", "1"))
+# APIレート制限（1秒あたりのリクエスト数・バースト上限）
+RATE_LIMIT_PER_SEC = float(os.environ.get("FIREFLIES_RATE_LIMIT", "1"))
+RATE_LIMIT_BURST = int(os.environ.get("FIREFLIES_RATE_BURST", "5"))
+
+# バッチ取得設定（1リクエストでまとめて詳細取得する件数、0なら無効）
+DETAIL_BATCH_SIZE = int(os.environ.get("FIREFLIES_BATCH_SIZE", "0"))
+# 1バッチのレスポンスサイズの目安（超えたら次のバッチを小さくする）
+MAX_BATCH_RESPONSE_BYTES = 4 * 1024 * 1024
+
+# 一覧取得の1ページあたりの件数（APIの上限は50）
+LIST_PAGE_SIZE = 50
+
+# 同期状態ファイル（取得済みIDと前回同期日時を記録）
+SYNC_STATE_FILE = Path(os.environ.get("FIREFLIES_SYNC_STATE", ".fireflies_sync_state.json"))
+# 前回同期日時からさかのぼって再確認する期間（文字起こしの処理遅れ対策）
+SYNC_OVERLAP = timedelta(days=2)
+# 詳細取得→保存を区切る件数（途中で落ちても保存済み分は再取得しない）
+SYNC_CHUNK_SIZE = 50
+
+# 議事録詳細で取得するフィールド
+TRANSCRIPT_DETAIL_FIELDS = """
             id
             title
             date
             duration
             participants
+            transcript_url
             summary {
                 overview
                 action_items
+                keywords
             }
-        }
-    }
-    """
-
-    from_date = (datetime.now() - timedelta(days=days)).isoformat()
+            sentences {
+                speaker_name
+                text
+            }
+"""
 
+# API呼び出し用の共有HTTPクライアント（Keep-Alive・リトライつき）
+http = HttpClient()
+
+class TokenBucket:
+    """トークンバケット方式のレートリミッタ（スレッド間で共有可能）"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """トークンを1つ取得できるまで待機"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def post_graphql(query, variables):
+    """Fireflies GraphQL APIにクエリを送信"""
     headers = {
         "Authorization": f"Bearer {FIREFLIES_API_KEY}",
         "Content-Type": "application/json"
     }
 
-    response = requests.post(
+    return http.post(
         FIREFLIES_API_URL,
         headers=headers,
-        json={"query": query, "variables": {"fromDate": from_date}}
+        json={"query": query, "variables": variables}
     )
 
-    if response.status_code != 200:
-        print(f"Error: {response.status_code}")
-        return []
-
-    data = response.json()
-    return data.get("data", {}).get("transcripts", [])
 
+def get_recent_transcripts(days=1, from_date=None):
+    """過去N日間（from_date指定時はその日時以降）の議事録一覧をページングしながら取得
 
-def get_transcript_details(transcript_id):
-    """議事録の詳細を取得"""
+    途中のページで失敗した場合は、一覧が欠けたまま同期を進めないように None を返す。
+    """
     query = """
-    query Transcript($id: String!) {
-        transcript(id: $id) {
+    query Transcripts($fromDate: DateTime, $limit: Int, $skip: Int) {
+        transcripts(fromDate: $fromDate, limit: $limit, skip: $skip) {
             id
             title
             date
             duration
             participants
-            transcript_url
             summary {
                 overview
                 action_items
-                keywords
-            }
-            sentences {
-                speaker_name
-                text
             }
         }
     }
     """
 
-    headers = {
-        "Authorization": f"Bearer {FIREFLIES_API_KEY}",
-        "Content-Type": "application/json"
+    if from_date is None:
+        from_date = datetime.now() - timedelta(days=days)
+
+    transcripts = []
+    while True:
+        variables = {"fromDate": from_date.isoformat(), "limit": LIST_PAGE_SIZE, "skip": len(transcripts)}
+        response = post_graphql(query, variables)
+
+        if response.status_code != 200:
+            print(f"Error: {response.status_code}")
+            return None
+
+        data = response.json()
+        page = data.get("data", {}).get("transcripts") or []
+        transcripts.extend(page)
+        if len(page) < LIST_PAGE_SIZE:
+            return transcripts
+
+
+def get_transcript_details(transcript_id):
+    """議事録の詳細を取得"""
+    query = """
+    query Transcript($id: String!) {
+        transcript(id: $id) {%s        }
     }
+    """ % TRANSCRIPT_DETAIL_FIELDS
 
-    response = requests.post(
-        FIREFLIES_API_URL,
-        headers=headers,
-        json={"query": query, "variables": {"id": transcript_id}}
-    )
+    response = post_graphql(query, {"id": transcript_id})
 
     if response.status_code != 200:
         return None
@@ -119,18 +160,110 @@ def get_transcript_details(transcript_id):
     return data.get("data", {}).get("transcript")
 
 
-def detect_client(title):
-    """会議タイトルからクライアントを判定"""
-    best_match = None
-    best_priority = 999
+def build_batch_query(transcript_ids):
+    """複数IDの詳細をエイリアス付きで1つにまとめたGraphQLクエリを生成"""
+    var_defs = ", ".join(f"$id{i}: String!" for i in range(len(transcript_ids)))
+    fields = "".join(
+        f"""
+        t{i}: transcript(id: $id{i}) {{{TRANSCRIPT_DETAIL_FIELDS}        }}"""
+        for i in range(len(transcript_ids))
+    )
+    query = f"""
+    query Transcripts({var_defs}) {{{fields}
+    }}
+    """
+    variables = {f"id{i}": transcript_id for i, transcript_id in enumerate(transcript_ids)}
+    return query, variables
+
+
+def get_transcript_details_batch(transcript_ids):
+    """複数の議事録詳細を1リクエストで取得
 
-    for keyword, (folder, priority) in CLIENT_MAPPING.items():
-        if keyword.lower() in title.lower():
-            if priority < best_priority:
-                best_match = folder
-                best_priority = priority
+    Returns:
+        (詳細のリスト（取得できなかったIDはNone）, レスポンスのバイト数)
+        リクエスト自体が失敗した場合は (None, 0)
+    """
+    query, variables = build_batch_query(transcript_ids)
+
+    response = post_graphql(query, variables)
 
-    return best_match or "その他/議事録"
+    if response.status_code != 200:
+        return None, 0
+
+    data = response.json().get("data") or {}
+    details = [data.get(f"t{i}") for i in range(len(transcript_ids))]
+    return details, len(response.content)
+
+
+def fetch_transcript_details_batched(transcript_ids, batch_size=DETAIL_BATCH_SIZE, rate_limiter=None):
+    """議事録詳細をバッチでまとめて取得（結果は入力と同じ順序）
+
+    レスポンスが大きすぎる場合は次のバッチを半分に分割し、
+    リクエストが失敗したバッチは分割して再試行する。
+    一部のIDだけエラーになった場合はそのIDだけ個別クエリで取り直す。
+    """
+    def throttle():
+        if rate_limiter:
+            rate_limiter.acquire()
+
+    results = {}
+    pending = list(transcript_ids)
+    size = max(1, batch_size)
+
+    while pending:
+        batch = pending[:size]
+        throttle()
+        details, response_bytes = get_transcript_details_batch(batch)
+
+        if details is None:
+            if len(batch) > 1:
+                # 失敗したバッチは分割して再試行
+                size = max(1, len(batch) // 2)
+                continue
+            throttle()
+            details = [get_transcript_details(batch[0])]
+        else:
+            for i, transcript_id in enumerate(batch):
+                if details[i] is None:
+                    print(f"Batch fallback: {transcript_id}")
+                    throttle()
+                    details[i] = get_transcript_details(transcript_id)
+
+            # レスポンスサイズに応じて次のバッチサイズを調整
+            if response_bytes > MAX_BATCH_RESPONSE_BYTES and size > 1:
+                size = max(1, size // 2)
+            elif response_bytes < MAX_BATCH_RESPONSE_BYTES // 4 and size < batch_size:
+                size = min(batch_size, size * 2)
+
+        for transcript_id, detail in zip(batch, details):
+            results[transcript_id] = detail
+        pending = pending[len(batch):]
+
+    return [results[transcript_id] for transcript_id in transcript_ids]
+
+
+def fetch_transcript_details(transcript_ids, concurrency=FETCH_CONCURRENCY, rate_limiter=None):
+    """複数の議事録詳細を同時実行数を制限して並列取得（結果は入力と同じ順序）"""
+    def fetch(transcript_id):
+        if rate_limiter:
+            rate_limiter.acquire()
+        return get_transcript_details(transcript_id)
+
+    if concurrency <= 1:
+        return [fetch(transcript_id) for transcript_id in transcript_ids]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(fetch, transcript_ids))
+
+
+def parse_transcript_date(date_val):
+    """議事録の日時をローカル時刻のdatetimeに変換（ISO文字列またはUnixタイムスタンプ対応）"""
+    if isinstance(date_val, (int, float)):
+        if date_val > 10000000000:
+            date_val = date_val / 1000
+        return datetime.fromtimestamp(date_val)
+    dt = datetime.fromisoformat(str(date_val).replace("Z", "+00:00"))
+    return dt.astimezone().replace(tzinfo=None) if dt.tzinfo else dt
 
 
 def format_date(date_val):
@@ -145,8 +278,46 @@ def format_date(date_val):
     return dt.strftime("%y%m%d")
 
 
-def create_markdown(transcript):
-    """議事録をMarkdown形式に整形"""
+def iter_speaker_paragraphs(sentences):
+    """発言を話者ごとの段落にまとめて順に返す"""
+    current_speaker = None
+    header = ""
+    texts = []
+    for sentence in sentences:
+        speaker = sentence.get("speaker_name", "不明")
+        text = sentence.get("text", "")
+        if speaker != current_speaker:
+            if header or texts:
+                yield header + " ".join(texts) + " "
+            header = f"\n\n**{speaker}**: "
+            texts = []
+            current_speaker = speaker
+        texts.append(text)
+    if header or texts:
+        yield header + " ".join(texts) + " "
+
+
+def strip_chunks(chunks):
+    """チャンクを連結してstrip()したのと同じ結果になるように順に返す"""
+    pending = ""
+    started = False
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        body = chunk.rstrip()
+        if body:
+            # 末尾の空白は次に本文が来たときだけ出力する
+            yield pending + body
+            pending = chunk[len(body):]
+        else:
+            pending += chunk
+
+
+def iter_markdown(transcript):
+    """議事録をMarkdown形式に整形し、チャンクごとに順に返す"""
     title = transcript.get("title", "無題")
     date = transcript.get("date", "")
     participants = transcript.get("participants", [])
@@ -161,19 +332,7 @@ def create_markdown(transcript):
     overview = summary.get("overview", "サマリーなし")
     action_items = summary.get("action_items", [])
 
-    # 本文
-    transcript_text = ""
-    current_speaker = None
-    for sentence in sentences:
-        speaker = sentence.get("speaker_name", "不明")
-        text = sentence.get("text", "")
-        if speaker != current_speaker:
-            transcript_text += f"\n\n**{speaker}**: "
-            current_speaker = speaker
-        transcript_text += text + " "
-
-    # Markdown生成
-    md = f"""# {title}
+    yield f"""# {title}
 
 **日時**: {date}
 **参加者**: {participants_str}
@@ -185,7 +344,12 @@ def create_markdown(transcript):
 {overview}
 
 ## 議事録
-{transcript_text.strip()}
+"""
+
+    # 本文（話者ごとの段落単位で書き出す）
+    yield from strip_chunks(iter_speaker_paragraphs(sentences))
+
+    yield """
 
 ---
 
@@ -194,11 +358,23 @@ def create_markdown(transcript):
 
     if action_items:
         for item in action_items:
-            md += f"- {item}\n"
+            yield f"- {item}\n"
     else:
-        md += "なし\n"
+        yield "なし\n"
+
+
+def create_markdown(transcript):
+    """議事録をMarkdown形式に整形"""
+    return "".join(iter_markdown(transcript))
+
 
-    return md
+def write_markdown(transcript, file_path):
+    """議事録を全文をメモリに載せずにファイルへ書き出す"""
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(iter_markdown(transcript))
+    # 書き込み途中で落ちても中途半端なファイルが「保存済み」にならないようにする
+    tmp_path.replace(file_path)
 
 
 def save_transcript(transcript):
@@ -206,8 +382,9 @@ def save_transcript(transcript):
     title = transcript.get("title", "無題")
     date = transcript.get("date", "")
 
-    # クライアント判定
-    folder = detect_client(title)
+    # クライアント判定（タイトルで決まらなければ参加者・キーワードも見る）
+    summary = transcript.get("summary") or {}
+    folder = detect_client(title, transcript.get("participants"), summary.get("keywords"))
 
     # ファイル名生成
     date_str = format_date(date)
@@ -227,37 +404,164 @@ def save_transcript(transcript):
         return None
 
     # Markdown生成・保存
-    md_content = create_markdown(transcript)
-    file_path.write_text(md_content, encoding="utf-8")
+    write_markdown(transcript, file_path)
+    # 全文検索インデックスにも反映（インデックスに失敗しても議事録の保存・同期は続ける）
+    try:
+        add_to_index(file_path)
+    except sqlite3.Error as e:
+        print(f"Index error ({file_path}): {e}")
 
     print(f"Saved: {file_path}")
     return str(file_path)
 
 
+def load_sync_state(path=SYNC_STATE_FILE):
+    """同期状態を読み込む"""
+    if not path.exists():
+        return {"last_synced_at": None, "saved": {}}
+    state = json.loads(path.read_text(encoding="utf-8"))
+    state.setdefault("last_synced_at", None)
+    state.setdefault("saved", {})
+    return state
+
+
+def save_sync_state(state, path=SYNC_STATE_FILE):
+    """同期状態を書き込む（一時ファイル経由で置き換えて途中で壊れないようにする）"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def next_sync_cursor(state, unsaved, started_at):
+    """次回の同期日時を決める
+
+    全件保存できたら今回の開始日時まで進める。保存できなかった議事録があれば、
+    そのうち最も古い日時より後には進めない（日時が分からないものがあれば前回のまま）。
+    """
+    if not unsaved:
+        return started_at.isoformat()
+    try:
+        oldest = min(parse_transcript_date(t["date"]) for t in unsaved)
+    except (KeyError, TypeError, ValueError):
+        return state["last_synced_at"]
+    return min(oldest, started_at).isoformat()
+
+
+def prune_saved(state):
+    """次回の一覧取得（同期日時 - SYNC_OVERLAP 以降）に出てこない古い取得済みIDを削除"""
+    if not state["last_synced_at"]:
+        return
+    threshold = datetime.fromisoformat(state["last_synced_at"]) - SYNC_OVERLAP
+    for transcript_id, date in list(state["saved"].items()):
+        try:
+            if datetime.fromisoformat(date) >= threshold:
+                continue
+        except (TypeError, ValueError):
+            pass  # 日時のない古い形式の記録（保存先パス）も削除する
+        del state["saved"][transcript_id]
+
+
+def sync_from_date(state, days=None):
+    """一覧取得の開始日時を決める（日数指定 > 前回同期日時 > デフォルト2日）"""
+    if days is not None:
+        return datetime.now() - timedelta(days=days)
+    if state["last_synced_at"]:
+        return datetime.fromisoformat(state["last_synced_at"]) - SYNC_OVERLAP
+    return datetime.now() - timedelta(days=2)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Firefliesから議事録を取得して保存")
+    # 未指定なら前回同期日時から取得（初回は2日分、週末・祝日対応）
+    parser.add_argument("--days", type=int, default=None,
+                        help="何日前までの議事録を取得するか（バックフィル用）")
+    parser.add_argument("--concurrency", type=int, default=FETCH_CONCURRENCY,
+                        help="詳細取得の同時実行数（1で逐次取得）")
+    parser.add_argument("--rate-limit", type=float, default=RATE_LIMIT_PER_SEC,
+                        help="1秒あたりの最大リクエスト数")
+    parser.add_argument("--batch-size", type=int, default=DETAIL_BATCH_SIZE,
+                        help="1リクエストでまとめて取得する詳細の件数（0で無効）")
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
     if not FIREFLIES_API_KEY:
         print("Error: FIREFLIES_API_KEY not set")
         return
 
+    # 並列取得時はAPIホストへの同時接続数も合わせる
+    http.host_concurrency = max(1, args.concurrency)
+
+    state = load_sync_state()
+    started_at = datetime.now()
+
     print("Fetching recent transcripts...")
-    # 2日分チェック（週末・祝日対応、重複は自動スキップ）
-    transcripts = get_recent_transcripts(days=2)
+    transcripts = get_recent_transcripts(from_date=sync_from_date(state, args.days))
+
+    if transcripts is None:
+        # 一覧が欠けているので同期日時は進めない（次回同じ範囲を取り直す）
+        print("Error: failed to fetch transcript list; sync state not updated")
+        return
 
     if not transcripts:
         print("No new transcripts found")
+        state["last_synced_at"] = started_at.isoformat()
+        prune_saved(state)
+        save_sync_state(state)
         return
 
     print(f"Found {len(transcripts)} transcript(s)")
 
+    # 保存済みのIDは詳細を取得する前にスキップ
+    pending = [t for t in transcripts if t.get("id") not in state["saved"]]
+    if len(pending) < len(transcripts):
+        print(f"Skip (already synced): {len(transcripts) - len(pending)} transcript(s)")
+
     saved_files = []
-    for t in transcripts:
-        print(f"Processing: {t.get('title')}")
-        details = get_transcript_details(t.get("id"))
-        if details:
+    unsaved = []
+    rate_limiter = TokenBucket(args.rate_limit, RATE_LIMIT_BURST) if args.rate_limit > 0 else None
+
+    for start in range(0, len(pending), SYNC_CHUNK_SIZE):
+        chunk = pending[start:start + SYNC_CHUNK_SIZE]
+        transcript_ids = [t.get("id") for t in chunk]
+        if args.batch_size > 0:
+            print(f"Fetching details in batches of {args.batch_size}...")
+            all_details = fetch_transcript_details_batched(transcript_ids, args.batch_size, rate_limiter)
+        elif args.concurrency > 1:
+            print(f"Fetching details (concurrency={args.concurrency}, rate={args.rate_limit}/s)...")
+            all_details = fetch_transcript_details(transcript_ids, args.concurrency, rate_limiter)
+        else:
+            all_details = None
+
+        for i, t in enumerate(chunk):
+            print(f"Processing: {t.get('title')}")
+            if all_details is not None:
+                details = all_details[i]
+            else:
+                details = get_transcript_details(t.get("id"))
+            if not details:
+                print(f"Failed to fetch details: {t.get('id')}")
+                unsaved.append(t)
+                continue
             saved = save_transcript(details)
             if saved:
                 saved_files.append(saved)
+            # 既存ファイルでスキップした場合も同期済みとして記録（古い記録を消すため日時を持たせる）
+            date = t.get("date") or details.get("date")
+            state["saved"][t.get("id")] = parse_transcript_date(date).isoformat() if date else started_at.isoformat()
+
+        # チャンクごとに保存（途中で落ちても保存済み分は再取得しない）
+        save_sync_state(state)
+
+    # 取得できなかった議事録があれば、その日時より先には同期日時を進めない
+    state["last_synced_at"] = next_sync_cursor(state, unsaved, started_at)
+    prune_saved(state)
+    save_sync_state(state)
 
+    if unsaved:
+        print(f"\nFailed {len(unsaved)} transcript(s); will retry on the next run")
     print(f"\nSaved {len(saved_files)} file(s)")
 
 
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+API呼び出し・スクレイピング共通のHTTPクライアント
+コネクションプール（Keep-Alive）、Retry-Afterを考慮した指数バックオフでのリトライ、
+ホストごとの同時接続数制限をまとめて提供する
+"""
+
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# リトライ設定
+DEFAULT_RETRIES = 5
+DEFAULT_BACKOFF_FACTOR = 1.0  # 1s, 2s, 4s, ... と待機時間を伸ばす
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# 接続設定
+DEFAULT_TIMEOUT = 30
+DEFAULT_POOL_SIZE = 10
+DEFAULT_HOST_CONCURRENCY = 4
+
+
+class HttpClient:
+    """セッションを使い回すHTTPクライアント（スレッド間で共有可能）"""
+
+    def __init__(self, headers=None, retries=DEFAULT_RETRIES, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 host_concurrency=DEFAULT_HOST_CONCURRENCY, pool_size=DEFAULT_POOL_SIZE,
+                 timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self.host_concurrency = host_concurrency
+        self._host_semaphores = {}
+        self._lock = threading.Lock()
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=None,  # GraphQLのPOSTも参照系なのでリトライ対象にする
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def _host_semaphore(self, url):
+        """ホストごとの同時接続数を制限するセマフォを取得"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.host_concurrency)
+            return self._host_semaphores[host]
+
+    def request(self, method, url, **kwargs):
+        """リクエストを送信（リトライ・同時接続数制限つき）"""
+        kwargs.setdefault("timeout", self.timeout)
+        with self._host_semaphore(url):
+            return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
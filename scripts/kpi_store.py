@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+giftee 記事別KPIシート（横持ちCSV）を縦持ちの列指向テーブル（Parquet）にまとめるストア
+月ごとに「全体SS, PC_SS, PS_FM_SS, PC_CV, PC率」が横に並ぶシートを
+記事（パス×デバイス）× 月 × 指標 の1行1値に展開して保存し、前月比・記事別の推移を列単位で集計する
+
+列の位置ではなく見出し行（年月・指標名）から月と指標を読むので、
+シートに列が足されても値がずれない（GAS週次レポートの列ずれと同じ問題を避ける）
+
+使い方:
+    python scripts/kpi_store.py build                                  # CSVからストアを作り直す
+    python scripts/kpi_store.py mom --metric 全体SS --month 2025-12     # 前月比（増減の大きい順）
+    python scripts/kpi_store.py article /columns/happy-receive         # 記事の月別推移
+    python scripts/kpi_store.py totals                                 # 月別の合計
+"""
+
+import argparse
+import csv
+import os
+import re
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT / "クライアント" / "giftee" / "data"
+
+# 取り込むシート（古い順。同じ記事・月・指標が重なったら後のシートを優先）
+SOURCE_CSVS = [
+    DATA_DIR / "記事別パフォーマンス_2025.csv",
+    DATA_DIR / "KPI_記事別_2026.csv",
+]
+
+# ストアの保存先（生成物なのでリポジトリには含めない）
+STORE_FILE = Path(os.environ.get("GIFTEE_KPI_STORE", DATA_DIR / ".kpi_store.parquet"))
+
+# 記事を表す列（シートの見出し: ストアの列名）
+ID_COLUMNS = {"キーワード": "keyword", "パス": "path", "URL": "url", "デバイス": "device"}
+
+# シートの1か月分に並ぶ指標（表示はこの順）
+METRICS = ("全体SS", "PC_SS", "PS_FM_SS", "PC_CV", "PC率")
+
+# 比率の指標（合計するときは 分子の合計 / 分母の合計 で計算し直す）
+RATIO_METRICS = {"PC率": ("PC_SS", "全体SS")}
+
+# 見出しを探す行数（空行・年月・年月の数字・指標名の順に並んでいる）
+HEADER_SEARCH_ROWS = 10
+MONTH_KEY_PATTERN = re.compile(r"^(\d{4})(\d{2})$")
+
+SCHEMA = pa.schema([
+    ("keyword", pa.string()),
+    ("path", pa.string()),
+    ("url", pa.string()),
+    ("device", pa.string()),
+    ("month", pa.date32()),
+    ("metric", pa.string()),
+    ("value", pa.float64()),
+    ("source", pa.string()),
+])  # 文字列の列はParquet側で辞書エンコードされるので、同じ値のくり返しでもファイルは小さい
+
+
+def read_header(csv_path):
+    """見出し行を探し、(見出しの行数, 列ごとの年月, 列ごとの見出し名) を返す"""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        month_row = None
+        for i, row in enumerate(reader):
+            if i >= HEADER_SEARCH_ROWS:
+                break
+            if month_row is None and any(MONTH_KEY_PATTERN.match(cell) for cell in row):
+                month_row = row
+            elif month_row is not None and "パス" in row:
+                months = []
+                for cell in month_row + [""] * (len(row) - len(month_row)):
+                    match = MONTH_KEY_PATTERN.match(cell)
+                    months.append(date(int(match.group(1)), int(match.group(2)), 1) if match else None)
+                return i + 1, months, row
+    raise ValueError(f"見出し行（年月・指標名）が見つかりません: {csv_path}")
+
+
+def parse_values(column):
+    """「6,523」「12%」のような文字列の列を数値の配列にする（空欄はNaN、%は割合）"""
+    column = pc.utf8_trim_whitespace(column)
+    percent = pc.fill_null(pc.ends_with(column, "%"), False)
+    digits = pc.replace_substring(pc.replace_substring(column, ",", ""), "%", "")
+    digits = pc.if_else(pc.equal(digits, ""), pa.scalar(None, pa.string()), digits)
+    values = pc.cast(digits, pa.float64())
+    values = pc.if_else(percent, pc.divide(values, 100.0), values)
+    return values.to_numpy(zero_copy_only=False)
+
+
+def melt_sheet(csv_path):
+    """横持ちのシート1枚を縦持ちのテーブル（SCHEMAの列）にする
+
+    記事の列が空の行（シート末尾の書式だけの行）と、全記事の値が0か空欄の月（未集計の月）は除く。
+    """
+    header_rows, months, names = read_header(csv_path)
+    column_names = [f"c{i}" for i in range(len(names))]
+    table = pa_csv.read_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(skip_rows=header_rows, column_names=column_names),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in column_names},
+            strings_can_be_null=True,
+        ),
+    )
+
+    id_index = {ID_COLUMNS[name]: i for i, name in enumerate(names) if name in ID_COLUMNS and months[i] is None}
+    missing = set(ID_COLUMNS.values()) - set(id_index)
+    if missing:
+        raise ValueError(f"記事の列が見つかりません: {', '.join(sorted(missing))}（{csv_path}）")
+
+    path = table.column(id_index["path"])
+    keep = pc.and_(pc.is_valid(path), pc.not_equal(pc.utf8_trim_whitespace(path), ""))
+    table = table.filter(keep)
+    n_rows = table.num_rows
+
+    value_columns = [i for i, month in enumerate(months) if month is not None and names[i]]
+    if not value_columns or not n_rows:
+        return SCHEMA.empty_table()
+    values = np.column_stack([parse_values(table.column(i)) for i in value_columns])
+
+    # 未集計の月（全記事・全指標が0か空欄）は除く
+    col_months = np.array([months[i] for i in value_columns], dtype="datetime64[D]")
+    filled = np.nan_to_num(values) != 0
+    filled_months = np.unique(col_months[filled.any(axis=0)])
+    active = np.isin(col_months, filled_months)
+    values = values[:, active]
+    value_columns = [i for i, ok in zip(value_columns, active) if ok]
+    col_months = col_months[active]
+    n_cols = len(value_columns)
+
+    # 行×列の値を行優先で1列に並べ、記事の列は行ごとに列数分くり返す
+    rows = np.repeat(np.arange(n_rows), n_cols)
+    ids = {name: table.column(i).take(rows) for name, i in id_index.items()}
+    metrics = np.array([names[i] for i in value_columns], dtype=object)
+    return pa.table({
+        "keyword": ids["keyword"],
+        "path": ids["path"],
+        "url": ids["url"],
+        "device": ids["device"],
+        "month": pa.array(np.tile(col_months, n_rows), pa.date32()),
+        "metric": pa.array(np.tile(metrics, n_rows), pa.string()),
+        "value": pa.array(values.ravel(), pa.float64(), from_pandas=True),
+        "source": pa.array([Path(csv_path).name] * len(rows), pa.string()),
+    }).cast(SCHEMA)
+
+
+def build_store(csv_paths=SOURCE_CSVS, store_file=STORE_FILE):
+    """CSVを縦持ちに展開してParquetに保存し、テーブルを返す"""
+    tables = [melt_sheet(csv_path) for csv_path in csv_paths]
+    table = pa.concat_tables(tables) if tables else SCHEMA.empty_table()
+
+    # 同じ記事・月・指標が複数のシートにある場合は後のシートの値を残す
+    key = pc.binary_join_element_wise(
+        table["path"], table["device"], pc.cast(table["month"], pa.string()), table["metric"], "\t",
+    )
+    indices = pc.dictionary_encode(key).combine_chunks().indices.to_numpy()
+    last = np.zeros(len(indices), dtype=bool)
+    _, first_from_end = np.unique(indices[::-1], return_index=True)
+    last[len(indices) - 1 - first_from_end] = True
+    table = table.filter(pa.array(last))
+
+    table = table.sort_by([("path", "ascending"), ("device", "ascending"),
+                           ("metric", "ascending"), ("month", "ascending")])
+    sources = {str(Path(p)): f"{Path(p).stat().st_mtime_ns}:{Path(p).stat().st_size}" for p in csv_paths}
+    table = table.replace_schema_metadata({f"source:{p}": v for p, v in sources.items()})
+    store_file.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, store_file)
+    return table
+
+
+def is_stale(csv_paths=SOURCE_CSVS, store_file=STORE_FILE):
+    """ストアがないか、作った後にCSVが更新・追加されたか"""
+    if not store_file.exists():
+        return True
+    metadata = pq.read_schema(store_file).metadata or {}
+    for csv_path in csv_paths:
+        stat = Path(csv_path).stat()
+        recorded = metadata.get(f"source:{Path(csv_path)}".encode("utf-8"))
+        if recorded != f"{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"):
+            return True
+    return False
+
+
+def load_store(csv_paths=SOURCE_CSVS, store_file=STORE_FILE, rebuild=False):
+    """ストアを読み込む（CSVの方が新しければ作り直す）"""
+    if rebuild or is_stale(csv_paths, store_file):
+        return build_store(csv_paths, store_file)
+    return pq.read_table(store_file)
+
+
+def select(table, metric=None, path=None, device=None, month=None):
+    """条件に合う行だけのテーブル"""
+    mask = None
+    for column, value in (("metric", metric), ("path", path), ("device", device), ("month", month)):
+        if value is None:
+            continue
+        condition = pc.equal(table[column], value)
+        mask = condition if mask is None else pc.and_(mask, condition)
+    return table if mask is None else table.filter(mask)
+
+
+def month_over_month(table, metric, month=None):
+    """記事ごとの前月比（前月の値・増減・増減率）。month指定時はその月の行だけ返す"""
+    rows = select(table, metric=metric).sort_by([("path", "ascending"), ("device", "ascending"),
+                                                 ("month", "ascending")])
+    key = pc.binary_join_element_wise(rows["path"], rows["device"], "\t")
+    keys = pc.dictionary_encode(key).combine_chunks().indices.to_numpy()
+    months = rows["month"].to_numpy().astype("datetime64[M]")
+    values = rows["value"].to_numpy()
+
+    # 同じ記事の直前の行が前月のときだけ前月の値とする
+    previous = np.full(len(values), np.nan)
+    if len(values) > 1:
+        same = (keys[1:] == keys[:-1]) & (months[1:] - months[:-1] == np.timedelta64(1, "M"))
+        previous[1:] = np.where(same, values[:-1], np.nan)
+    change = values - previous
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(previous != 0, change / previous, np.nan)
+
+    result = pa.table({
+        "keyword": rows["keyword"],
+        "path": rows["path"],
+        "device": rows["device"],
+        "month": rows["month"],
+        "value": rows["value"],
+        "previous": pa.array(previous, from_pandas=True),
+        "change": pa.array(change, from_pandas=True),
+        "change_rate": pa.array(rate, from_pandas=True),
+    })
+    if month is not None:
+        result = result.filter(pc.equal(result["month"], month))
+    return result
+
+
+def article_history(table, path, device=None):
+    """記事の月別推移 {月: {指標: 値}}"""
+    rows = select(table, path=path, device=device).sort_by([("month", "ascending")])
+    history = {}
+    for month, metric, value in zip(rows["month"].to_pylist(), rows["metric"].to_pylist(),
+                                    rows["value"].to_pylist()):
+        history.setdefault(month, {})[metric] = value
+    return history
+
+
+def monthly_totals(table):
+    """月×指標の合計（比率の指標は分子・分母の合計から計算し直す）"""
+    totals = table.group_by(["month", "metric"]).aggregate([("value", "sum")])
+    by_month = {}
+    for month, metric, value in zip(totals["month"].to_pylist(), totals["metric"].to_pylist(),
+                                    totals["value_sum"].to_pylist()):
+        by_month.setdefault(month, {})[metric] = value
+    for metrics in by_month.values():
+        for ratio, (numerator, denominator) in RATIO_METRICS.items():
+            if ratio in metrics and metrics.get(denominator):
+                metrics[ratio] = metrics.get(numerator, 0) / metrics[denominator]
+    return dict(sorted(by_month.items()))
+
+
+def ordered(metrics):
+    """指標の辞書をシートの並び順にする（METRICSにない指標は後ろ）"""
+    rank = {metric: i for i, metric in enumerate(METRICS)}
+    return sorted(metrics.items(), key=lambda item: (rank.get(item[0], len(rank)), item[0]))
+
+
+def parse_month(value):
+    """「2025-12」「2025/12」「202512」を月初の日付にする"""
+    digits = re.sub(r"[-/]", "", value)
+    match = MONTH_KEY_PATTERN.match(digits) if len(digits) == 6 else re.match(r"^(\d{4})(\d{1,2})$", digits)
+    if not match:
+        raise argparse.ArgumentTypeError(f"年月の形式が正しくありません: {value}")
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def format_value(metric, value):
+    if value is None:
+        return "-"
+    if metric in RATIO_METRICS:
+        return f"{value:.0%}"
+    return f"{value:,.0f}"
+
+
+def format_change(metric, change):
+    """増減（比率の指標はポイント差）"""
+    if metric in RATIO_METRICS:
+        return f"{change * 100:+.0f}pt"
+    return f"{change:+,.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="giftee 記事別KPIの縦持ちストア")
+    parser.add_argument("--store", type=Path, default=STORE_FILE, help="ストアの保存先（Parquet）")
+    parser.add_argument("--rebuild", action="store_true", help="CSVが更新されていなくても作り直す")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("build", help="CSVからストアを作り直す")
+    mom_parser = subparsers.add_parser("mom", help="記事ごとの前月比")
+    mom_parser.add_argument("--metric", choices=METRICS, default="全体SS")
+    mom_parser.add_argument("--month", type=parse_month, help="対象の年月（省略時は最新月）")
+    mom_parser.add_argument("--top", type=int, default=10, help="増減の大きい順に表示する件数")
+    article_parser = subparsers.add_parser("article", help="記事の月別推移")
+    article_parser.add_argument("path", help="記事のパス（例: /columns/happy-receive）")
+    article_parser.add_argument("--device")
+    subparsers.add_parser("totals", help="月別の合計")
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "build":
+        table = build_store(store_file=args.store)
+        print(f"{args.store}: {table.num_rows:,}行（{len(pc.unique(table['path'])):,}記事, "
+              f"{len(pc.unique(table['month']))}か月）を {(time.perf_counter() - start) * 1000:.1f} ms で作成")
+        return
+
+    table = load_store(store_file=args.store, rebuild=args.rebuild)
+    loaded = time.perf_counter()
+
+    if args.command == "mom":
+        month = args.month or pc.max(select(table, metric=args.metric)["month"]).as_py()
+        if month is None:
+            raise SystemExit(f"{args.metric} のデータがありません")
+        result = month_over_month(table, args.metric, month)
+        result = result.filter(pc.is_valid(result["change"]))
+        if not result.num_rows:
+            raise SystemExit(f"{args.metric} の {month:%Y年%m月} と前月を比べられるデータがありません")
+        order = np.argsort(-np.abs(result["change"].to_numpy()), kind="stable")[:args.top]
+        print(f"{args.metric} 前月比（{month:%Y年%m月}）")
+        for row in result.take(pa.array(order)).to_pylist():
+            rate = f"{row['change_rate']:+.0%}" if row["change_rate"] is not None else "-"
+            print(f"  {format_change(args.metric, row['change']):>10}（{rate:>6}） {format_value(args.metric, row['previous']):>9} → "
+                  f"{format_value(args.metric, row['value']):>9}  {row['device'] or '-'}  {row['keyword'] or '-'}  {row['path']}")
+    elif args.command == "article":
+        history = article_history(table, args.path, args.device)
+        if not history:
+            print(f"記事が見つかりません: {args.path}")
+        else:
+            keywords = [k for k in pc.unique(select(table, path=args.path)["keyword"]).to_pylist() if k]
+            print(f"{args.path}  {' / '.join(keywords) or '-'}")
+        for month, metrics in history.items():
+            values = "  ".join(f"{metric} {format_value(metric, value)}" for metric, value in ordered(metrics))
+            print(f"{month:%Y-%m}  {values}")
+    elif args.command == "totals":
+        for month, metrics in monthly_totals(table).items():
+            values = "  ".join(f"{metric} {format_value(metric, value)}" for metric, value in ordered(metrics))
+            print(f"{month:%Y-%m}  {values}")
+
+    print(f"\n（読み込み {(loaded - start) * 1000:.1f} ms / 集計 {(time.perf_counter() - loaded) * 1000:.1f} ms）")
+
+
+if __name__ == "__main__":
+    main()
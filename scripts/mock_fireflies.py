@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Fireflies GraphQL APIのローカル代替サーバー（ベンチマーク・動作確認用）
+合成した議事録データで transcripts（一覧のページング）/ transcript（詳細）と、
+エイリアスでまとめたバッチクエリに応答する。遅延・エラー率・議事録の大きさを指定できる
+
+クエリは本物のGraphQLとして実行せず、フィールド名とエイリアスだけを見て固定のフィールドを返す
+
+使い方:
+    python scripts/mock_fireflies.py --count 1000 --latency 0.05 --error-rate 0.01
+    FIREFLIES_API_URL=http://127.0.0.1:8765/graphql FIREFLIES_API_KEY=dummy python scripts/fetch_fireflies.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8765
+
+# 合成データの設定
+DEFAULT_COUNT = 100  # 議事録の件数
+DEFAULT_SENTENCES = 200  # 1件あたりの発言数（平均）
+SPEAKERS = ["寺倉", "永田", "Guest A", "Guest B"]
+WORDS = ["記事", "KPI", "CVR", "改善", "来月", "確認します", "そうですね", "LP", "施策", "検討"]
+# タイトルに含めるキーワード（保存先フォルダの振り分けが一通り起きるように）
+TITLE_KEYWORDS = ["SHE", "giftee", "AeyeScan", "Dsmart", "ミズテック", "nikkenhomes", "tantan",
+                  "寺倉", "KAAAN", "採用面談", "雑談"]
+
+# 一覧のページサイズの上限（本物のAPIと同じ）
+MAX_LIMIT = 50
+
+ALIASED_DETAIL_PATTERN = re.compile(r"(\w+)\s*:\s*transcript\s*\(\s*id\s*:\s*\$(\w+)\s*\)")
+DETAIL_PATTERN = re.compile(r"\btranscript\s*\(\s*id\s*:\s*\$(\w+)\s*\)")
+LIST_PATTERN = re.compile(r"\btranscripts\s*\(")
+
+
+class MockFireflies:
+    """合成の議事録データと、エラー・遅延の挙動の設定"""
+
+    def __init__(self, count=DEFAULT_COUNT, sentences=DEFAULT_SENTENCES, latency=0.0,
+                 error_rate=0.0, error_status=503, item_error_rate=0.0, seed=0, now=None):
+        self.count = count
+        self.sentences = sentences
+        self.latency = latency
+        self.error_rate = error_rate  # リクエスト全体をHTTPエラーにする割合
+        self.error_status = error_status
+        self.item_error_rate = item_error_rate  # バッチ内の1件だけnull＋errorsにする割合
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.now = now or datetime.now()
+        self.stats = {"requests": 0, "errors": 0, "item_errors": 0, "details": 0, "bytes": 0}
+        self.stats_lock = threading.Lock()
+
+    def transcript_id(self, index):
+        return f"mock{index:06d}"
+
+    def transcript_date(self, index):
+        """新しい順に1分ずつさかのぼる日時（ミリ秒のUnixタイムスタンプ）"""
+        return int((self.now - timedelta(minutes=index)).timestamp() * 1000)
+
+    def _index(self, transcript_id):
+        if not transcript_id or not transcript_id.startswith("mock"):
+            return None
+        try:
+            index = int(transcript_id[4:])
+        except ValueError:
+            return None
+        return index if 0 <= index < self.count else None
+
+    def list_item(self, index):
+        """一覧で返す議事録（発言なし）"""
+        rng = random.Random(f"{self.seed}-{index}")
+        keyword = rng.choice(TITLE_KEYWORDS)
+        return {
+            "id": self.transcript_id(index),
+            "title": f"{keyword} 定例 #{index}",
+            "date": self.transcript_date(index),
+            "duration": rng.randint(15, 90),
+            "participants": [f"user{rng.randint(1, 20)}@example.com" for _ in range(rng.randint(1, 4))],
+            "summary": {
+                "overview": f"合成データ {index} のサマリー",
+                "action_items": [f"{rng.choice(WORDS)}を確認" for _ in range(rng.randint(0, 3))],
+            },
+        }
+
+    def detail(self, transcript_id):
+        """詳細で返す議事録（存在しないIDはNone）"""
+        index = self._index(transcript_id)
+        if index is None:
+            return None
+        transcript = self.list_item(index)
+        rng = random.Random(f"{self.seed}-{index}-sentences")
+        n_sentences = rng.randint(self.sentences // 2, self.sentences * 3 // 2) if self.sentences else 0
+        speaker = SPEAKERS[0]
+        sentences = []
+        for _ in range(n_sentences):
+            if rng.random() < 0.2:
+                speaker = rng.choice(SPEAKERS)
+            text = "、".join(rng.choice(WORDS) for _ in range(rng.randint(3, 15))) + "。"
+            sentences.append({"speaker_name": speaker, "text": text})
+        transcript["transcript_url"] = f"https://app.fireflies.ai/view/{transcript_id}"
+        transcript["summary"]["keywords"] = [rng.choice(WORDS) for _ in range(3)]
+        transcript["sentences"] = sentences
+        return transcript
+
+    def list_transcripts(self, variables):
+        """fromDate以降の議事録を新しい順に limit/skip で切り出す"""
+        limit = min(int(variables.get("limit") or MAX_LIMIT), MAX_LIMIT)
+        skip = int(variables.get("skip") or 0)
+        count = self.count
+        from_date = variables.get("fromDate")
+        if from_date:
+            from_ms = datetime.fromisoformat(from_date.replace("Z", "+00:00")).timestamp() * 1000
+            # 新しい順に並んでいるので、fromDateより古くなる手前までが対象
+            count = sum(1 for index in range(self.count) if self.transcript_date(index) >= from_ms)
+        return [self.list_item(index) for index in range(skip, min(skip + limit, count))]
+
+    def _roll(self, rate):
+        if rate <= 0:
+            return False
+        with self.rng_lock:
+            return self.rng.random() < rate
+
+    def _count(self, key, n=1):
+        with self.stats_lock:
+            self.stats[key] += n
+
+    def handle(self, body):
+        """リクエストボディに対する (ステータス, レスポンス) を返す"""
+        self._count("requests")
+        if self.latency:
+            time.sleep(self.latency)
+        if self._roll(self.error_rate):
+            self._count("errors")
+            return self.error_status, {"errors": [{"message": "mock: injected error"}]}
+
+        query = body.get("query") or ""
+        variables = body.get("variables") or {}
+        data = {}
+        errors = []
+
+        aliases = ALIASED_DETAIL_PATTERN.findall(query)
+        if aliases:
+            for alias, var in aliases:
+                if self._roll(self.item_error_rate):
+                    self._count("item_errors")
+                    data[alias] = None
+                    errors.append({"message": "mock: injected item error", "path": [alias]})
+                    continue
+                data[alias] = self.detail(variables.get(var))
+                self._count("details")
+        elif LIST_PATTERN.search(query):
+            data["transcripts"] = self.list_transcripts(variables)
+        else:
+            detail = DETAIL_PATTERN.search(query)
+            if not detail:
+                return 400, {"errors": [{"message": "mock: unsupported query"}]}
+            data["transcript"] = self.detail(variables.get(detail.group(1)))
+            self._count("details")
+
+        response = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return 200, response
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-Aliveを有効にする
+    disable_nagle_algorithm = True  # ヘッダーと本文を分けて送るので、遅延ACKで毎回40ms待たないようにする
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            body = {}
+        status, response = self.server.mock.handle(body)
+        payload = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        self.server.mock._count("bytes", len(payload))
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # リクエストごとのログは出さない
+        pass
+
+
+def start_server(mock, host="127.0.0.1", port=0):
+    """バックグラウンドのスレッドでサーバーを起動し、(サーバー, URL) を返す（port=0なら空いているポート）"""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.mock = mock
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}/graphql"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fireflies GraphQL APIのローカル代替サーバー")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="議事録の件数")
+    parser.add_argument("--sentences", type=int, default=DEFAULT_SENTENCES, help="1件あたりの発言数（平均）")
+    parser.add_argument("--latency", type=float, default=0.0, help="1リクエストあたりの遅延（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTPエラーを返す割合")
+    parser.add_argument("--error-status", type=int, default=503, help="エラー時のステータスコード")
+    parser.add_argument("--item-error-rate", type=float, default=0.0,
+                        help="バッチクエリで1件だけnullを返す割合")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    mock = MockFireflies(args.count, args.sentences, args.latency, args.error_rate,
+                         args.error_status, args.item_error_rate)
+    server, url = start_server(mock, port=args.port)
+    print(f"Mock Fireflies API: {url}（議事録 {args.count}件）")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(f"requests={mock.stats['requests']} errors={mock.stats['errors']} "
+              f"details={mock.stats['details']} bytes={mock.stats['bytes']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+議事録の全文検索インデックス（SQLite FTS5・trigramトークナイザ）
+日本語でも分かち書き不要で部分一致検索でき、話者・日付で絞り込める
+
+使い方:
+    python scripts/notes_index.py update                    # 追加・更新・削除された議事録だけ反映
+    python scripts/notes_index.py search 記事 KPI           # スコア順に検索
+    python scripts/notes_index.py search 採用 --speaker 寺倉 --since 2026-01-01
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+from reroute_notes import ARCHIVE_GLOBS
+
+# インデックスファイル（生成物なのでリポジトリには含めない）
+INDEX_FILE = Path(os.environ.get("NOTES_INDEX", ".notes_index.sqlite"))
+
+# trigramで検索できる最短の語の長さ（これより短い語はLIKEで検索）
+MIN_MATCH_CHARS = 3
+
+# 話者ではないメタ情報の行
+META_KEYS = {"日時", "参加者", "Fireflies URL", "時間", "Meeting Date"}
+
+SPEAKER_PATTERN = re.compile(r"^\*\*([^*\n]+?)\*\*(?: \*\[[\d:]+\]\*)?:", re.MULTILINE)
+DATE_LINE_PATTERN = re.compile(r"^\*\*日時\*\*:\s*(.+)$", re.MULTILINE)
+PARTICIPANTS_LINE_PATTERN = re.compile(r"^\*\*参加者\*\*:\s*(.+)$", re.MULTILINE)
+
+# インデックスの形式を変えたら上げる（古いインデックスは作り直す）
+SCHEMA_VERSION = 2
+
+# notes_fts の rowid は notes.id と同じにする（pathで探すと全件走査になるので、削除・結合は rowid で行う）
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    title TEXT,
+    date TEXT
+);
+CREATE TABLE IF NOT EXISTS speakers (
+    path TEXT NOT NULL,
+    speaker TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS speakers_path ON speakers(path);
+CREATE INDEX IF NOT EXISTS speakers_speaker ON speakers(speaker);
+CREATE INDEX IF NOT EXISTS notes_date ON notes(date);
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    title, body, tokenize='trigram'
+);
+"""
+
+
+def connect(index_file=INDEX_FILE):
+    """インデックスに接続（なければ作成）"""
+    conn = sqlite3.connect(index_file)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        # インデックスは議事録から作り直せるので、古い形式なら捨てて次の update で全件登録する
+        conn.executescript("""
+            DROP TABLE IF EXISTS notes_fts;
+            DROP TABLE IF EXISTS speakers;
+            DROP TABLE IF EXISTS notes;
+        """)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def parse_note_date(file_path, text):
+    """ファイル名（YYMMDD_ / YYYY-MM-DD_）または日時行から日付をYYYY-MM-DDで取得"""
+    name = file_path.name
+    for fmt, length in (("%Y-%m-%d", 10), ("%y%m%d", 6)):
+        try:
+            return datetime.strptime(name[:length], fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+
+    m = DATE_LINE_PATTERN.search(text)
+    if m:
+        value = m.group(1).strip()
+        try:
+            if value.isdigit():
+                # Unixタイムスタンプ（ミリ秒の場合は秒に変換）
+                ts = int(value)
+                return datetime.fromtimestamp(ts / 1000 if ts > 10000000000 else ts).strftime("%Y-%m-%d")
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    return None
+
+
+def parse_note(file_path, text):
+    """議事録からタイトル・日付・話者を取り出す"""
+    title = ""
+    for line in text.splitlines():
+        if line.startswith("# "):
+            title = line[2:].strip()
+            break
+    speakers = {s.strip() for s in SPEAKER_PATTERN.findall(text)} - META_KEYS
+    # 発言記録のない議事録でも絞り込めるよう参加者も話者として扱う
+    m = PARTICIPANTS_LINE_PATTERN.search(text)
+    if m:
+        speakers.update(p.strip() for p in m.group(1).split(",") if p.strip() and p.strip() != "不明")
+    return title, parse_note_date(file_path, text), sorted(speakers)
+
+
+def index_note(conn, file_path, stat=None):
+    """1件の議事録をインデックスに登録（既存なら置き換え）"""
+    file_path = Path(file_path)
+    stat = stat or file_path.stat()
+    key = file_path.as_posix()
+    text = file_path.read_text(encoding="utf-8", errors="ignore")
+    title, date, speakers = parse_note(file_path, text)
+
+    remove_note(conn, key)
+    note_id = conn.execute(
+        "INSERT INTO notes (path, mtime, size, title, date) VALUES (?, ?, ?, ?, ?)",
+        (key, stat.st_mtime, stat.st_size, title, date),
+    ).lastrowid
+    conn.executemany("INSERT INTO speakers (path, speaker) VALUES (?, ?)", [(key, s) for s in speakers])
+    conn.execute("INSERT INTO notes_fts (rowid, title, body) VALUES (?, ?, ?)", (note_id, title, text))
+
+
+def remove_note(conn, key):
+    """インデックスから議事録を削除"""
+    row = conn.execute("SELECT id FROM notes WHERE path = ?", (key,)).fetchone()
+    if row is None:
+        return
+    conn.execute("DELETE FROM notes_fts WHERE rowid = ?", row)
+    conn.execute("DELETE FROM notes WHERE id = ?", row)
+    conn.execute("DELETE FROM speakers WHERE path = ?", (key,))
+
+
+def add_to_index(file_path, index_file=INDEX_FILE):
+    """保存した議事録を1件だけインデックスへ反映（fetch_fireflies.pyから呼ぶ）"""
+    conn = connect(index_file)
+    with conn:
+        index_note(conn, file_path)
+    conn.close()
+
+
+def update_index(conn, root=Path(".")):
+    """追加・更新・削除された議事録だけをインデックスへ反映"""
+    indexed = {path: (mtime, size) for path, mtime, size in conn.execute("SELECT path, mtime, size FROM notes")}
+    seen = set()
+    updated = 0
+
+    with conn:
+        for pattern in ARCHIVE_GLOBS:
+            for file_path in root.glob(pattern):
+                key = file_path.as_posix()
+                seen.add(key)
+                stat = file_path.stat()
+                if indexed.get(key) == (stat.st_mtime, stat.st_size):
+                    continue
+                index_note(conn, file_path, stat)
+                updated += 1
+
+        removed = set(indexed) - seen
+        for key in removed:
+            remove_note(conn, key)
+
+    return updated, len(removed)
+
+
+def build_query(terms, speaker=None, since=None, until=None, folder=None):
+    """検索語と絞り込み条件からSQLを組み立てる"""
+    match_terms = [t for t in terms if len(t) >= MIN_MATCH_CHARS]
+    like_terms = [t for t in terms if len(t) < MIN_MATCH_CHARS]
+
+    conditions = []
+    params = []
+    if match_terms:
+        # 語ごとにフレーズとして扱い、すべて含むものを検索
+        conditions.append("notes_fts MATCH ?")
+        params.append(" AND ".join('"' + t.replace('"', '""') + '"' for t in match_terms))
+    for term in like_terms:
+        conditions.append("(notes_fts.title LIKE ? OR notes_fts.body LIKE ?)")
+        params.extend([f"%{term}%"] * 2)
+    if speaker:
+        conditions.append("notes.path IN (SELECT path FROM speakers WHERE speaker LIKE ?)")
+        params.append(f"%{speaker}%")
+    if since:
+        conditions.append("notes.date >= ?")
+        params.append(since)
+    if until:
+        conditions.append("notes.date <= ?")
+        params.append(until)
+    if folder:
+        conditions.append("notes.path LIKE ?")
+        params.append(f"{folder}%")
+
+    if match_terms:
+        rank = "bm25(notes_fts, 5.0, 1.0)"
+        excerpt = "snippet(notes_fts, 1, '[', ']', '…', 16)"
+    else:
+        # 短い語だけの検索はスコアがないので、最初の一致箇所の前後を抜き出す
+        rank = "0"
+        excerpt = "substr(notes_fts.body, max(instr(notes_fts.body, ?) - 30, 1), 80)"
+        params.insert(0, like_terms[0] if like_terms else "")
+    sql = f"""
+        SELECT notes.path, notes.title, notes.date, {rank} AS score, {excerpt}
+        FROM notes_fts JOIN notes ON notes.id = notes_fts.rowid
+        WHERE {" AND ".join(conditions) or "1"}
+        ORDER BY score, notes.date DESC
+    """
+    return sql, params
+
+
+def search(conn, terms, limit=20, **filters):
+    """検索して（上位の結果, 総件数, 話者ごとの件数, 月ごとの件数）を返す"""
+    sql, params = build_query(terms, **filters)
+    rows = conn.execute(sql, params).fetchall()
+
+    paths = [row[0] for row in rows]
+    speaker_facets = {}
+    month_facets = {}
+    if paths:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS hits (path TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM hits")
+        conn.executemany("INSERT OR IGNORE INTO hits (path) VALUES (?)", [(p,) for p in paths])
+        speaker_facets = dict(conn.execute(
+            "SELECT speaker, COUNT(*) AS n FROM speakers JOIN hits USING (path) "
+            "GROUP BY speaker ORDER BY n DESC LIMIT 10"
+        ).fetchall())
+        month_facets = dict(conn.execute(
+            "SELECT substr(date, 1, 7) AS month, COUNT(*) FROM notes JOIN hits USING (path) "
+            "WHERE date IS NOT NULL GROUP BY month ORDER BY month DESC"
+        ).fetchall())
+
+    return rows[:limit], len(rows), speaker_facets, month_facets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="議事録の全文検索")
+    parser.add_argument("--index", type=Path, default=INDEX_FILE, help="インデックスファイル")
+    parser.add_argument("--root", type=Path, default=Path("."), help="リポジトリのルート")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("update", help="インデックスを更新")
+
+    search_parser = subparsers.add_parser("search", help="議事録を検索")
+    search_parser.add_argument("terms", nargs="+", help="検索語（複数指定でAND検索）")
+    search_parser.add_argument("--speaker", help="話者で絞り込み（部分一致）")
+    search_parser.add_argument("--since", help="この日付以降（YYYY-MM-DD）")
+    search_parser.add_argument("--until", help="この日付以前（YYYY-MM-DD）")
+    search_parser.add_argument("--folder", help="フォルダで絞り込み（例: クライアント/giftee）")
+    search_parser.add_argument("-n", "--limit", type=int, default=20, help="表示件数")
+    search_parser.add_argument("--no-update", action="store_true", help="検索前にインデックスを更新しない")
+
+    args = parser.parse_args()
+    conn = connect(args.index)
+
+    if args.command == "update" or not args.no_update:
+        updated, removed = update_index(conn, args.root)
+        if args.command == "update" or updated or removed:
+            print(f"Indexed {updated} file(s), removed {removed} file(s)")
+    if args.command == "update":
+        return
+
+    start = time.perf_counter()
+    hits, total, speaker_facets, month_facets = search(
+        conn, args.terms, args.limit,
+        speaker=args.speaker, since=args.since, until=args.until, folder=args.folder,
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"{total} hit(s) in {elapsed:.1f} ms\n")
+    for path, title, date, _, snippet in hits:
+        print(f"{date or '----------'}  {title}")
+        print(f"    {path}")
+        print(f"    {' '.join(snippet.split())}\n")
+
+    if speaker_facets:
+        print("話者: " + ", ".join(f"{s} ({n})" for s, n in speaker_facets.items()))
+    if month_facets:
+        print("月別: " + ", ".join(f"{m} ({n})" for m, n in month_facets.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+スクレイピングしたページの生HTMLキャッシュ
+HTMLは内容のハッシュ（SHA-256）をキーに圧縮して保存し（zstandardがあればzstd、なければgzip）、
+URLごとに最新のハッシュ・取得日時・ETag/Last-Modifiedを記録する
+有効期限内はネットワークに出ず、期限切れのときは条件付きリクエストで更新を確認する
+
+使い方:
+    python scripts/page_cache.py list                 # キャッシュ済みのURL一覧
+    python scripts/page_cache.py show <ハッシュ|URL>    # 保存したHTMLを表示
+    python scripts/page_cache.py gc                   # どのURLからも参照されていないHTMLを削除
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# キャッシュの保存先（生成物なのでリポジトリには含めない）
+CACHE_DIR = Path(os.environ.get("PAGE_CACHE_DIR", Path(__file__).resolve().parent.parent / ".page_cache"))
+
+# 有効期限（秒）。期限内はネットワークに出ずキャッシュを使う
+DEFAULT_TTL = int(os.environ.get("PAGE_CACHE_TTL", 24 * 60 * 60))
+
+ZSTD_LEVEL = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT
+);
+CREATE TABLE IF NOT EXISTS versions (
+    url TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    PRIMARY KEY (url, hash)
+);
+"""
+
+
+def content_hash(html):
+    """HTMLの内容ハッシュ（SHA-256）"""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """URL→内容ハッシュの対応と、ハッシュごとの圧縮HTMLを保存するキャッシュ（スレッド間で共有可能）"""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        # 使うときに初めてディレクトリとインデックスを作る
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.cache_dir / "index.sqlite", check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def object_path(self, digest):
+        """ハッシュに対応するファイルのパス（既存のものがあればその圧縮形式を優先）"""
+        base = self.cache_dir / "objects" / digest[:2] / digest
+        for suffix in (".html.zst", ".html.gz"):
+            path = base.with_name(digest + suffix)
+            if path.exists():
+                return path
+        return base.with_name(digest + (".html.zst" if zstandard else ".html.gz"))
+
+    def lookup(self, url):
+        """URLのキャッシュ情報（hash, fetched_at, etag, last_modified）を返す（なければNone）"""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT hash, fetched_at, etag, last_modified FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"hash": row[0], "fetched_at": row[1], "etag": row[2], "last_modified": row[3]}
+
+    def is_fresh(self, entry):
+        """有効期限内か"""
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def read(self, digest):
+        """ハッシュからHTMLを読み込む（なければNone）"""
+        path = self.object_path(digest)
+        if not path.exists():
+            return None
+        data = path.read_bytes()
+        if path.suffix == ".zst":
+            if zstandard is None:
+                raise RuntimeError(f"zstandardがインストールされていないため読み込めません: {path}")
+            data = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            data = gzip.decompress(data)
+        return data.decode("utf-8")
+
+    def get(self, url, fresh_only=False):
+        """URLのHTMLをキャッシュから返す（fresh_onlyなら有効期限切れはNone）"""
+        entry = self.lookup(url)
+        if entry is None or (fresh_only and not self.is_fresh(entry)):
+            return None
+        return self.read(entry["hash"])
+
+    def put(self, url, html, etag=None, last_modified=None):
+        """HTMLを保存してハッシュを返す（同じ内容は1つのファイルを共有する）"""
+        digest = content_hash(html)
+        path = self.object_path(digest)
+        if not path.exists():
+            data = html.encode("utf-8")
+            if zstandard:
+                data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+            else:
+                data = gzip.compress(data)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+
+        now = time.time()
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, hash, fetched_at, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+                    (url, digest, now, etag, last_modified),
+                )
+                conn.execute(
+                    "INSERT OR IGNORE INTO versions (url, hash, first_seen) VALUES (?, ?, ?)", (url, digest, now)
+                )
+        return digest
+
+    def touch(self, url):
+        """更新がなかった（304）ページの取得日時だけを更新"""
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def fetch(self, http, url, offline=False, **kwargs):
+        """
+        キャッシュを使ってページを取得し (HTML, ハッシュ) を返す
+
+        有効期限内ならキャッシュをそのまま返し、期限切れならETag/Last-Modifiedで
+        条件付きリクエストを送る（304ならキャッシュを使う）。offlineならネットワークに出ない。
+        """
+        entry = self.lookup(url)
+        if entry is not None and (offline or self.is_fresh(entry)):
+            html = self.read(entry["hash"])
+            if html is not None:
+                return html, entry["hash"]
+        if offline:
+            raise LookupError(f"キャッシュにありません: {url}")
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        response = http.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            html = self.read(entry["hash"])
+            if html is not None:
+                self.touch(url)
+                return html, entry["hash"]
+            # 本体が消えていたら条件なしで取り直す
+            response = http.get(url, **kwargs)
+
+        response.raise_for_status()
+        html = response.text
+        digest = self.put(url, html, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return html, digest
+
+    def entries(self):
+        """キャッシュ済みのURL一覧（url, hash, fetched_at）"""
+        with self._lock:
+            return self._db().execute("SELECT url, hash, fetched_at FROM pages ORDER BY url").fetchall()
+
+    def find_hash(self, prefix_or_url):
+        """ハッシュ（先頭一致）またはURLからハッシュを探す"""
+        entry = self.lookup(prefix_or_url)
+        if entry is not None:
+            return entry["hash"]
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT DISTINCT hash FROM versions WHERE hash LIKE ?", (prefix_or_url + "%",)
+            ).fetchall()
+        return rows[0][0] if len(rows) == 1 else None
+
+    def gc(self, keep_versions=False):
+        """どのURLの最新版でもないHTMLを削除（keep_versionsなら過去の版も残す）"""
+        table = "versions" if keep_versions else "pages"
+        with self._lock:
+            referenced = {row[0] for row in self._db().execute(f"SELECT hash FROM {table}")}
+            if not keep_versions:
+                with self._conn:
+                    self._conn.execute("DELETE FROM versions WHERE hash NOT IN (SELECT hash FROM pages)")
+        removed = 0
+        for path in (self.cache_dir / "objects").glob("*/*.html.*"):
+            if path.name.split(".", 1)[0] not in referenced:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="スクレイピングしたページの生HTMLキャッシュ")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="キャッシュの保存先")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="キャッシュ済みのURL一覧")
+    show_parser = subparsers.add_parser("show", help="保存したHTMLを表示")
+    show_parser.add_argument("key", help="ハッシュ（先頭の数文字でも可）またはURL")
+    gc_parser = subparsers.add_parser("gc", help="参照されていないHTMLを削除")
+    gc_parser.add_argument("--keep-versions", action="store_true", help="過去の版のHTMLも残す")
+
+    args = parser.parse_args()
+    cache = PageCache(args.cache_dir)
+
+    if args.command == "list":
+        for url, digest, fetched_at in cache.entries():
+            print(f"{digest[:12]}  {datetime.fromtimestamp(fetched_at):%Y-%m-%d %H:%M}  {url}")
+    elif args.command == "show":
+        digest = cache.find_hash(args.key)
+        html = cache.read(digest) if digest else None
+        if html is None:
+            print(f"キャッシュにありません: {args.key}", file=sys.stderr)
+            raise SystemExit(1)
+        sys.stdout.write(html)
+    elif args.command == "gc":
+        print(f"Removed {cache.gc(args.keep_versions)} file(s)")
+
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
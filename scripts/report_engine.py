@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""
+KPIストア（kpi_store.py）から月次KPIレポート・記事別PC SS目標シート（HTML）を生成するレポートエンジン
+テンプレートは読み込み時に一度だけ string.Template にし、スタイルは templates/1月月次レポート雛形.html のものを使う
+（所見・施策などの文章は手書きのレポートに残し、このエンジンは数値のカードと表だけを作る）
+
+使い方:
+    python scripts/report_engine.py --month 2026-01 --as-of 2026-01-21   # giftee の1月分（1/21時点の実績から月末着地を換算）
+    python scripts/report_engine.py --all                                # 全クライアントの最新月
+"""
+
+import argparse
+import calendar
+import html
+import re
+import time
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+
+import kpi_store
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# スタイル・レイアウトを借りる雛形
+TEMPLATE_FILE = ROOT / "templates" / "1月月次レポート雛形.html"
+STYLE_PATTERN = re.compile(r"<style>.*?</style>", re.DOTALL)
+
+# クライアントごとのレポート設定（KPIシートがあるクライアントだけ）
+REPORTS = {
+    "giftee": {
+        "name": "giftee for Business",
+        "csvs": kpi_store.SOURCE_CSVS,
+        "store": kpi_store.STORE_FILE,
+        "output_dir": ROOT / "クライアント" / "giftee" / "reports",
+        # 月ごとの目標 (PC SS, PC CV)（1月月次レポート雛形の目標シミュレーションと同じ値）
+        "targets": {
+            date(2026, 1, 1): (34324, 34),
+            date(2026, 2, 1): (37070, 39),
+            date(2026, 3, 1): (40035, 44),
+            date(2026, 4, 1): (43238, 50),
+            date(2026, 5, 1): (46697, 56),
+            date(2026, 6, 1): (50433, 64),
+        },
+        "annual_target": 50000,  # PC SS/月
+    },
+}
+
+# CV実績記事一覧・目標シートに載せる記事数
+TOP_ARTICLES = 5
+TARGET_SHEET_ARTICLES = 100
+
+# 記事別の目標（着地想定 × 伸び率、10単位に丸めて最低値を下回らないようにする）
+ARTICLE_TARGET_GROWTH = 1.4
+MIN_ARTICLE_TARGET = 20
+
+# Tier分け（1位はTier S、上位10記事のうちPC SSがこれ以上ならTier A）
+TIER_A_RANK = 10
+TIER_A_MIN_SS = 400
+
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$title</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Noto+Sans+JP:wght@400;500;700&display=swap" rel="stylesheet">
+    <link href="https://fonts.googleapis.com/icon?family=Material+Icons+Round" rel="stylesheet">
+    $style
+</head>
+<body>
+
+<div class="wrapper">
+    <nav class="sidebar">
+        <div class="sidebar-header">
+            <h1>$heading</h1>
+            <div class="subtitle">$period</div>
+        </div>
+        <div class="agenda-group">
+            <div class="agenda-group-title">REPORT MENU</div>
+            <ul class="agenda-list">
+$nav            </ul>
+        </div>
+    </nav>
+
+    <main class="main-content">
+        <div class="print-header" style="display: none;">
+            <h1>$title</h1>
+            <p>対象期間: $period</p>
+        </div>
+$body
+        <p style="font-size: 11px; color: #999; text-align: right;">$footer</p>
+    </main>
+</div>
+
+</body>
+</html>
+""")
+
+NAV_ITEM = Template("""                <li class="agenda-item">
+                    <a href="#$id">
+                        <span class="material-icons-round">$icon</span>$label
+                    </a>
+                </li>
+""")
+
+SECTION = Template("""
+        <section id="$id">
+            <h2><span class="material-icons-round">$icon</span>$label</h2>
+$content        </section>
+""")
+
+METRIC_CARD = Template("""                <div class="metric-card"$border>
+                    <div class="metric-label"><span class="material-icons-round" style="font-size:16px;">$icon</span>$label</div>
+                    <div class="metric-value">$value<span style="font-size:14px; font-weight:500; color:#999;">$unit</span></div>
+                    <div class="metric-sub $trend">
+                        <span class="material-icons-round" style="font-size:16px;">$trend_icon</span>
+                        $sub
+                    </div>
+                </div>
+""")
+
+TARGET_BANNER = Template("""            <div style="background: linear-gradient(135deg, #2c3e50 0%, #3498db 100%); color: #fff; padding: 25px; border-radius: 12px; margin-bottom: 30px; display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap; gap: 20px;">
+                <div>
+                    <h3 style="margin: 0; border: none; color: #fff; font-size: 14px; opacity: 0.9; padding: 0;">${month_label}目標 (Target)</h3>
+                    <p style="font-size: 14px; opacity: 0.9; margin: 8px 0 0;">PC CV $target_cv件 / PC SS $target_ss件 / PC CVR $target_cvr%</p>
+                </div>
+                <div style="background: rgba(255,255,255,0.2); padding: 10px 20px; border-radius: 30px; font-weight: bold;">
+                    Status: $status
+                </div>
+            </div>
+""")
+
+TABLE = Template("""            <div class="chart-container" style="max-width: 100%;">
+                <div class="chart-title"><span class="material-icons-round">$icon</span>$title</div>
+                <div style="overflow-x: auto;">
+                <table style="width: 100%; font-size: 13px; margin: 0;">
+                    <thead>
+                        <tr>$header</tr>
+                    </thead>
+                    <tbody>
+$rows                    </tbody>
+                </table>
+                </div>
+$note            </div>
+""")
+
+TREND_ROW = Template("""                        <tr$style>
+                            <td style="text-align: center;">$month</td>
+                            <td style="text-align: right;">$ss</td>
+                            <td style="text-align: right;">$target_ss</td>
+                            <td style="text-align: right;">$form</td>
+                            <td style="text-align: right;">$cv</td>
+                            <td style="text-align: right;">$target_cv</td>
+                            <td style="text-align: right;">$ctr</td>
+                            <td style="text-align: right;">$form_cvr</td>
+                        </tr>
+""")
+
+ARTICLE_ROW = Template("""                        <tr>
+                            <td style="text-align:center;">$rank</td>
+                            <td><a href="$url" target="_blank">$title</a></td>
+                            <td style="text-align:right;">$ss</td>
+                            <td style="text-align:right;" class="$ss_trend">$ss_change</td>
+                            <td style="text-align:right;">$cv</td>
+                            <td style="text-align:right;" class="$cv_trend">$cv_change</td>
+                        </tr>
+""")
+
+TARGET_ROW = Template("""                        <tr>
+                            <td style="text-align:center;">$rank</td>
+                            <td><a href="$url" target="_blank">$title</a>$tier</td>
+                            <td style="text-align:right;">$current</td>
+                            <td style="text-align:right;">$target</td>
+                            <td style="text-align:right;" class="trend-up">$gap</td>
+                            <td style="text-align:right;">$progress</td>
+                        </tr>
+""")
+
+TIER_BADGE = Template(""" <span class="status-badge $css" style="font-size:11px;">Tier $tier</span>""")
+
+
+@lru_cache(maxsize=None)
+def load_style(template_file=TEMPLATE_FILE):
+    """雛形の <style> ブロック（レイアウト・カード・表の見た目）"""
+    match = STYLE_PATTERN.search(Path(template_file).read_text(encoding="utf-8"))
+    return match.group(0) if match else ""
+
+
+def previous_month(month):
+    return date(month.year - 1, 12, 1) if month.month == 1 else date(month.year, month.month - 1, 1)
+
+
+def landing_factor(month, as_of):
+    """月途中の実績を月末着地に換算する倍率（as_of がその月の途中でなければ1）"""
+    if as_of is None or (as_of.year, as_of.month) != (month.year, month.month):
+        return 1.0
+    days = calendar.monthrange(month.year, month.month)[1]
+    return days / as_of.day if as_of.day < days else 1.0
+
+
+def kpis(metrics, factor=1.0):
+    """月の合計から PC SS・フォームSS・CV（着地換算）と率を計算"""
+    if not metrics:
+        return None
+    ss = metrics.get("PC_SS", 0) * factor
+    form = metrics.get("PS_FM_SS", 0) * factor
+    cv = metrics.get("PC_CV", 0) * factor
+    return {
+        "ss": ss,
+        "form": form,
+        "cv": cv,
+        "cvr": cv / ss if ss else None,
+        "ctr": form / ss if ss else None,
+        "form_cvr": cv / form if form else None,
+    }
+
+
+def fmt_int(value):
+    return "-" if value is None else f"{value:,.0f}"
+
+
+def fmt_percent(value, digits=1):
+    return "-" if value is None else f"{value * 100:.{digits}f}%"
+
+
+def change_rate(current, previous):
+    """前月比（増減率）。前月が0・なしなら None"""
+    if current is None or not previous:
+        return None
+    return current / previous - 1
+
+
+def fmt_change(rate):
+    """(表示, CSSクラス, アイコン)"""
+    if rate is None:
+        return "-", "trend-flat", "remove"
+    if rate > 0:
+        return f"+{rate:.0%}", "trend-up", "trending_up"
+    if rate < 0:
+        return f"{rate:.0%}", "trend-down", "trending_down"
+    return "±0%", "trend-flat", "trending_flat"
+
+
+def render_cards(inputs):
+    current, previous = inputs["current"], inputs["previous"]
+    prev_label = inputs["prev_label"]
+    unit_suffix = "予測" if inputs["provisional"] else ""
+    cards = []
+    for key, label, icon, unit, border in (
+        ("cv", "PC CV数", "flag", "件", ' style="border-top: 4px solid #e74c3c;"'),
+        ("ss", "PCセッション", "visibility", "", ""),
+        ("form", "PC CTA到達数", "touch_app", "件", ' style="border-top: 4px solid #27ae60;"'),
+    ):
+        value = current[key]
+        before = previous[key] if previous else None
+        change, trend, trend_icon = fmt_change(change_rate(value, before))
+        cards.append(METRIC_CARD.substitute(
+            border=border, icon=icon, label=label, value=fmt_int(value), unit=unit + unit_suffix,
+            trend=trend, trend_icon=trend_icon,
+            sub=f"前月比 {change} ({prev_label}: {fmt_int(before)})",
+        ))
+
+    cvr = current["cvr"]
+    before = previous["cvr"] if previous else None
+    if cvr is None or before is None:
+        pt, trend, trend_icon = "-", "trend-flat", "remove"
+    else:
+        diff = (cvr - before) * 100
+        pt = f"{diff:+.2f}pt"
+        trend, trend_icon = ("trend-up", "trending_up") if diff > 0 else \
+            ("trend-down", "trending_down") if diff < 0 else ("trend-flat", "trending_flat")
+    cards.append(METRIC_CARD.substitute(
+        border="", icon="percent", label="PC CVR", value=fmt_percent(cvr, 2).rstrip("%"), unit="%",
+        trend=trend, trend_icon=trend_icon, sub=f"前月比 {pt} ({prev_label}: {fmt_percent(before, 2)})",
+    ))
+    return '            <div class="metric-grid">\n' + "".join(cards) + "            </div>\n"
+
+
+def render_banner(inputs):
+    target_ss, target_cv = inputs["target"]
+    current = inputs["current"]
+    achieved = current["cv"] >= target_cv
+    status = ("達成" if achieved else "未達") + ("見込み" if inputs["provisional"] else "")
+    return TARGET_BANNER.substitute(
+        month_label=inputs["month_label"], target_cv=fmt_int(target_cv), target_ss=fmt_int(target_ss),
+        target_cvr=f"{target_cv / target_ss * 100:.2f}" if target_ss else "-", status=status,
+    )
+
+
+def render_trend_row(inputs):
+    values = inputs["kpis"]
+    target_ss, target_cv = inputs["target"] or (None, None)
+    style = ' style="background: #e3f2fd; font-weight: bold;"' if inputs["current"] else ""
+    if values is None:
+        return TREND_ROW.substitute(style=style, month=inputs["label"], ss="-", target_ss=fmt_int(target_ss),
+                                    form="-", cv="-", target_cv=fmt_int(target_cv), ctr="-", form_cvr="-")
+    return TREND_ROW.substitute(
+        style=style, month=inputs["label"], ss=fmt_int(values["ss"]), target_ss=fmt_int(target_ss),
+        form=fmt_int(values["form"]), cv=fmt_int(values["cv"]), target_cv=fmt_int(target_cv),
+        ctr=fmt_percent(values["ctr"], 2), form_cvr=fmt_percent(values["form_cvr"]),
+    )
+
+
+def render_article_row(inputs):
+    ss_change, ss_trend, _ = fmt_change(change_rate(inputs["ss"], inputs["prev_ss"]))
+    cv_change, cv_trend, _ = fmt_change(change_rate(inputs["cv"], inputs["prev_cv"]))
+    return ARTICLE_ROW.substitute(
+        rank=inputs["rank"], url=html.escape(inputs["url"] or ""), title=html.escape(inputs["title"]),
+        ss=fmt_int(inputs["ss"]), ss_change=ss_change, ss_trend=ss_trend,
+        cv=fmt_int(inputs["cv"]), cv_change=cv_change, cv_trend=cv_trend,
+    )
+
+
+def render_target_row(inputs):
+    tier = inputs["tier"]
+    badge = TIER_BADGE.substitute(tier=tier, css="bg-danger" if tier == "S" else "bg-warning") if tier else ""
+    current, target = inputs["current"], inputs["target"]
+    return TARGET_ROW.substitute(
+        rank=inputs["rank"], url=html.escape(inputs["url"] or ""), title=html.escape(inputs["title"]), tier=badge,
+        current=fmt_int(current), target=fmt_int(target), gap=f"{target - current:+,.0f}",
+        progress=f"{current / target:.0%}" if target else "-",
+    )
+
+
+def render_target_summary(inputs):
+    total, goal = inputs["total"], inputs["goal"]
+    cards = [
+        METRIC_CARD.substitute(border=' style="border-top: 4px solid #e74c3c;"', icon="flag", label="年間目標",
+                               value=fmt_int(goal), unit="SS/月", trend="trend-flat", trend_icon="event",
+                               sub="PC SS"),
+        METRIC_CARD.substitute(border="", icon="visibility", label=f"{inputs['month_label']}着地想定",
+                               value=fmt_int(total), unit="SS", trend="trend-flat", trend_icon="info",
+                               sub=inputs["basis"]),
+        METRIC_CARD.substitute(border="", icon="add_chart", label="必要増加分", value=f"{goal - total:+,.0f}",
+                               unit="SS", trend="trend-flat", trend_icon="trending_up", sub="年間目標まで"),
+        METRIC_CARD.substitute(border=' style="border-top: 4px solid #27ae60;"', icon="percent", label="達成率",
+                               value=f"{total / goal * 100:.1f}" if goal else "-", unit="%", trend="trend-flat",
+                               trend_icon="verified", sub="着地想定 / 年間目標"),
+    ]
+    return '            <div class="metric-grid">\n' + "".join(cards) + "            </div>\n"
+
+
+def article_metrics(table, month):
+    """記事（パス）ごとの {指標: 値} とタイトル・URL"""
+    articles = {}
+    rows = kpi_store.select(table, month=month)
+    for path, keyword, url, metric, value in zip(rows["path"].to_pylist(), rows["keyword"].to_pylist(),
+                                                  rows["url"].to_pylist(), rows["metric"].to_pylist(),
+                                                  rows["value"].to_pylist()):
+        article = articles.setdefault(path, {"path": path, "title": keyword or path, "url": url, "metrics": {}})
+        article["metrics"][metric] = value
+    return articles
+
+
+def article_target(current):
+    return max(MIN_ARTICLE_TARGET, round(current * ARTICLE_TARGET_GROWTH, -1))
+
+
+def tier(rank, current):
+    if rank == 1:
+        return "S"
+    if rank <= TIER_A_RANK and current >= TIER_A_MIN_SS:
+        return "A"
+    return ""
+
+
+def page(title, heading, period, sections, footer):
+    nav = "".join(NAV_ITEM.substitute(id=id, icon=icon, label=label) for id, icon, label, _ in sections)
+    body = "".join(SECTION.substitute(id=id, icon=icon, label=label, content=content)
+                   for id, icon, label, content in sections)
+    return PAGE_TEMPLATE.substitute(title=title, heading=heading, period=period, nav=nav, body=body,
+                                    style=load_style(), footer=footer)
+
+
+def period_label(month, as_of):
+    days = calendar.monthrange(month.year, month.month)[1]
+    if landing_factor(month, as_of) != 1.0:
+        return f"{month.year}年{month.month}月 ({month.month}/1〜{month.month}/{as_of.day} 暫定)"
+    return f"{month.year}年{month.month}月 ({month.month}/1〜{month.month}/{days})"
+
+
+def basis_label(month, as_of):
+    """着地想定の根拠（月途中なら換算式）"""
+    if landing_factor(month, as_of) == 1.0:
+        return "確定値"
+    days = calendar.monthrange(month.year, month.month)[1]
+    return f"※{month.month}/{as_of.day}実績×{days}/{as_of.day}で換算"
+
+
+def render_monthly_report(config, table, totals, month, as_of=None):
+    """月次KPIレポート（サマリーカード・実績推移・CV実績記事一覧）"""
+    factor = landing_factor(month, as_of)
+    previous = previous_month(month)
+    current = kpis(totals.get(month), factor)
+    before = kpis(totals.get(previous))
+    month_label = f"{month.month}月"
+    targets = config.get("targets", {})
+
+    summary = ""
+    if month in targets:
+        summary += render_banner({
+            "month_label": f"{month.year}年{month_label}", "target": targets[month], "current": current,
+            "provisional": factor != 1.0,
+        })
+    summary += render_cards({
+        "current": current, "previous": before, "prev_label": f"{previous.month}月", "provisional": factor != 1.0,
+    })
+
+    # 実績推移は目標のある月（なければその年の1月から対象月まで）
+    months = sorted(m for m in targets if m.year == month.year) or \
+        [date(month.year, m, 1) for m in range(1, month.month + 1)]
+    trend_rows = "".join(render_trend_row({
+        "label": f"{m.month}月", "kpis": kpis(totals.get(m), landing_factor(m, as_of)) if m <= month else None,
+        "target": targets.get(m), "current": m == month,
+    }) for m in months)
+    trend = TABLE.substitute(
+        icon="assessment", title=f"実績推移（{months[0].year}年{months[0].month}月〜）",
+        header="".join(f"<th>{name}</th>" for name in
+                       ("月", "PC SS", "目標PC SS", "フォームSS", "PC CV", "目標PC CV", "フォームCTR", "フォームCVR")),
+        rows=trend_rows,
+        note='                <p style="font-size: 11px; color: #666; margin-top: 10px; text-align: right;">'
+             "※フォームCTR = フォームSS / PC SS<br>※フォームCVR = PC CV / フォームSS</p>\n",
+    )
+
+    # CV実績記事一覧（CV→PC SSの多い順）
+    articles = article_metrics(table, month)
+    prev_articles = article_metrics(table, previous)
+    ranked = sorted(articles.values(), key=lambda a: (-(a["metrics"].get("PC_CV") or 0),
+                                                      -(a["metrics"].get("PC_SS") or 0), a["path"]))
+    article_rows = ""
+    for rank, article in enumerate(ranked[:TOP_ARTICLES], start=1):
+        prev = prev_articles.get(article["path"], {}).get("metrics", {})
+        article_rows += render_article_row({
+            "rank": rank, "title": article["title"], "url": article["url"],
+            "ss": (article["metrics"].get("PC_SS") or 0) * factor, "prev_ss": prev.get("PC_SS"),
+            "cv": (article["metrics"].get("PC_CV") or 0) * factor, "prev_cv": prev.get("PC_CV"),
+        })
+    ranking = TABLE.substitute(
+        icon="trending_up", title="CV実績記事一覧",
+        header="".join(f"<th>{name}</th>" for name in
+                       ("順位", "記事タイトル", "PCセッション", "セッション前月比", "CV", "CV前月比")),
+        rows=article_rows, note="",
+    )
+
+    return page(
+        title=f"{config['name']} {month_label}月次KPIレポート",
+        heading="月次KPIレポート",
+        period=period_label(month, as_of),
+        sections=[
+            ("summary", "dashboard", "1. サマリー", summary),
+            ("overall", "analytics", "2. 実績推移", trend),
+            ("articles", "article", "3. CV実績記事一覧", ranking),
+        ],
+        footer=f"{config['name']} | KPIシートから自動生成（{basis_label(month, as_of)}）",
+    )
+
+
+def render_target_sheet(config, table, month, as_of=None):
+    """記事別PC SS目標シート（着地想定の多い順）"""
+    factor = landing_factor(month, as_of)
+    articles = article_metrics(table, month)
+    ranked = sorted(articles.values(), key=lambda a: (-(a["metrics"].get("PC_SS") or 0), a["path"]))
+    month_label = f"{month.month}月"
+
+    rows = ""
+    for rank, article in enumerate(ranked[:TARGET_SHEET_ARTICLES], start=1):
+        current = round((article["metrics"].get("PC_SS") or 0) * factor)
+        rows += render_target_row({
+            "rank": rank, "title": article["title"], "url": article["url"], "current": current,
+            "target": article_target(current), "tier": tier(rank, current),
+        })
+
+    total = sum((a["metrics"].get("PC_SS") or 0) for a in articles.values()) * factor
+    summary = render_target_summary({
+        "total": total, "goal": config.get("annual_target", 0), "month_label": month_label,
+        "basis": basis_label(month, as_of),
+    })
+    table_html = TABLE.substitute(
+        icon="list", title=f"記事別PC SS目標一覧（TOP {TARGET_SHEET_ARTICLES}）",
+        header="".join(f"<th>{name}</th>" for name in
+                       ("Rank", "記事名", f"{month_label}着地想定", "目標PC SS", "Gap", "達成率")),
+        rows=rows,
+        note=f'                <p style="font-size: 11px; color: #666; margin-top: 10px; text-align: right;">'
+             f"※目標PC SS = 着地想定 × {ARTICLE_TARGET_GROWTH}（10単位に丸め、最低{MIN_ARTICLE_TARGET}）</p>\n",
+    )
+    return page(
+        title=f"{config['name']} 記事別PC SS目標シート",
+        heading="記事別PC SS目標",
+        period=period_label(month, as_of),
+        sections=[
+            ("summary", "flag", "目標と着地想定", summary),
+            ("articles", "list", "記事別PC SS目標一覧", table_html),
+        ],
+        footer=f"{config['name']} | KPIシートから自動生成",
+    )
+
+
+def write_if_changed(path, content):
+    """内容が変わったときだけ書き込む（変わらなければFalse）"""
+    if path.exists() and path.read_text(encoding="utf-8") == content:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    tmp_path.replace(path)
+    return True
+
+
+def generate_reports(client, config, month=None, as_of=None):
+    """クライアントの月次KPIレポートと目標シートを生成し、[(出力パス, 書き込んだか)] を返す"""
+    table = kpi_store.load_store(config["csvs"], config["store"])
+    totals = kpi_store.monthly_totals(table)
+    if not totals:
+        print(f"{client}: KPIデータがありません")
+        return []
+    month = month or max(totals)
+    if month not in totals:
+        print(f"{client}: {month:%Y-%m} のKPIデータがありません")
+        return []
+
+    output_dir = config["output_dir"]
+    outputs = [
+        (output_dir / f"{month.year}年{month.month}月_月次KPIレポート.html",
+         render_monthly_report(config, table, totals, month, as_of)),
+        (output_dir / f"{month.year}年{month.month}月_記事別PCSS目標シート.html",
+         render_target_sheet(config, table, month, as_of)),
+    ]
+    return [(path, write_if_changed(path, content)) for path, content in outputs]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="KPIストアから月次レポートを生成")
+    parser.add_argument("--client", choices=sorted(REPORTS), default="giftee")
+    parser.add_argument("--all", action="store_true", help="全クライアントのレポートを生成")
+    parser.add_argument("--month", type=kpi_store.parse_month, help="対象の年月（省略時は最新月）")
+    parser.add_argument("--as-of", type=date.fromisoformat,
+                        help="実績の集計日（月途中なら月末着地に換算。例: 2026-01-21）")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    start = time.perf_counter()
+    clients = sorted(REPORTS) if args.all else [args.client]
+    for client in clients:
+        for path, written in generate_reports(client, REPORTS[client], args.month, args.as_of):
+            print(f"{'Saved' if written else 'Unchanged'}: {path.relative_to(ROOT)}")
+    print(f"\n（{(time.perf_counter() - start) * 1000:.0f} ms）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+保存済みの議事録を現在のクライアント判定ルールで振り分け直すスクリプト
+CLIENT_MAPPINGにクライアントや別名を追加したあと、過去の議事録をまとめて再分類する
+
+使い方:
+    python scripts/reroute_notes.py            # 移動予定を表示するだけ（ドライラン）
+    python scripts/reroute_notes.py --apply    # 実際に移動する
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from client_router import DEFAULT_FOLDER, detect_client
+
+# 再分類の対象にする議事録フォルダ
+ARCHIVE_GLOBS = [
+    "クライアント/*/議事録/*.md",
+    "寺倉ナレッジ/会議一覧/*.md",
+    "社内/議事録/*.md",
+    "採用/議事録/*.md",
+    "その他/議事録/*.md",
+]
+
+# ヘッダー部分（タイトル・参加者）だけを読むためのバイト数
+HEADER_BYTES = 4096
+
+# fetch_fireflies.pyが保存した議事録に含まれる行
+FIREFLIES_MARKER = "**Fireflies URL**:"
+
+
+def read_note_header(file_path):
+    """議事録の先頭からタイトル・参加者を読み取る"""
+    with open(file_path, "rb") as f:
+        head = f.read(HEADER_BYTES).decode("utf-8", errors="ignore")
+
+    title = ""
+    participants = []
+    for line in head.splitlines():
+        if not title and line.startswith("# "):
+            title = line[2:].strip()
+        elif line.startswith("**参加者**:"):
+            value = line.split(":", 1)[1].strip()
+            if value != "不明":
+                participants = [p.strip() for p in value.split(",") if p.strip()]
+    return {
+        "title": title,
+        "participants": participants,
+        "from_fireflies": FIREFLIES_MARKER in head,
+    }
+
+
+def plan_moves(root, include_manual=False):
+    """移動が必要な議事録を (移動元, 移動先フォルダ) のリストで返す"""
+    moves = []
+    scanned = 0
+    for pattern in ARCHIVE_GLOBS:
+        for file_path in sorted(root.glob(pattern)):
+            scanned += 1
+            header = read_note_header(file_path)
+            # 手作業で置いた議事録はデフォルトでは動かさない
+            if not header["from_fireflies"] and not include_manual:
+                continue
+            folder = detect_client(header["title"], header["participants"])
+            # 判定できなかった議事録を「その他」へ戻すことはしない
+            if folder == DEFAULT_FOLDER:
+                continue
+            if file_path.parent.resolve() != (root / folder).resolve():
+                moves.append((file_path, folder))
+    return moves, scanned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="保存済みの議事録を振り分け直す")
+    parser.add_argument("--root", type=Path, default=Path("."), help="リポジトリのルート")
+    parser.add_argument("--apply", action="store_true", help="実際にファイルを移動する")
+    parser.add_argument("--include-manual", action="store_true",
+                        help="Fireflies以外で作成した議事録も対象にする")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    moves, scanned = plan_moves(args.root, args.include_manual)
+    elapsed = time.perf_counter() - start
+
+    moved = 0
+    for file_path, folder in moves:
+        dest_dir = args.root / folder
+        dest_path = dest_dir / file_path.name
+        print(f"{file_path} -> {folder}/")
+        if not args.apply:
+            continue
+        if dest_path.exists():
+            print(f"  Skip (already exists): {dest_path}")
+            continue
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        file_path.rename(dest_path)
+        moved += 1
+
+    rate = scanned / elapsed if elapsed > 0 else 0
+    print(f"\nScanned {scanned} file(s) in {elapsed:.2f}s ({rate:,.0f} files/s)")
+    if args.apply:
+        print(f"Moved {moved} of {len(moves)} file(s)")
+    else:
+        print(f"{len(moves)} file(s) would be moved (use --apply to move)")
+
+
+if __name__ == "__main__":
+    main()
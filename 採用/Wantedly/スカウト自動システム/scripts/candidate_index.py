@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+候補者ファイルの解析結果を保存するインデックス
+ファイルのパス（スカウト自動システムのフォルダからの相対パス）・更新日時・サイズをキーにステータスをキャッシュし、新規・更新されたファイルだけを読み直す
+ステータスの変化と移動の履歴も記録し、集計に使う
+
+使い方:
+    python scripts/candidate_index.py    # ステータス別件数・要確認の滞留日数・週次の処理件数を表示
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+
+# インデックスファイル（生成物なのでリポジトリには含めない）
+INDEX_FILE = BASE_DIR / ".candidate_index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    status TEXT,
+    reason TEXT,
+    first_seen TEXT NOT NULL,
+    status_since TEXT NOT NULL,
+    moved_to TEXT,
+    moved_at TEXT
+);
+CREATE TABLE IF NOT EXISTS status_events (
+    path TEXT NOT NULL,
+    status TEXT,
+    at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS status_events_path ON status_events(path);
+"""
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def candidate_key(file_path, base_dir=BASE_DIR):
+    """インデックスのキー（base_dir からの相対パス。別のステータスフォルダの同名ファイルと区別する）"""
+    file_path = Path(file_path).resolve()
+    try:
+        return file_path.relative_to(Path(base_dir).resolve()).as_posix()
+    except ValueError:
+        return file_path.as_posix()
+
+
+class CandidateIndex:
+    """候補者ファイルの解析結果と履歴を保存するインデックス"""
+
+    def __init__(self, index_file=INDEX_FILE, readonly=False):
+        if readonly:
+            # ドライラン用: 保存済みの解析結果は使うが、ファイルは作らず書き込みもしない
+            if Path(index_file).exists():
+                self.conn = sqlite3.connect(f"{Path(index_file).resolve().as_uri()}?mode=ro", uri=True)
+                return
+            index_file = ":memory:"
+        self.conn = sqlite3.connect(index_file)
+        self.conn.executescript(SCHEMA)
+
+    def lookup(self, file_path, stat):
+        """前回から変更がなければ保存済みの解析結果を返す（変更があればNone）"""
+        row = self.conn.execute(
+            "SELECT status, reason FROM candidates WHERE path = ? AND mtime = ? AND size = ?",
+            (candidate_key(file_path), stat.st_mtime, stat.st_size),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"status": row[0], "reason": row[1] or ""}
+
+    def record(self, file_path, stat, result):
+        """解析結果を保存（ステータスが変わった場合は履歴にも追加）"""
+        self.record_all([(file_path, stat, result)])
+
+    def record_all(self, entries):
+        """(ファイル, stat, 解析結果) をまとめて1回のトランザクションで保存"""
+        now = _now()
+        with self.conn:
+            for file_path, stat, result in entries:
+                self._record(file_path, stat, result, now)
+
+    def _record(self, file_path, stat, result, now):
+        """1件分の保存（コミットは呼び出し側）"""
+        key = candidate_key(file_path)
+        status = result["status"]
+        row = self.conn.execute("SELECT status FROM candidates WHERE path = ?", (key,)).fetchone()
+
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO candidates (path, mtime, size, status, reason, first_seen, status_since) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, stat.st_mtime, stat.st_size, status, result.get("reason", ""), now, now),
+            )
+        else:
+            self.conn.execute(
+                "UPDATE candidates SET mtime = ?, size = ?, status = ?, reason = ?, "
+                "status_since = CASE WHEN status IS ? THEN status_since ELSE ? END WHERE path = ?",
+                (stat.st_mtime, stat.st_size, status, result.get("reason", ""), status, now, key),
+            )
+        if row is None or row[0] != status:
+            self.conn.execute(
+                "INSERT INTO status_events (path, status, at) VALUES (?, ?, ?)", (key, status, now)
+            )
+
+    def record_move(self, file_path, dest_dir):
+        """OK/NGフォルダへの移動を記録（キーも移動先のパスに変える）"""
+        key = candidate_key(file_path)
+        dest_key = candidate_key(Path(dest_dir) / Path(file_path).name)
+        with self.conn:
+            # 移動先で上書きされたファイルの記録は消す
+            self.conn.execute("DELETE FROM candidates WHERE path = ?", (dest_key,))
+            self.conn.execute("DELETE FROM status_events WHERE path = ?", (dest_key,))
+            self.conn.execute(
+                "UPDATE candidates SET path = ?, moved_to = ?, moved_at = ? WHERE path = ?",
+                (dest_key, Path(dest_dir).name, _now(), key),
+            )
+            self.conn.execute("UPDATE status_events SET path = ? WHERE path = ?", (dest_key, key))
+
+    def status_counts(self):
+        """ステータスごとの件数（移動済みは移動先ごとに集計）"""
+        rows = self.conn.execute(
+            "SELECT COALESCE(moved_to, COALESCE(status, '未判断')), COUNT(*) FROM candidates "
+            "GROUP BY 1 ORDER BY 2 DESC"
+        ).fetchall()
+        return dict(rows)
+
+    def review_durations(self, now=None):
+        """ファイルごとの「要確認」の滞留日数（現在も要確認なら現在までの日数）"""
+        now = now or datetime.now()
+        durations = {}
+        entered = {}
+        for path, status, at in self.conn.execute(
+            "SELECT path, status, at FROM status_events ORDER BY path, at, rowid"
+        ):
+            at = datetime.fromisoformat(at)
+            if path in entered:
+                durations[path] = durations.get(path, timedelta()) + (at - entered.pop(path))
+            if status == "要確認":
+                entered[path] = at
+        for path, since in entered.items():
+            durations[path] = durations.get(path, timedelta()) + (now - since)
+        return {path: d.total_seconds() / 86400 for path, d in durations.items()}
+
+    def weekly_throughput(self):
+        """週ごとのOK/NGフォルダへの移動件数（ISO週）"""
+        weeks = {}
+        for moved_to, moved_at in self.conn.execute(
+            "SELECT moved_to, moved_at FROM candidates WHERE moved_at IS NOT NULL"
+        ):
+            year, week, _ = datetime.fromisoformat(moved_at).isocalendar()
+            counts = weeks.setdefault(f"{year}-W{week:02d}", {})
+            counts[moved_to] = counts.get(moved_to, 0) + 1
+        return dict(sorted(weeks.items()))
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    """インデックスの集計結果を表示"""
+    index = CandidateIndex()
+
+    print("=" * 60)
+    print("候補者パイプライン集計")
+    print("=" * 60)
+
+    print("\n■ ステータス別件数")
+    for status, count in index.status_counts().items():
+        print(f"  {status}: {count}件")
+
+    durations = index.review_durations()
+    print("\n■ 要確認の滞留日数")
+    if durations:
+        values = sorted(durations.values())
+        print(f"  対象: {len(values)}件 / 平均: {sum(values) / len(values):.1f}日 / 最長: {values[-1]:.1f}日")
+    else:
+        print("  なし")
+
+    print("\n■ 週次の処理件数")
+    throughput = index.weekly_throughput()
+    if throughput:
+        for week, counts in throughput.items():
+            detail = ", ".join(f"{dest}: {n}件" for dest, n in sorted(counts.items()))
+            print(f"  {week}: {detail}")
+    else:
+        print("  なし")
+
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,31 +5,110 @@
 
 import os
 import re
+import csv
+import json
 import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from candidate_index import CandidateIndex
+
 # パス設定
 BASE_DIR = Path(__file__).parent.parent
 CANDIDATES_DIR = BASE_DIR / "候補者フォルダ"
 OK_DIR = BASE_DIR / "OKフォルダ"
 NG_DIR = BASE_DIR / "NGフォルダ"
 
-def extract_status_from_md(file_path):
-    """mdファイルからスクリーニング結果のステータスを抽出"""
+# スクリーニング結果を探す範囲（先頭・末尾からそれぞれ読む最大バイト数）
+STATUS_SCAN_BYTES = 256 * 1024
+
+# スクリーニング結果セクションの見出しと項目
+SCREENING_HEADING_PATTERN = re.compile(r'^#{2,}\s*スクリーニング結果\s*$')
+# セクションの終わりとみなす見出し（# と ##。### 以下の小見出しはセクションに含める）
+SECTION_END_PATTERN = re.compile(r'^#{1,2}(?:\s|$)')
+SCREENING_FIELD_PATTERN = re.compile(r'^\s*(?:[-*]\s*)?\*\*(.+?)\*\*\s*[:：]\s*(.*?)\s*$')
+SCREENING_FIELDS = {
+    "ステータス": "status",
+    "判断理由": "reason",
+    "判断日時": "decided_at",
+    "スコア": "score",
+    "判断者": "screener",
+    "スクリーナー": "screener",
+}
+STATUS_PATTERN = re.compile(r'^(OK|NG|要確認)')
+
+def _read_lines(f, max_bytes=None):
+    """バイナリファイルから最大max_bytesまで（Noneなら末尾まで）1行ずつ読む"""
+    read = 0
+    for raw in f:
+        read += len(raw)
+        yield raw.decode('utf-8', errors='replace')
+        if max_bytes is not None and read >= max_bytes:
+            return
+
+def _scan_screening_section(lines):
+    """スクリーニング結果セクションの項目を読み取る（セクションがなければNone）"""
+    fields = None
+    for line in lines:
+        if line.startswith('#'):
+            if fields is None:
+                if SCREENING_HEADING_PATTERN.match(line):
+                    fields = {}
+                continue
+            if SECTION_END_PATTERN.match(line):
+                # 次の # / ## 見出しでセクション終了
+                break
+        if fields is not None:
+            m = SCREENING_FIELD_PATTERN.match(line)
+            if m:
+                key = SCREENING_FIELDS.get(m.group(1).strip(), m.group(1).strip())
+                fields.setdefault(key, m.group(2))
+    return fields
+
+def parse_screening_result(file_path, max_bytes=STATUS_SCAN_BYTES):
+    """mdファイルのスクリーニング結果セクションを1回の走査で読み取る
+
+    先頭から最大max_bytesまで読み、セクションの終わりで読み込みを打ち切る。
+    見つからず、ファイルがそれより大きい場合は末尾max_bytesを読み、
+    そこにもなければ先頭で読んだ位置から末尾まで1行ずつ読む。
+
+    Returns:
+        {"status": "OK" / "NG" / "要確認" / None, "reason": ..., "decided_at": ..., ...}
+    """
+    with open(file_path, 'rb') as f:
+        fields = _scan_screening_section(_read_lines(f, max_bytes))
+        if fields is None:
+            size = os.fstat(f.fileno()).st_size
+            head_end = f.tell()
+            if size > max_bytes and head_end < size:
+                tail_start = size - max_bytes
+                if head_end < tail_start:
+                    f.seek(tail_start)
+                    f.readline()  # 途中から読み始めた行は捨てる
+                fields = _scan_screening_section(_read_lines(f, max_bytes))
+                if fields is None and head_end < tail_start:
+                    # 先頭・末尾のどちらにもなければ、残りを末尾まで読む
+                    f.seek(head_end)
+                    fields = _scan_screening_section(_read_lines(f))
+
+    result = dict(fields or {})
+    status_match = STATUS_PATTERN.match(result.get("status", ""))
+    result["status"] = status_match.group(1) if status_match else None
+    return result
+
+def read_screening_result(file_path):
+    """スクリーニング結果を読み取る（読み込みに失敗した場合はステータスNone）"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # スクリーニング結果セクションを探す
-        status_match = re.search(r'## スクリーニング結果\s*\n.*?\*\*ステータス\*\*:\s*(OK|NG|要確認)', content, re.DOTALL)
-        if status_match:
-            return status_match.group(1)
-        
-        return None
+        return parse_screening_result(file_path)
     except Exception as e:
         print(f"エラー: {file_path} の読み込みに失敗しました: {e}")
-        return None
+        return {"status": None}
+
+def extract_status_from_md(file_path):
+    """mdファイルからスクリーニング結果のステータスを抽出"""
+    return read_screening_result(file_path)["status"]
 
 def move_file(file_path, status):
     """ファイルを適切なフォルダに移動"""
@@ -54,18 +133,54 @@ def move_file(file_path, status):
         print(f"エラー: {file_path.name} の移動に失敗しました: {e}")
         return False
 
+def extract_screening_results(md_files, workers=1):
+    """複数ファイルのスクリーニング結果を抽出（workers > 1 ならプロセスプールで並列処理）"""
+    if workers <= 1:
+        return [read_screening_result(md_file) for md_file in md_files]
+
+    chunksize = max(1, len(md_files) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(read_screening_result, md_files, chunksize=chunksize))
+
+def write_manifest(records, manifest_path):
+    """処理結果のマニフェストをJSONまたはCSVで保存"""
+    manifest_path = Path(manifest_path)
+    if manifest_path.suffix.lower() == ".csv":
+        with open(manifest_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=["file", "status", "reason", "action", "destination"])
+            writer.writeheader()
+            writer.writerows(records)
+    else:
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+    print(f"マニフェストを保存しました: {manifest_path}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="候補者ファイルをOK/NGフォルダへ移動")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="ステータス抽出の並列プロセス数（1で逐次処理）")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="移動せずに移動予定だけを表示")
+    parser.add_argument("--manifest", help="処理結果の保存先（.json または .csv）")
+    parser.add_argument("--no-index", action="store_true",
+                        help="インデックスのキャッシュを使わずに全ファイルを読み直す")
+    return parser.parse_args()
+
 def main():
     """メイン処理"""
+    args = parse_args()
+
     print("=" * 60)
-    print("候補者ファイル移動スクリプト")
+    print("候補者ファイル移動スクリプト" + ("（ドライラン）" if args.dry_run else ""))
     print("=" * 60)
     
     # フォルダが存在しない場合は作成
-    OK_DIR.mkdir(parents=True, exist_ok=True)
-    NG_DIR.mkdir(parents=True, exist_ok=True)
+    if not args.dry_run:
+        OK_DIR.mkdir(parents=True, exist_ok=True)
+        NG_DIR.mkdir(parents=True, exist_ok=True)
     
     # 候補者フォルダ内のmdファイルを取得
-    md_files = list(CANDIDATES_DIR.glob("*.md"))
+    md_files = sorted(CANDIDATES_DIR.glob("*.md"))
     
     if not md_files:
         print("候補者フォルダにmdファイルが見つかりませんでした。")
@@ -73,25 +188,68 @@ def main():
     
     print(f"\n{len(md_files)}件のファイルを確認します...\n")
     
+    # 前回から変更のないファイルはインデックスの解析結果を使い、それ以外だけを読み直す
+    # （ドライランではインデックスを読み取り専用で開き、解析結果も履歴も書き込まない）
+    index = CandidateIndex(readonly=args.dry_run)
+    stats = [md_file.stat() for md_file in md_files]
+    results = [None if args.no_index else index.lookup(md_file, stat) for md_file, stat in zip(md_files, stats)]
+    stale = [i for i, result in enumerate(results) if result is None]
+    if len(stale) < len(md_files):
+        print(f"前回から変更なし: {len(md_files) - len(stale)}件（インデックスを利用）\n")
+    
+    # ステータスをまとめて抽出してから、移動をまとめて実行
+    parsed = extract_screening_results([md_files[i] for i in stale], args.workers)
+    for i, result in zip(stale, parsed):
+        results[i] = result
+    if not args.dry_run:
+        # 読み直したファイルの解析結果は1回のトランザクションでまとめて保存
+        index.record_all((md_files[i], stats[i], results[i]) for i in stale)
+    
     moved_count = {"OK": 0, "NG": 0}
     remaining_count = 0
+    records = []
     
-    for md_file in md_files:
-        status = extract_status_from_md(md_file)
+    for md_file, result in zip(md_files, results):
+        status = result["status"]
+        record = {
+            "file": md_file.name,
+            "status": status or "未判断",
+            "reason": result.get("reason", ""),
+            "action": "skip",
+            "destination": "",
+        }
         
         if status in ["OK", "NG"]:
-            if move_file(md_file, status):
+            dest_dir = OK_DIR if status == "OK" else NG_DIR
+            record["destination"] = dest_dir.name
+            if args.dry_run:
+                print(f"移動予定: {md_file.name} -> {dest_dir.name}/")
+                record["action"] = "dry-run"
+                moved_count[status] += 1
+            elif move_file(md_file, status):
+                index.record_move(md_file, dest_dir)
+                record["action"] = "moved"
                 moved_count[status] += 1
+            else:
+                record["action"] = "error"
         else:
             remaining_count += 1
             print(f"スキップ: {md_file.name} (ステータス: {status or '未判断'})")
+        
+        records.append(record)
     
     print("\n" + "=" * 60)
     print("処理完了")
     print("=" * 60)
-    print(f"OKフォルダへ移動: {moved_count['OK']}件")
-    print(f"NGフォルダへ移動: {moved_count['NG']}件")
+    label = "へ移動予定" if args.dry_run else "へ移動"
+    print(f"OKフォルダ{label}: {moved_count['OK']}件")
+    print(f"NGフォルダ{label}: {moved_count['NG']}件")
     print(f"候補者フォルダに残り: {remaining_count}件")
+    
+    index.close()
+    
+    if args.manifest:
+        write_manifest(records, args.manifest)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ノイズフィルタのベンチマーク
+シリーズ前の実装（そのまま写したもの）と現在の実装の処理時間を比べる
+extract_meaningful_text は結果が一致するかも確認する。extract_text_from_snapshot はセクションの区切り方を
+見出しの範囲に変えたため（substringでの判定をやめた）結果は一致しないので、処理時間だけを比べる
+
+使い方:
+    python bench_noise_filter.py                                  # 合成したスナップショット（20万ノード）で比較
+    python bench_noise_filter.py ~/.cursor/browser-logs/snapshot-*.log   # 実際のスナップショットで比較
+"""
+
+import argparse
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import parse_wantedly_snapshots
+import scrape_all_companies
+
+
+def legacy_extract_meaningful_text(content):
+    """比較用: シリーズ前の scrape_all_companies.extract_meaningful_text をそのまま写したもの"""
+    # name属性からテキストを抽出
+    name_pattern = r'name:\s*([^\n]+)'
+    all_names = re.findall(name_pattern, content)
+    
+    # スキップパターン
+    skip_patterns = [
+        r'^\s*$',
+        r'^[0-9]+$',
+        r'^[a-zA-Z]{1,2}$',
+        r'^http',
+        r'^メンバーと話せる',
+        r'^最新順で表示',
+        r'^もっと見る',
+        r'^フォロー',
+        r'^採用担当者の方はこちら',
+        r'^ウォンテッドリーのロゴ',
+        r'^人や会社、募集を検索',
+        r'^無料でログイン',
+        r'^アプリをダウンロード',
+        r'^Wantedly',
+        r'^気軽に会社訪問',
+        r'^成長できるインターンと出会う',
+        r'^あなたの活躍を共有',
+        r'^ビジネス向け',
+        r'^サービス概要',
+        r'^料金表',
+        r'^導入事例',
+        r'^社内報',
+        r'^チームの状態',
+        r'^福利厚生',
+        r'^エンゲージメント',
+        r'^採用',
+        r'^運営会社',
+        r'^ニュース',
+        r'^採用情報',
+    ]
+    
+    meaningful_texts = []
+    for text in all_names:
+        text = text.strip()
+        if len(text) < 3:
+            continue
+        
+        should_skip = False
+        for pattern in skip_patterns:
+            if re.match(pattern, text):
+                should_skip = True
+                break
+        
+        if not should_skip:
+            meaningful_texts.append(text)
+    
+    # 重複を削除し、順序を保持
+    unique_texts = []
+    seen = set()
+    for text in meaningful_texts:
+        if text not in seen:
+            unique_texts.append(text)
+            seen.add(text)
+    
+    return '\n'.join(unique_texts)
+
+
+def legacy_extract_text_from_snapshot(snapshot_file):
+    """比較用: シリーズ前の parse_wantedly_snapshots.extract_text_from_snapshot をそのまま写したもの"""
+    try:
+        with open(snapshot_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        return {"home": f"エラー: {e}", "about": f"エラー: {e}"}
+    
+    # name属性からテキストを抽出
+    name_pattern = r'name:\s*([^\n]+)'
+    all_names = re.findall(name_pattern, content)
+    
+    # 意味のあるテキストをフィルタリング（短すぎるものやUI要素を除外）
+    meaningful_texts = []
+    skip_patterns = [
+        r'^\s*$',  # 空文字
+        r'^[0-9]+$',  # 数字のみ
+        r'^[a-zA-Z]+$',  # アルファベットのみ（短い）
+        r'^[あ-ん]{1,2}$',  # ひらがな1-2文字
+        r'^[ア-ン]{1,2}$',  # カタカナ1-2文字
+        r'^[一-龯]{1,2}$',  # 漢字1-2文字
+        r'^http',  # URL
+        r'^メンバーと話せる',  # UI要素
+        r'^最新順で表示',  # UI要素
+        r'^もっと見る',  # UI要素
+        r'^フォロー',  # UI要素
+        r'^採用担当者の方はこちら',  # UI要素
+        r'^ウォンテッドリーのロゴ',  # UI要素
+    ]
+    
+    for text in all_names:
+        text = text.strip()
+        if len(text) < 3:  # 3文字未満は除外
+            continue
+        
+        # スキップパターンに一致するかチェック
+        should_skip = False
+        for pattern in skip_patterns:
+            if re.match(pattern, text):
+                should_skip = True
+                break
+        
+        if not should_skip:
+            meaningful_texts.append(text)
+    
+    # 「ホーム」と「私たちについて」のセクションを特定
+    home_texts = []
+    about_texts = []
+    
+    lines = content.split('\n')
+    current_section = None
+    in_home = False
+    in_about = False
+    
+    for i, line in enumerate(lines):
+        # セクションの開始を検出
+        if 'ホーム' in line or ('link' in line.lower() and 'name: ホーム' in line):
+            in_home = True
+            in_about = False
+        elif '私たちについて' in line or 'about' in line.lower() or ('link' in line.lower() and 'name: 私たちについて' in line):
+            in_about = True
+            in_home = False
+        
+        # name属性からテキストを抽出
+        if 'name:' in line:
+            text = line.split('name:')[1].strip()
+            if text and len(text) >= 3:
+                # スキップパターンチェック
+                should_skip = False
+                for pattern in skip_patterns:
+                    if re.match(pattern, text):
+                        should_skip = True
+                        break
+                
+                if not should_skip:
+                    if in_home:
+                        home_texts.append(text)
+                    elif in_about:
+                        about_texts.append(text)
+    
+    # 重複を削除し、順序を保持
+    home_unique = []
+    seen_home = set()
+    for text in home_texts:
+        if text not in seen_home:
+            home_unique.append(text)
+            seen_home.add(text)
+    
+    about_unique = []
+    seen_about = set()
+    for text in about_texts:
+        if text not in seen_about:
+            about_unique.append(text)
+            seen_about.add(text)
+    
+    return {
+        "home": '\n'.join(home_unique[:100]),  # 最初の100件
+        "about": '\n'.join(about_unique[:100])
+    }
+
+
+def make_snapshot(n_nodes, seed=0):
+    """合成のブラウザログのスナップショット（アクセシビリティツリーのYAML）を生成"""
+    rng = random.Random(seed)
+    noise = ["もっと見る", "フォロー", "12", "OK", "https://www.wantedly.com/x", "メンバーと話せる", "Wantedly",
+             "採用担当者の方はこちら", "あ", "ab", "ウォンテッドリーのロゴ", "ニュース", "最新順で表示"]
+    words = ["私たちは", "マーケティング", "支援", "事業", "成長", "チーム", "挑戦", "仲間", "価値", "提供"]
+    roles = ["generic", "link", "heading", "paragraph", "listitem", "button", "img"]
+    lines = []
+    depth = 0
+    for i in range(n_nodes):
+        if i % 5000 == 0:
+            name = rng.choice(["ホーム", "私たちについて"])
+            role = "heading"
+        elif rng.random() < 0.4:
+            name = rng.choice(noise)
+            role = rng.choice(roles)
+        else:
+            name = "".join(rng.choice(words) for _ in range(rng.randint(2, 12)))
+            role = rng.choice(roles)
+        indent = "  " * depth
+        lines.append(f"{indent}- role: {role}")
+        lines.append(f"{indent}  name: {name}")
+        lines.append(f"{indent}  ref: e{i}")
+        if rng.random() < 0.3 and depth < 30:
+            lines.append(f"{indent}  children:")
+            depth += 1
+        elif depth and rng.random() < 0.3:
+            depth -= rng.randint(1, depth)
+    return "\n".join(lines) + "\n"
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_file(name, snapshot_file):
+    """1つのスナップショットで両方の抽出処理を比較し、extract_meaningful_text の結果が一致したかを返す"""
+    content = Path(snapshot_file).read_text(encoding='utf-8')
+    size = len(content.encode('utf-8')) / 1024 / 1024
+    print(f"{name} ({size:.1f} MB)")
+
+    legacy, legacy_time = timed(legacy_extract_meaningful_text, content)
+    current, current_time = timed(scrape_all_companies.extract_meaningful_text, content)
+    ok_all = legacy == current
+    print(f"  extract_meaningful_text   : 従来 {legacy_time * 1000:8.1f} ms / 現在 {current_time * 1000:8.1f} ms "
+          f"（{legacy_time / current_time:.1f}倍） 一致: {'OK' if ok_all else 'NG'}")
+
+    _, legacy_time = timed(legacy_extract_text_from_snapshot, snapshot_file)
+    _, current_time = timed(parse_wantedly_snapshots.extract_text_from_snapshot, snapshot_file)
+    print(f"  extract_text_from_snapshot: 従来 {legacy_time * 1000:8.1f} ms / 現在 {current_time * 1000:8.1f} ms "
+          f"（{legacy_time / current_time:.1f}倍） セクションの区切り方が違うため結果は比較しない")
+    return ok_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ノイズフィルタのベンチマーク")
+    parser.add_argument("snapshots", nargs="*", help="スナップショットファイル")
+    parser.add_argument("--nodes", type=int, default=200000, help="合成スナップショットのノード数")
+    args = parser.parse_args()
+
+    ok = True
+    if args.snapshots:
+        for snapshot_file in args.snapshots:
+            ok &= bench_file(Path(snapshot_file).name, snapshot_file)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot_file = Path(tmp_dir) / "snapshot-bench.log"
+            snapshot_file.write_text(make_snapshot(args.nodes), encoding='utf-8')
+            ok = bench_file(f"合成スナップショット {args.nodes:,}ノード", snapshot_file)
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
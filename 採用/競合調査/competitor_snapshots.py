@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+競合企業ページのスナップショット履歴
+企業・セクション（ホーム / 私たちについて）ごとに正規化したテキストを版として保存し、
+前回のクロールから変わったものだけを差分レポートにする（内容のハッシュが同じなら版を追加しないだけで、ページの取得と解析は毎回行う）
+
+使い方:
+    python competitor_snapshots.py    # 企業ごとの版数と最終更新日時を表示
+"""
+
+import difflib
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+# 履歴ファイル（生成物なのでリポジトリには含めない）
+STORE_FILE = Path(__file__).parent / ".competitor_snapshots.sqlite"
+
+# 比較するセクション（結果のキー: 見出し）
+SECTIONS = {"home": "ホーム", "about_us": "私たちについて"}
+
+# 差分の前後に表示する行数
+DIFF_CONTEXT = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    url TEXT NOT NULL,
+    section TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    company_name TEXT,
+    hash TEXT NOT NULL,
+    text TEXT NOT NULL,
+    crawled_at TEXT NOT NULL,
+    PRIMARY KEY (url, section, version)
+);
+"""
+
+
+def normalize_text(text):
+    """行ごとに空白をまとめ、空行を除いたテキスト"""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SnapshotStore:
+    """企業・セクションごとのテキストの版を保存するストア"""
+
+    def __init__(self, store_file=STORE_FILE):
+        self.conn = sqlite3.connect(store_file)
+        self.conn.executescript(SCHEMA)
+
+    def latest(self, url, section):
+        """最新の版 (version, hash, text) を返す（なければNone）"""
+        return self.conn.execute(
+            "SELECT version, hash, text FROM versions WHERE url = ? AND section = ? "
+            "ORDER BY version DESC LIMIT 1",
+            (url, section),
+        ).fetchone()
+
+    def record(self, results, crawled_at=None):
+        """
+        クロール結果を保存し、(変更のリスト, 変更なしの件数, 取得失敗の件数) を返す
+
+        取得に失敗したセクション（値が None）は保存せず、取得失敗として数える。
+        内容のハッシュが最新の版と同じセクションは版を追加しないだけで、取得と解析は呼び出し側で済んでいる。
+        変更は {"company_name", "url", "section", "status"（新規/更新）, "lines"（行数）, "diff"（差分の行）} の辞書。
+        """
+        crawled_at = crawled_at or datetime.now().isoformat(timespec="seconds")
+        changes = []
+        unchanged = failed = 0
+
+        with self.conn:
+            for result in results:
+                for section in SECTIONS:
+                    raw = result.get(section, "")
+                    if raw is None:
+                        failed += 1
+                        continue
+                    text = normalize_text(raw)
+                    digest = text_hash(text)
+                    previous = self.latest(result["url"], section)
+                    if previous is not None and previous[1] == digest:
+                        unchanged += 1
+                        continue
+
+                    version = previous[0] + 1 if previous else 1
+                    self.conn.execute(
+                        "INSERT INTO versions (url, section, version, company_name, hash, text, crawled_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (result["url"], section, version, result["company_name"], digest, text, crawled_at),
+                    )
+                    diff = []
+                    if previous is not None:
+                        diff = list(difflib.unified_diff(
+                            previous[2].splitlines(), text.splitlines(),
+                            f"v{previous[0]}", f"v{version}", n=DIFF_CONTEXT, lineterm="",
+                        ))
+                    changes.append({
+                        "company_name": result["company_name"],
+                        "url": result["url"],
+                        "section": section,
+                        "status": "更新" if previous else "新規",
+                        "lines": len(text.splitlines()),
+                        "diff": diff,
+                    })
+        return changes, unchanged, failed
+
+    def summary(self):
+        """企業ごとの (会社名, URL, 版数の合計, 最終更新日時)"""
+        return self.conn.execute(
+            "SELECT MAX(company_name), url, COUNT(*), MAX(crawled_at) FROM versions "
+            "GROUP BY url ORDER BY MAX(crawled_at) DESC"
+        ).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+
+def write_change_report(changes, unchanged, failed, output_path):
+    """変更のあった企業・セクションだけをMarkdownの差分レポートに書き出す"""
+    companies = {}
+    for change in changes:
+        companies.setdefault((change["company_name"], change["url"]), []).append(change)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("# Wantedly競合企業ページ 変更レポート\n\n")
+        f.write(f"**取得日時**: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}\n\n")
+        f.write(f"変更 {len(changes)}件 / 変更なし {unchanged}件 / 取得失敗 {failed}件\n\n")
+        f.write("---\n\n")
+
+        if not changes:
+            f.write("前回から変更はありません。\n")
+        for (name, url), company_changes in companies.items():
+            f.write(f"## {name}\n\n")
+            f.write(f"**URL**: {url}\n\n")
+            for change in company_changes:
+                f.write(f"### {SECTIONS[change['section']]}（{change['status']}）\n\n")
+                if change["diff"]:
+                    f.write("```diff\n")
+                    f.write("\n".join(change["diff"]))
+                    f.write("\n```\n\n")
+                else:
+                    f.write(f"初回取得（{change['lines']}行）\n\n")
+    return output_path
+
+
+def main():
+    """企業ごとの版数と最終更新日時を表示"""
+    store = SnapshotStore()
+    rows = store.summary()
+    if not rows:
+        print("履歴はまだありません")
+    for name, url, versions, crawled_at in rows:
+        print(f"{crawled_at}  {versions:3d}版  {name}  {url}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
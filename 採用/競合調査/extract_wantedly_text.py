@@ -4,46 +4,24 @@
 Wantedlyスナップショットファイルからテキスト情報を抽出
 """
 
-import yaml
-import json
-import re
 from pathlib import Path
 
+from snapshot_stream import SectionCollector, collect_sections, iter_lines
+
+# 抽出するセクションと、セクションごとの行数
+SECTIONS = ('home', 'about', 'members', 'jobs')
+MAX_LINES = 50
+
+def accept_text(name):
+    """短すぎるテキストは除外（集めるテキストかNoneを返す）"""
+    text = name.strip()
+    return text if len(text) > 5 else None
+
 def extract_text_from_snapshot(snapshot_file):
-    """スナップショットファイルからテキスト情報を抽出"""
-    with open(snapshot_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # YAML形式のスナップショットからテキストを抽出
-    text_content = []
-    
-    # name属性を持つ要素のテキストを抽出
-    name_pattern = r'name:\s*([^\n]+)'
-    names = re.findall(name_pattern, content)
-    
-    # 重要なセクションを特定
-    home_text = []
-    about_text = []
-    current_section = None
-    
-    lines = content.split('\n')
-    for i, line in enumerate(lines):
-        if 'ホーム' in line or 'home' in line.lower():
-            current_section = 'home'
-        elif '私たちについて' in line or 'about' in line.lower() or 'about-us' in line.lower():
-            current_section = 'about'
-        elif 'name:' in line:
-            text = line.split('name:')[1].strip()
-            if text and len(text) > 5:  # 短すぎるテキストは除外
-                if current_section == 'home':
-                    home_text.append(text)
-                elif current_section == 'about':
-                    about_text.append(text)
-    
-    return {
-        'home': '\n'.join(home_text[:50]),  # 最初の50行
-        'about': '\n'.join(about_text[:50])
-    }
+    """スナップショットファイルからテキスト情報を抽出（1行ずつ読み、見出しで区切ったセクションごとに最初の50行を集める）"""
+    # 「私たちについて」は見出しで区切ったセクション、「ホーム」はページ本文（main）のうちそれ以外の部分
+    collector = collect_sections(iter_lines(snapshot_file), SectionCollector(SECTIONS, limit=MAX_LINES), accept_text)
+    return {section: collector.joined(section) for section in SECTIONS}
 
 def main():
     """メイン処理"""
@@ -66,6 +44,10 @@ def main():
     print(result['home'][:500])
     print("\n=== 私たちについて ===")
     print(result['about'][:500])
+    print("\n=== メンバー ===")
+    print(result['members'][:500])
+    print("\n=== 募集 ===")
+    print(result['jobs'][:500])
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+スナップショットから抽出したテキストのノイズ（UI要素・数字だけ等）を除くフィルタ
+各スクリプトのスキップパターンを一度だけまとめてコンパイルし、1回の判定で済ませる
+"""
+
+import re
+
+# 正規表現の特殊文字（これを含まない「^文字列」のパターンは前方一致として扱う）
+REGEX_METACHARS = set(".^$*+?{}[]\\|()")
+
+
+class NoiseFilter:
+    """スキップパターンのどれかに一致するテキストを除くフィルタ
+
+    「^メンバーと話せる」のような固定文字列の前方一致は str.startswith にまとめ、
+    残りのパターンは1つの正規表現（選択肢）にまとめる。
+    どちらも各パターンを re.match で順に試すのと同じ結果になる。
+    """
+
+    def __init__(self, patterns, min_length=3):
+        self.min_length = min_length
+        prefixes = []
+        regexes = []
+        for pattern in patterns:
+            body = pattern[1:]
+            if pattern.startswith("^") and body and not REGEX_METACHARS & set(body):
+                prefixes.append(body)
+            else:
+                regexes.append(pattern)
+        self.prefixes = tuple(prefixes)
+        self.pattern = re.compile("|".join(f"(?:{p})" for p in regexes)) if regexes else None
+
+    def is_noise(self, text):
+        """除外すべきテキストか（短すぎる、またはスキップパターンに一致）"""
+        if len(text) < self.min_length:
+            return True
+        if self.prefixes and text.startswith(self.prefixes):
+            return True
+        return self.pattern is not None and self.pattern.match(text) is not None
+
+    def filter(self, texts):
+        """前後の空白を除き、ノイズでないテキストだけを順に返す"""
+        for text in texts:
+            text = text.strip()
+            if not self.is_noise(text):
+                yield text
+
+
+def unique(texts, limit=None):
+    """順序を保ったまま重複を除く（limit件集まったらそれ以上読まない）"""
+    result = []
+    seen = set()
+    for text in texts:
+        if text in seen:
+            continue
+        seen.add(text)
+        result.append(text)
+        if limit is not None and len(result) >= limit:
+            break
+    return result
@@ -2,13 +2,26 @@
 # -*- coding: utf-8 -*-
 """
 Wantedlyスナップショットファイルからテキスト情報を抽出してまとめる
+
+使い方:
+    python parse_wantedly_snapshots.py            # 最新のスナップショットだけを表示
+    python parse_wantedly_snapshots.py --batch    # すべてのスナップショットを並列に処理し、
+                                                  # wantedly_競合企業_情報まとめ.md の（情報取得中）を埋める
 """
 
-import re
+import argparse
+import hashlib
 import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
 from pathlib import Path
 from collections import defaultdict
 
+from noise_filter import NoiseFilter
+from snapshot_stream import SectionCollector, collect_sections, iter_lines
+
 # 企業情報
 COMPANIES = [
     {"name": "NOVEL株式会社", "url": "https://www.wantedly.com/companies/company_1207250"},
@@ -23,109 +36,258 @@ COMPANIES = [
     {"name": "株式会社LiNew", "url": "https://www.wantedly.com/companies/company_513077"},
 ]
 
-def extract_text_from_snapshot(snapshot_file):
-    """スナップショットファイルからテキスト情報を抽出"""
+SNAPSHOT_DIR = Path.home() / '.cursor' / 'browser-logs'
+
+# まとめファイル
+SUMMARY_FILE = Path(__file__).parent / 'wantedly_競合企業_情報まとめ.md'
+# 処理済みスナップショットの記録（生成物なのでリポジトリには含めない）
+STATE_FILE = Path(__file__).parent / '.snapshot_state.json'
+
+# まとめファイルで未取得のセクションに書かれている文字列
+PLACEHOLDER = '（情報取得中）'
+SUMMARY_SECTIONS = {'### ホーム': 'home', '### 私たちについて': 'about'}
+
+# スナップショット内の企業ページURL（最初に出てくるものがそのページのURL）
+COMPANY_URL_PATTERN = re.compile(r'wantedly\.com/companies/([A-Za-z0-9_\-]+)')
+COMPANY_BY_SLUG = {company["url"].rsplit('/', 1)[-1].lower(): company for company in COMPANIES}
+
+# スキップパターン（短すぎるものやUI要素を除外）
+SKIP_PATTERNS = [
+    r'^\s*$',  # 空文字
+    r'^[0-9]+$',  # 数字のみ
+    r'^[a-zA-Z]+$',  # アルファベットのみ（短い）
+    r'^[あ-ん]{1,2}$',  # ひらがな1-2文字
+    r'^[ア-ン]{1,2}$',  # カタカナ1-2文字
+    r'^[一-龯]{1,2}$',  # 漢字1-2文字
+    r'^http',  # URL
+    r'^メンバーと話せる',  # UI要素
+    r'^最新順で表示',  # UI要素
+    r'^もっと見る',  # UI要素
+    r'^フォロー',  # UI要素
+    r'^採用担当者の方はこちら',  # UI要素
+    r'^ウォンテッドリーのロゴ',  # UI要素
+]
+
+NOISE_FILTER = NoiseFilter(SKIP_PATTERNS)
+
+def accept_text(name):
+    """スキップパターンに一致するもの（短すぎるものやUI要素）を除外（集めるテキストかNoneを返す）"""
+    text = name.strip()
+    return None if NOISE_FILTER.is_noise(text) else text
+
+def _extract_sections(lines):
+    """スナップショットの行からテキスト情報を抽出（各セクション100件集まったら終了。失敗すると例外）"""
+    # 「私たちについて」は見出しで区切ったセクション、「ホーム」はページ本文のうちそれ以外（重複を削除し、順序を保持）
+    collector = SectionCollector(('home', 'about'), limit=100, dedup=True)
+    collect_sections(lines, collector, accept_text)
+    return {
+        "home": collector.joined('home'),  # 最初の100件
+        "about": collector.joined('about')
+    }
+
+def extract_text_from_lines(lines):
+    """スナップショットの行からテキスト情報を抽出（失敗したら各セクションにエラーメッセージを入れる）"""
     try:
-        with open(snapshot_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        return _extract_sections(lines)
     except Exception as e:
         return {"home": f"エラー: {e}", "about": f"エラー: {e}"}
-    
-    # name属性からテキストを抽出
-    name_pattern = r'name:\s*([^\n]+)'
-    all_names = re.findall(name_pattern, content)
-    
-    # 意味のあるテキストをフィルタリング（短すぎるものやUI要素を除外）
-    meaningful_texts = []
-    skip_patterns = [
-        r'^\s*$',  # 空文字
-        r'^[0-9]+$',  # 数字のみ
-        r'^[a-zA-Z]+$',  # アルファベットのみ（短い）
-        r'^[あ-ん]{1,2}$',  # ひらがな1-2文字
-        r'^[ア-ン]{1,2}$',  # カタカナ1-2文字
-        r'^[一-龯]{1,2}$',  # 漢字1-2文字
-        r'^http',  # URL
-        r'^メンバーと話せる',  # UI要素
-        r'^最新順で表示',  # UI要素
-        r'^もっと見る',  # UI要素
-        r'^フォロー',  # UI要素
-        r'^採用担当者の方はこちら',  # UI要素
-        r'^ウォンテッドリーのロゴ',  # UI要素
+
+def extract_text_from_snapshot(snapshot_file):
+    """スナップショットファイルからテキスト情報を抽出（1行ずつ読む）"""
+    return extract_text_from_lines(iter_lines(snapshot_file))
+
+class SnapshotReader:
+    """スナップショットを1回だけ読み、行を返しながら内容のハッシュと企業ページのURLを記録する"""
+
+    def __init__(self, snapshot_file):
+        self.snapshot_file = snapshot_file
+        self.digest = hashlib.sha256()
+        self.slug = None
+
+    def lines(self):
+        with open(self.snapshot_file, 'rb') as f:
+            for raw in f:
+                self.digest.update(raw)
+                line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+                if self.slug is None:
+                    m = COMPANY_URL_PATTERN.search(line)
+                    if m:
+                        self.slug = m.group(1).lower()
+                yield line
+
+    @property
+    def company(self):
+        """スナップショットに含まれる企業ページのURLから判定した企業（不明ならNone）"""
+        return COMPANY_BY_SLUG.get(self.slug) if self.slug else None
+
+def process_snapshot(snapshot_file, known_hash=None):
+    """
+    スナップショット1件を処理（ハッシュ・企業の判定・抽出を1回の読み込みで行う）
+
+    内容が known_hash と同じなら抽出結果は使わない（変わったかどうかは読み終えるまで分からない）。
+    読み込みか抽出に失敗したら {"error": メッセージ} だけを返す（途中までのハッシュは返さない）。
+    """
+    reader = SnapshotReader(snapshot_file)
+    lines = reader.lines()
+    try:
+        result = _extract_sections(lines)
+        # 抽出が途中で終わっても、ハッシュと企業の判定のために残りの行を読む
+        for _ in lines:
+            pass
+    except Exception as e:
+        return {"error": str(e)}
+    digest = reader.digest.hexdigest()
+    if digest == known_hash:
+        return {"hash": digest, "unchanged": True}
+    company = reader.company
+    return {
+        "hash": digest,
+        "company_name": company["name"] if company else None,
+        "company_url": company["url"] if company else None,
+        "home": result["home"],
+        "about": result["about"],
+    }
+
+def load_state(path=STATE_FILE):
+    """処理済みスナップショットの記録を読み込む"""
+    if path.exists():
+        return json.loads(path.read_text(encoding='utf-8'))
+    return {"snapshots": {}}
+
+def save_state(state, path=STATE_FILE):
+    """処理済みスナップショットの記録を書き込む（一時ファイル経由で置き換えて途中で壊れないようにする）"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True), encoding='utf-8')
+    tmp_path.replace(path)
+
+def process_snapshots(snapshot_files, state, workers=None, force=False):
+    """
+    スナップショットをまとめて処理し、記録（state）を更新して (処理件数, スキップ件数, 失敗件数) を返す
+
+    更新日時とサイズが前回と同じものは読まず、変わっていても内容のハッシュが同じなら抽出しない。
+    読み込みか抽出に失敗したものは記録を更新せず、次回に処理し直す。
+    """
+    records = state["snapshots"]
+    pending = []
+    for snapshot_file in snapshot_files:
+        stat = snapshot_file.stat()
+        record = records.get(snapshot_file.name)
+        if not force and record and record["mtime"] == stat.st_mtime and record["size"] == stat.st_size:
+            continue
+        known_hash = None if force or not record else record["hash"]
+        pending.append((snapshot_file, stat, known_hash))
+
+    if not pending:
+        return 0, len(snapshot_files), 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(process_snapshot, [p[0] for p in pending], [p[2] for p in pending])
+        failed = 0
+        for (snapshot_file, stat, _), result in zip(pending, results):
+            if "error" in result:
+                failed += 1
+                print(f"  {snapshot_file.name}: 読み込みに失敗しました: {result['error']}")
+                continue
+            record = records.setdefault(snapshot_file.name, {})
+            if result.pop("unchanged", False):
+                record.update(mtime=stat.st_mtime, size=stat.st_size)
+                continue
+            record.update(result, mtime=stat.st_mtime, size=stat.st_size)
+            print(f"  {snapshot_file.name}: {result['company_name'] or '企業不明'}")
+    return len(pending) - failed, len(snapshot_files) - len(pending), failed
+
+def collect_company_texts(state):
+    """企業ごとに、各セクションのテキストがある最新のスナップショットの内容を集める"""
+    texts = defaultdict(dict)
+    records = sorted(state["snapshots"].values(), key=lambda r: r["mtime"], reverse=True)
+    for record in records:
+        if not record.get("company_url"):
+            continue
+        for section in ("home", "about"):
+            text = record.get(section, "")
+            if text and section not in texts[record["company_url"]]:
+                texts[record["company_url"]][section] = text
+    return texts
+
+def write_summary_template(summary_file):
+    """まとめファイルの雛形（scrape_all_companies.py と同じ形式・全社（情報取得中））を作成"""
+    today = date.today()
+    lines = [
+        "# Wantedly競合企業 情報まとめ\n",
+        "募集ページ上位10社の「ホーム」と「私たちについて」の情報\n",
+        f"**作成日**: {today.year}年{today.month}月{today.day}日\n",
+        "---\n",
     ]
-    
-    for text in all_names:
-        text = text.strip()
-        if len(text) < 3:  # 3文字未満は除外
+    for i, company in enumerate(COMPANIES, 1):
+        lines += [
+            f"## {i}. {company['name']}\n",
+            f"**URL**: {company['url']}\n",
+            "### ホーム\n", f"{PLACEHOLDER}\n",
+            "### 私たちについて\n", f"{PLACEHOLDER}\n",
+            "---\n",
+        ]
+    Path(summary_file).write_text('\n'.join(lines), encoding='utf-8')
+
+def fill_summary(summary_file, company_texts):
+    """まとめファイルの（情報取得中）だけの行を、抽出したテキストの箇条書きで置き換える（ファイルがなければ雛形から作る）"""
+    if not Path(summary_file).exists():
+        write_summary_template(summary_file)
+        print(f"{Path(summary_file).name} がないため雛形を作成しました")
+    lines = Path(summary_file).read_text(encoding='utf-8').split('\n')
+    output = []
+    url = section = None
+    filled = 0
+    for line in lines:
+        if line.startswith('## '):
+            url = section = None
+        elif line.startswith('**URL**:'):
+            url = line.split(':', 1)[1].strip()
+        elif line.startswith('### '):
+            section = SUMMARY_SECTIONS.get(line.strip())
+        elif line.strip() == PLACEHOLDER and company_texts.get(url, {}).get(section):
+            output.extend(f"- {text}" for text in company_texts[url][section].split('\n'))
+            filled += 1
             continue
-        
-        # スキップパターンに一致するかチェック
-        should_skip = False
-        for pattern in skip_patterns:
-            if re.match(pattern, text):
-                should_skip = True
-                break
-        
-        if not should_skip:
-            meaningful_texts.append(text)
-    
-    # 「ホーム」と「私たちについて」のセクションを特定
-    home_texts = []
-    about_texts = []
-    
-    lines = content.split('\n')
-    current_section = None
-    in_home = False
-    in_about = False
-    
-    for i, line in enumerate(lines):
-        # セクションの開始を検出
-        if 'ホーム' in line or ('link' in line.lower() and 'name: ホーム' in line):
-            in_home = True
-            in_about = False
-        elif '私たちについて' in line or 'about' in line.lower() or ('link' in line.lower() and 'name: 私たちについて' in line):
-            in_about = True
-            in_home = False
-        
-        # name属性からテキストを抽出
-        if 'name:' in line:
-            text = line.split('name:')[1].strip()
-            if text and len(text) >= 3:
-                # スキップパターンチェック
-                should_skip = False
-                for pattern in skip_patterns:
-                    if re.match(pattern, text):
-                        should_skip = True
-                        break
-                
-                if not should_skip:
-                    if in_home:
-                        home_texts.append(text)
-                    elif in_about:
-                        about_texts.append(text)
-    
-    # 重複を削除し、順序を保持
-    home_unique = []
-    seen_home = set()
-    for text in home_texts:
-        if text not in seen_home:
-            home_unique.append(text)
-            seen_home.add(text)
+        output.append(line)
+
+    if filled:
+        tmp_path = Path(summary_file).with_name(Path(summary_file).name + '.tmp')
+        tmp_path.write_text('\n'.join(output), encoding='utf-8')
+        tmp_path.replace(summary_file)
+    return filled
+
+def main_batch(snapshot_dir, summary_file, workers=None, force=False):
+    """すべてのスナップショットを処理し、まとめファイルを埋める"""
+    snapshot_files = sorted(snapshot_dir.glob('snapshot-*.log'))
+    if not snapshot_files:
+        print("スナップショットファイルが見つかりません")
+        return
     
-    about_unique = []
-    seen_about = set()
-    for text in about_texts:
-        if text not in seen_about:
-            about_unique.append(text)
-            seen_about.add(text)
+    state = load_state()
+    print(f"スナップショット: {len(snapshot_files)}件")
+    processed, skipped, failed = process_snapshots(snapshot_files, state, workers, force)
+    save_state(state)
+    print(f"処理: {processed}件 / 処理済みのためスキップ: {skipped}件 / 失敗: {failed}件")
     
-    return {
-        "home": '\n'.join(home_unique[:100]),  # 最初の100件
-        "about": '\n'.join(about_unique[:100])
-    }
+    filled = fill_summary(summary_file, collect_company_texts(state))
+    print(f"{summary_file.name}: {filled}箇所の（情報取得中）を埋めました")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Wantedlyスナップショットからテキスト情報を抽出")
+    parser.add_argument("--batch", action="store_true", help="すべてのスナップショットを処理してまとめファイルを埋める")
+    parser.add_argument("--snapshot-dir", type=Path, default=SNAPSHOT_DIR, help="スナップショットのフォルダ")
+    parser.add_argument("--summary", type=Path, default=SUMMARY_FILE, help="まとめファイル")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="並列に処理するプロセス数")
+    parser.add_argument("--force", action="store_true", help="処理済みのスナップショットも処理し直す")
+    return parser.parse_args()
 
 def main():
     """メイン処理"""
-    snapshot_dir = Path.home() / '.cursor' / 'browser-logs'
+    args = parse_args()
+    snapshot_dir = args.snapshot_dir
+    if args.batch:
+        main_batch(snapshot_dir, args.summary, args.workers, args.force)
+        return
     
     # 最新のスナップショットファイルを取得（NOVEL株式会社用）
     snapshot_files = sorted(snapshot_dir.glob('snapshot-*.log'), key=lambda x: x.stat().st_mtime, reverse=True)
@@ -9,6 +9,8 @@ import re
 import json
 from pathlib import Path
 
+from noise_filter import NoiseFilter, unique
+
 # 企業情報
 COMPANIES = [
     {"name": "NOVEL株式会社", "url": "https://www.wantedly.com/companies/company_1207250"},
@@ -23,67 +25,49 @@ COMPANIES = [
     {"name": "株式会社LiNew", "url": "https://www.wantedly.com/companies/company_513077"},
 ]
 
+# スキップパターン
+SKIP_PATTERNS = [
+    r'^\s*$',
+    r'^[0-9]+$',
+    r'^[a-zA-Z]{1,2}$',
+    r'^http',
+    r'^メンバーと話せる',
+    r'^最新順で表示',
+    r'^もっと見る',
+    r'^フォロー',
+    r'^採用担当者の方はこちら',
+    r'^ウォンテッドリーのロゴ',
+    r'^人や会社、募集を検索',
+    r'^無料でログイン',
+    r'^アプリをダウンロード',
+    r'^Wantedly',
+    r'^気軽に会社訪問',
+    r'^成長できるインターンと出会う',
+    r'^あなたの活躍を共有',
+    r'^ビジネス向け',
+    r'^サービス概要',
+    r'^料金表',
+    r'^導入事例',
+    r'^社内報',
+    r'^チームの状態',
+    r'^福利厚生',
+    r'^エンゲージメント',
+    r'^採用',
+    r'^運営会社',
+    r'^ニュース',
+    r'^採用情報',
+]
+
+NAME_PATTERN = re.compile(r'name:\s*([^\n]+)')
+NOISE_FILTER = NoiseFilter(SKIP_PATTERNS)
+
 def extract_meaningful_text(content):
     """スナップショットファイルから意味のあるテキストを抽出"""
     # name属性からテキストを抽出
-    name_pattern = r'name:\s*([^\n]+)'
-    all_names = re.findall(name_pattern, content)
-    
-    # スキップパターン
-    skip_patterns = [
-        r'^\s*$',
-        r'^[0-9]+$',
-        r'^[a-zA-Z]{1,2}$',
-        r'^http',
-        r'^メンバーと話せる',
-        r'^最新順で表示',
-        r'^もっと見る',
-        r'^フォロー',
-        r'^採用担当者の方はこちら',
-        r'^ウォンテッドリーのロゴ',
-        r'^人や会社、募集を検索',
-        r'^無料でログイン',
-        r'^アプリをダウンロード',
-        r'^Wantedly',
-        r'^気軽に会社訪問',
-        r'^成長できるインターンと出会う',
-        r'^あなたの活躍を共有',
-        r'^ビジネス向け',
-        r'^サービス概要',
-        r'^料金表',
-        r'^導入事例',
-        r'^社内報',
-        r'^チームの状態',
-        r'^福利厚生',
-        r'^エンゲージメント',
-        r'^採用',
-        r'^運営会社',
-        r'^ニュース',
-        r'^採用情報',
-    ]
-    
-    meaningful_texts = []
-    for text in all_names:
-        text = text.strip()
-        if len(text) < 3:
-            continue
-        
-        should_skip = False
-        for pattern in skip_patterns:
-            if re.match(pattern, text):
-                should_skip = True
-                break
-        
-        if not should_skip:
-            meaningful_texts.append(text)
+    all_names = NAME_PATTERN.findall(content)
     
-    # 重複を削除し、順序を保持
-    unique_texts = []
-    seen = set()
-    for text in meaningful_texts:
-        if text not in seen:
-            unique_texts.append(text)
-            seen.add(text)
+    # スキップパターンに一致するものを除き、重複を削除して順序を保持
+    unique_texts = unique(NOISE_FILTER.filter(all_names))
     
     return '\n'.join(unique_texts)
 
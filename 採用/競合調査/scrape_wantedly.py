@@ -2,13 +2,34 @@
 # -*- coding: utf-8 -*-
 """
 Wantedly企業ページの「ホーム」と「私たちについて」をスクレイピング
+取得したHTMLはキャッシュ（scripts/page_cache.py）に保存し、セレクタ修正後の再解析はオフラインで行える
+
+使い方:
+    python scrape_wantedly.py              # キャッシュの有効期限切れのページだけ取得し直す
+    python scrape_wantedly.py --offline    # ネットワークに出ずキャッシュだけで再解析
+    python scrape_wantedly.py --refresh    # 有効期限内でも更新を確認する
+    python scrape_wantedly.py --companies companies.csv --concurrency 8 --rate 2
+                                           # CSV（name,url列）またはYAMLの企業リストを並列に取得
+
+前回のクロールから変わった企業・セクションは wantedly_changes.md に差分として書き出す
 """
 
-import requests
+import sys
+import csv
+import asyncio
+import argparse
 from bs4 import BeautifulSoup
 import json
 import time
-from urllib.parse import urljoin
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# 共通HTTPクライアント（scripts/http_client.py）を読み込む
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+from http_client import HttpClient
+from page_cache import PageCache
+
+from competitor_snapshots import SECTIONS, SnapshotStore, write_change_report
 
 # スクレイピング対象の企業URLリスト
 COMPANIES = [
@@ -54,101 +75,186 @@ COMPANIES = [
     }
 ]
 
-def scrape_company(company_info):
-    """企業のWantedlyページから情報をスクレイピング"""
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Keep-Aliveで接続を使い回し、一時的な5xxはバックオフしてリトライ
+http = HttpClient(headers=HEADERS, host_concurrency=2)
+
+# 取得したHTMLのキャッシュ（有効期限内は再取得しない）
+cache = PageCache()
+
+# ホストごとの1秒あたりのリクエスト数（固定のsleepの代わりに間隔を空ける）
+DEFAULT_RATE = 1.0
+# 同時に処理する企業数
+DEFAULT_CONCURRENCY = 4
+
+def load_companies(file_path):
+    """企業リストをCSV（name,url列）またはYAML（name・urlのリスト）から読み込む"""
+    file_path = Path(file_path)
+    if file_path.suffix.lower() in ('.yaml', '.yml'):
+        import yaml
+        with open(file_path, encoding='utf-8') as f:
+            loaded = yaml.safe_load(f) or []
+        if isinstance(loaded, dict):
+            loaded = loaded.get('companies', [])
+        rows = loaded
+    else:
+        with open(file_path, encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+    
+    companies = []
+    for row in rows:
+        name = (row.get('name') or '').strip()
+        url = (row.get('url') or '').strip()
+        if url:
+            companies.append({"name": name or url, "url": url})
+    return companies
+
+
+class HostRateLimiter:
+    """ホストごとにリクエストの間隔を空けるレートリミッター（asyncio用）"""
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = {}
+    
+    async def wait(self, url):
+        """このホストへの次のリクエスト枠まで待つ"""
+        host = urlsplit(url).netloc
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def find_section(soup, testid, class_name):
+    """data-testid・クラス名からセクション要素を探す"""
+    return soup.find('div', {'data-testid': testid}) or \
+        soup.find('section', class_=class_name) or \
+        soup.find('div', class_=f'company-{class_name}')
+
+
+def extract_section_text(soup, testid, class_name, fallback_to_main=True):
+    """セクションのテキストを抽出（見つからなければページ本文の先頭5000文字）"""
+    section = find_section(soup, testid, class_name)
+    if section:
+        # テキストを抽出（不要な要素を除外）
+        for script in section(["script", "style"]):
+            script.decompose()
+        return section.get_text(separator='\n', strip=True)
+    if fallback_to_main:
+        main_content = soup.find('main') or soup.find('div', class_='main-content')
+        if main_content:
+            for script in main_content(["script", "style"]):
+                script.decompose()
+            return main_content.get_text(separator='\n', strip=True)[:5000]  # 最初の5000文字
+    return ""
+
+
+async def fetch_page(url, limiter, offline=False):
+    """キャッシュを通してページを取得（ネットワークに出るときだけホストごとの間隔を空ける）"""
+    if not offline and not cache.is_fresh(cache.lookup(url)):
+        await limiter.wait(url)
+    html, _ = await asyncio.to_thread(cache.fetch, http, url, offline=offline, timeout=30)
+    return html
+
+
+async def scrape_company_async(company_info, limiter, offline=False):
+    """
+    企業のWantedlyページから情報をスクレイピング（ホームと「私たちについて」を同時に取得）
+    
+    取得に失敗したセクションは None にし、理由を "errors"（セクション: メッセージ）に入れる。
+    """
     name = company_info["name"]
     url = company_info["url"]
+    about_url = url.rstrip('/') + '/about'
     
-    print(f"\n{'='*60}")
-    print(f"スクレイピング中: {name}")
-    print(f"URL: {url}")
-    print(f"{'='*60}")
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    home_html, about_html = await asyncio.gather(
+        fetch_page(url, limiter, offline), fetch_page(about_url, limiter, offline), return_exceptions=True
+    )
     
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
+        if isinstance(home_html, Exception):
+            raise home_html
+        soup = BeautifulSoup(home_html, 'html.parser')
         
         result = {
             "company_name": name,
             "url": url,
             "home": "",
-            "about_us": ""
+            "about_us": "",
+            "errors": {}
         }
         
         # 「ホーム」セクションの情報を取得
-        # Wantedlyの構造に応じて適切なセレクタを使用
-        home_section = soup.find('div', {'data-testid': 'company-home'}) or \
-                      soup.find('section', class_='home') or \
-                      soup.find('div', class_='company-home')
-        
-        if home_section:
-            # テキストを抽出（不要な要素を除外）
-            for script in home_section(["script", "style"]):
-                script.decompose()
-            result["home"] = home_section.get_text(separator='\n', strip=True)
-        else:
-            # フォールバック: ページ全体から関連情報を抽出
-            main_content = soup.find('main') or soup.find('div', class_='main-content')
-            if main_content:
-                for script in main_content(["script", "style"]):
-                    script.decompose()
-                result["home"] = main_content.get_text(separator='\n', strip=True)[:5000]  # 最初の5000文字
+        result["home"] = extract_section_text(soup, 'company-home', 'home')
         
         # 「私たちについて」セクションの情報を取得
-        about_url = urljoin(url, '/about')
-        try:
-            about_response = requests.get(about_url, headers=headers, timeout=30)
-            if about_response.status_code == 200:
-                about_soup = BeautifulSoup(about_response.text, 'html.parser')
-                about_section = about_soup.find('div', {'data-testid': 'company-about'}) or \
-                               about_soup.find('section', class_='about') or \
-                               about_soup.find('div', class_='company-about')
-                
-                if about_section:
-                    for script in about_section(["script", "style"]):
-                        script.decompose()
-                    result["about_us"] = about_section.get_text(separator='\n', strip=True)
-                else:
-                    main_content = about_soup.find('main') or about_soup.find('div', class_='main-content')
-                    if main_content:
-                        for script in main_content(["script", "style"]):
-                            script.decompose()
-                        result["about_us"] = main_content.get_text(separator='\n', strip=True)[:5000]
-        except Exception as e:
-            print(f"  「私たちについて」ページの取得に失敗: {e}")
-            # メインページから「私たちについて」の情報を探す
-            about_section = soup.find('div', {'data-testid': 'company-about'}) or \
-                           soup.find('section', class_='about') or \
-                           soup.find('div', class_='company-about')
-            if about_section:
-                for script in about_section(["script", "style"]):
-                    script.decompose()
-                result["about_us"] = about_section.get_text(separator='\n', strip=True)
+        if isinstance(about_html, Exception):
+            print(f"  {name}: 「私たちについて」ページの取得に失敗: {about_html}")
+            # 空文字やホームからの抜き出しを保存すると次回に偽の差分が出るので、取得失敗として履歴に残さない
+            result["about_us"] = None
+            result["errors"]["about_us"] = str(about_html)
+        elif about_html:
+            about_soup = BeautifulSoup(about_html, 'html.parser')
+            result["about_us"] = extract_section_text(about_soup, 'company-about', 'about')
         
         return result
         
     except Exception as e:
-        print(f"  エラー: {e}")
+        print(f"  {name}: エラー: {e}")
         return {
             "company_name": name,
             "url": url,
-            "home": f"エラー: {str(e)}",
-            "about_us": f"エラー: {str(e)}"
+            "home": None,
+            "about_us": None,
+            "errors": {"home": str(e), "about_us": str(e)}
         }
 
+
+def scrape_company(company_info, offline=False):
+    """企業のWantedlyページから情報をスクレイピング（offlineならキャッシュだけを使う）"""
+    return asyncio.run(scrape_company_async(company_info, HostRateLimiter(DEFAULT_RATE), offline))
+
+
+async def crawl(companies, rate=DEFAULT_RATE, concurrency=DEFAULT_CONCURRENCY, offline=False):
+    """企業リストを並列にスクレイピングし、リストと同じ順番で結果を返す"""
+    limiter = HostRateLimiter(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def run(company):
+        async with semaphore:
+            return await scrape_company_async(company, limiter, offline)
+    
+    tasks = [asyncio.create_task(run(company)) for company in companies]
+    for i, task in enumerate(asyncio.as_completed(tasks), 1):
+        result = await task
+        print(f"[{i}/{len(tasks)}] {result['company_name']}")
+    return [task.result() for task in tasks]
+
+
 def main():
     """メイン処理"""
-    results = []
+    parser = argparse.ArgumentParser(description="Wantedly企業ページをスクレイピング")
+    parser.add_argument("--companies", help="企業リストのCSV（name,url列）またはYAML（指定しない場合は組み込みの10社）")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="ホストごとの1秒あたりのリクエスト数")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="同時に処理する企業数")
+    parser.add_argument("--offline", action="store_true", help="ネットワークに出ずキャッシュだけで再解析")
+    parser.add_argument("--refresh", action="store_true", help="有効期限内のキャッシュも更新を確認する")
+    parser.add_argument("--no-history", action="store_true", help="スナップショット履歴に保存せず、差分レポートも作らない")
+    args = parser.parse_args()
+    if args.refresh:
+        cache.ttl = 0
+    
+    companies = load_companies(args.companies) if args.companies else COMPANIES
+    print(f"スクレイピング開始: {len(companies)}社（同時{args.concurrency}社 / 1ホストあたり{args.rate}件/秒）")
     
-    for company in COMPANIES:
-        result = scrape_company(company)
-        results.append(result)
-        time.sleep(2)  # リクエスト間隔を空ける
+    start = time.perf_counter()
+    results = asyncio.run(crawl(companies, args.rate, args.concurrency, args.offline))
+    elapsed = time.perf_counter() - start
     
     # 結果をJSONファイルに保存
     output_file = "wantedly_scraping_results.json"
@@ -159,31 +265,39 @@ def main():
     md_output_file = "wantedly_scraping_results.md"
     with open(md_output_file, 'w', encoding='utf-8') as f:
         f.write("# Wantedly企業ページ スクレイピング結果\n\n")
-        f.write("募集ページ上位10社の「ホーム」と「私たちについて」の情報\n\n")
+        f.write(f"募集ページ上位{len(results)}社の「ホーム」と「私たちについて」の情報\n\n")
         f.write("---\n\n")
         
         for result in results:
             f.write(f"## {result['company_name']}\n\n")
             f.write(f"**URL**: {result['url']}\n\n")
             
-            f.write("### ホーム\n\n")
-            if result['home']:
-                f.write(f"{result['home']}\n\n")
-            else:
-                f.write("（情報なし）\n\n")
-            
-            f.write("### 私たちについて\n\n")
-            if result['about_us']:
-                f.write(f"{result['about_us']}\n\n")
-            else:
-                f.write("（情報なし）\n\n")
+            for section, heading in SECTIONS.items():
+                f.write(f"### {heading}\n\n")
+                if result[section] is None:
+                    f.write(f"（取得失敗: {result['errors'][section]}）\n\n")
+                elif result[section]:
+                    f.write(f"{result[section]}\n\n")
+                else:
+                    f.write("（情報なし）\n\n")
             
             f.write("---\n\n")
     
+    # 前回から変わった企業・セクションだけを差分レポートに書き出す
+    changes_file = None
+    if not args.no_history:
+        store = SnapshotStore()
+        changes, unchanged, failed = store.record(results)
+        store.close()
+        changes_file = write_change_report(changes, unchanged, failed, "wantedly_changes.md")
+        print(f"\n変更 {len(changes)}件 / 変更なし {unchanged}件 / 取得失敗 {failed}件")
+    
     print(f"\n{'='*60}")
-    print("スクレイピング完了!")
+    print(f"スクレイピング完了! ({len(results)}社 / {elapsed:.1f}秒)")
     print(f"JSON形式: {output_file}")
     print(f"Markdown形式: {md_output_file}")
+    if changes_file:
+        print(f"変更レポート: {changes_file}")
     print(f"{'='*60}")
 
 if __name__ == "__main__":
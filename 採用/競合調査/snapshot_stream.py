@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ブラウザログのスナップショットを1行ずつ読むための共通処理
+ファイル全体を読み込まず、セクションごとに上限件数までテキストを集める（数百MBのファイルでもメモリは一定）
+セクションの区切りは snapshot_tree と同じで、インデントから見出しの範囲をたどる
+"""
+
+from snapshot_tree import iter_section_names
+
+
+def iter_lines(snapshot_file):
+    """スナップショットを1行ずつ返す（末尾の改行は除く）"""
+    with open(snapshot_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
+class SectionCollector:
+    """セクションごとにテキストを上限件数まで集める（dedupなら順序を保って重複を除く）"""
+
+    def __init__(self, sections, limit, dedup=False):
+        self.limit = limit
+        self.dedup = dedup
+        self.texts = {section: [] for section in sections}
+        self._seen = {section: set() for section in sections}
+
+    def add(self, section, text):
+        """テキストを追加（上限に達したセクション・重複は無視）"""
+        texts = self.texts.get(section)
+        if texts is None or len(texts) >= self.limit:
+            return
+        if self.dedup:
+            if text in self._seen[section]:
+                return
+            self._seen[section].add(text)
+        texts.append(text)
+
+    @property
+    def full(self):
+        """すべてのセクションが上限に達したか（以降の行は読まなくてよい）"""
+        return all(len(texts) >= self.limit for texts in self.texts.values())
+
+    def joined(self, section):
+        return '\n'.join(self.texts[section])
+
+
+def collect_sections(lines, collector, accept):
+    """
+    1回の走査でセクションごとのテキストを collector に集め、collector を返す
+
+    accept は名前を受け取り、集めるテキスト（集めないならNone）を返す。
+    「ホーム」は最初の main のうち「私たちについて」以外の部分（main がなければページ全体）。
+    """
+    page_home = SectionCollector(('home',), collector.limit, collector.dedup)
+    main_seen = False
+    for name, sections, in_main in iter_section_names(lines):
+        main_seen = main_seen or in_main
+        text = accept(name)
+        if text is None:
+            continue
+        for section in sections:
+            collector.add(section, text)
+        if 'about' not in sections:
+            if in_main:
+                collector.add('home', text)
+            elif not main_seen:
+                page_home.add('home', text)
+        if collector.full:
+            break
+    if not main_seen and 'home' in collector.texts:
+        collector.texts['home'] = page_home.texts['home']
+    return collector
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ブラウザログのスナップショット（アクセシビリティツリー）をツリーとして読み込む
+インデントから親子関係を組み立て、ノードを行きがけ順の配列で持つので、
+ノードの子孫は常に連続した範囲 [ノード, 部分木の終わり) になる
+ロール・見出しで区切ったセクションごとの索引を作り、セクションの抽出を範囲の読み出しで済ませる
+ツリーを持たずに同じセクションの区切りで1回だけ走査する iter_section_names もある（開いているノードの分だけメモリを使う）
+ノードの属性は、最初の子ノードか次のノードが始まるまでに書かれたものを読む
+
+対応する書式:
+    - role: link              # キーと値の形式（children: の下に子ノード）
+      name: ホーム
+    - link "ホーム" [ref=e5]:  # ロールと名前を1行に書く形式（末尾の : の下に子ノード）
+"""
+
+import re
+from collections import defaultdict
+
+ITEM_PATTERN = re.compile(r'^(\s*)- (.*)$')
+ATTR_PATTERN = re.compile(r'^(\s*)([A-Za-z_][\w-]*):(?:\s+(.*))?$')
+INLINE_NODE_PATTERN = re.compile(r'^([A-Za-z]+)(?: "((?:[^"\\]|\\.)*)")?')
+
+# ノードの属性として読むキー（それ以外の「キー: 値」で始まる項目は1行の書式として読む）
+NODE_KEYS = ('role', 'name')
+
+# 見出しの名前からセクションを判定するキーワード
+SECTION_KEYWORDS = {
+    'about': ('私たちについて', 'なにをやっているのか', 'なぜやるのか', 'どうやっているのか', 'こんなことやります'),
+    'members': ('メンバー',),
+    'jobs': ('募集',),
+    'stories': ('ストーリー',),
+    'company': ('会社情報',),
+}
+
+# 見出しがラッパー要素の中にある場合に、見出しとみなす深さ（ラッパーの先頭の子孫をたどる段数）
+HEADING_LOOKAHEAD = 3
+
+# iter_nodes が返すイベント
+OPEN = 'open'
+CLOSE = 'close'
+
+
+def parse_inline_node(body):
+    """「link "ホーム" [ref=e5]」「text: 本文」のような1行の書式から (ロール, 名前) を取り出す"""
+    inline = INLINE_NODE_PATTERN.match(body)
+    if not inline:
+        return '', ''
+    role = inline.group(1)
+    name = inline.group(2) or ''
+    rest = body[inline.end():]
+    if not name and rest.startswith(':'):
+        # 「paragraph: 本文」のように名前の代わりに本文が続く
+        name = unquote(rest[1:])
+    return role, name.replace('\\"', '"')
+
+
+def unquote(value):
+    """YAMLの引用符を外す"""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+        return value[1:-1]
+    return value
+
+
+def set_attr(node, key, value):
+    """[ロール, 名前] に属性を設定（role・name以外のキーは無視）"""
+    if value is None:
+        return
+    if key == 'role':
+        node[0] = unquote(value)
+    elif key == 'name':
+        node[1] = unquote(value)
+
+
+def iter_nodes(lines):
+    """
+    スナップショットの行を行きがけ順のイベントにする（1回の走査・開いているノードの分だけメモリを使う）
+
+    ノードの始まりは (OPEN, ロール, 名前)、終わりは (CLOSE, None, None)。
+    OPEN は属性を読み終えてから（最初の子ノードか次のノードの行で）返す。
+    """
+    indents = []  # 開いているノードのインデント
+    pending = None  # まだ返していない（属性を読んでいる）ノードの [ロール, 名前]
+
+    def close_until(indent):
+        while indents and indents[-1] >= indent:
+            indents.pop()
+            yield CLOSE, None, None
+
+    for line in lines:
+        item = ITEM_PATTERN.match(line)
+        if item:
+            if pending is not None:
+                yield OPEN, pending[0], pending[1]
+                pending = None
+            indent = len(item.group(1))
+            yield from close_until(indent)
+            body = item.group(2)
+            attr = ATTR_PATTERN.match(body)
+            if attr and attr.group(2) in NODE_KEYS:
+                pending = ['', '']
+                set_attr(pending, attr.group(2), attr.group(3))
+            else:
+                pending = list(parse_inline_node(body))
+            indents.append(indent)
+            continue
+
+        attr = ATTR_PATTERN.match(line)
+        if attr and indents and indents[-1] >= len(attr.group(1)):
+            # より浅いインデントの属性は外側のノードのもの（読み終えたノードへの属性は無視）
+            if pending is not None:
+                yield OPEN, pending[0], pending[1]
+                pending = None
+            yield from close_until(len(attr.group(1)))
+        elif attr and pending is not None:
+            set_attr(pending, attr.group(2), attr.group(3))
+
+    if pending is not None:
+        yield OPEN, pending[0], pending[1]
+    yield from close_until(-1)
+
+
+def classify(name):
+    """見出しの名前からセクションを判定（該当なしはNone）"""
+    for section, keywords in SECTION_KEYWORDS.items():
+        if any(keyword in name for keyword in keywords):
+            return section
+    return None
+
+
+class SnapshotTree:
+    """スナップショットのノードを行きがけ順の配列で持つツリー"""
+
+    def __init__(self):
+        self.roles = []
+        self.names = []
+        self.parents = []
+        self.ends = []  # 部分木の終わり（このノードの子孫は [i, ends[i]) ）
+        self.by_role = defaultdict(list)
+        self.sections = defaultdict(list)  # セクション名 -> [(開始, 終了)]
+
+    def __len__(self):
+        return len(self.roles)
+
+    def _add_node(self, parent, role, name):
+        node = len(self.roles)
+        self.roles.append(role)
+        self.names.append(name)
+        self.parents.append(parent)
+        self.ends.append(None)
+        return node
+
+    @classmethod
+    def parse(cls, lines):
+        """スナップショットの行からツリーを組み立てる（1回の走査）"""
+        tree = cls()
+        stack = []  # 開いているノード
+        for event, role, name in iter_nodes(lines):
+            if event == OPEN:
+                stack.append(tree._add_node(stack[-1] if stack else -1, role, name))
+            else:
+                tree.ends[stack.pop()] = len(tree.roles)
+        tree._build_indexes()
+        return tree
+
+    def _build_indexes(self):
+        """ロールごとのノードと、見出しで区切ったセクションの範囲の索引を作る"""
+        for node, role in enumerate(self.roles):
+            self.by_role[role].append(node)
+        for heading in self.by_role.get('heading', []):
+            section = classify(self.names[heading])
+            if section:
+                self.sections[section].append(self.section_range(heading))
+
+    def starts_with_heading(self, node):
+        """ノード自身か、その先頭の子孫（数段まで）が見出しか"""
+        for _ in range(HEADING_LOOKAHEAD + 1):
+            if self.roles[node] == 'heading':
+                return True
+            child = node + 1
+            if child >= self.ends[node]:
+                return False
+            node = child
+        return False
+
+    def section_range(self, heading):
+        """見出しから、次の見出しが始まる兄弟の手前までの範囲"""
+        # 見出しがラッパーの唯一の要素なら、ラッパーを起点に兄弟をたどる
+        anchor = heading
+        parent = self.parents[anchor]
+        while parent >= 0 and self.ends[anchor] == self.ends[parent] and anchor == parent + 1:
+            anchor, parent = parent, self.parents[parent]
+
+        stop = self.ends[parent] if parent >= 0 else len(self.roles)
+        sibling = self.ends[anchor]
+        while sibling < stop and not self.starts_with_heading(sibling):
+            sibling = self.ends[sibling]
+        return anchor, sibling
+
+    def subtree(self, node):
+        """ノードとその子孫の範囲"""
+        return node, self.ends[node]
+
+    def without(self, outer, ranges):
+        """範囲 outer から ranges に含まれる部分を除いた範囲のリスト"""
+        start, end = outer
+        result = []
+        for inner_start, inner_end in sorted(ranges):
+            if inner_end <= start or inner_start >= end:
+                continue
+            if inner_start > start:
+                result.append((start, inner_start))
+            start = max(start, inner_end)
+        if start < end:
+            result.append((start, end))
+        return result
+
+    def iter_names(self, ranges):
+        """範囲内のノードの名前を順に返す（空の名前は除く）"""
+        for start, end in ranges:
+            for name in self.names[start:end]:
+                if name:
+                    yield name
+
+    def section_names(self, section):
+        """セクションに含まれるノードの名前（索引を引き、その範囲だけを読む）"""
+        return self.iter_names(self.sections.get(section, []))
+
+
+_NO_HEADING = object()
+
+
+class _Level:
+    """iter_section_names で開いているノード1つ分の状態"""
+
+    __slots__ = ('section', 'children', 'heading', 'carry', 'in_main')
+
+    def __init__(self, in_main=False, heading=False, carry=_NO_HEADING):
+        self.section = None  # 子の見出しがこの階層で始めたセクション（以降の兄弟とその子孫が属する）
+        self.children = 0
+        self.heading = heading
+        self.carry = carry  # 見出しだけを包む要素なら、その見出しのセクション
+        self.in_main = in_main
+
+
+def iter_section_names(lines):
+    """
+    ツリーを作らずに1回の走査で、ノードの名前ごとに (名前, 属するセクションの集合, 最初のmainの中か) を返す
+
+    セクションの区切りは SnapshotTree.section_range と同じ（見出しから、見出しで始まる次の兄弟の手前まで。
+    見出しだけを包む要素は外側へたどる）。開いているノードの分だけ状態を持つので、メモリはファイルの大きさによらない。
+    見出しを含む要素自身の名前は見出しより前に読むので、ツリーと違って外側のセクションのものとして返す。
+    """
+    root = _Level()
+    stack = [root]
+    main_seen = False
+
+    for event, role, name in iter_nodes(lines):
+        parent = stack[-1]
+        if event == CLOSE:
+            level = stack.pop()
+            parent = stack[-1]
+            if level.carry is not _NO_HEADING and (level.heading or level.children == 1):
+                # 見出しだけを包む要素なら、セクションは外側の階層の以降の兄弟に続く
+                parent.section = level.carry
+                if parent.children == 1 and not parent.heading:
+                    parent.carry = level.carry
+            continue
+
+        parent.children += 1
+        in_main = parent.in_main
+        if role == 'main' and not main_seen:
+            main_seen = in_main = True
+
+        if role == 'heading':
+            section = classify(name)
+            level = _Level(in_main, heading=True, carry=section)
+            parent.section = section
+            # 見出しで始まる祖先（先頭の子孫を HEADING_LOOKAHEAD 段まで）があれば、その外側ではそれまでのセクションが終わる
+            first = parent.children == 1
+            for depth in range(1, HEADING_LOOKAHEAD + 1):
+                if not first or depth >= len(stack) or stack[-depth].heading:
+                    break
+                outer = stack[-depth - 1]
+                outer.section = None
+                first = outer.children == 1
+        else:
+            level = _Level(in_main)
+
+        if name:
+            yield name, {l.section for l in stack if l.section}, in_main
+        stack.append(level)
+
+
+def load_snapshot(snapshot_file):
+    """スナップショットファイルをツリーとして読み込む"""
+    with open(snapshot_file, 'r', encoding='utf-8') as f:
+        return SnapshotTree.parse(line.rstrip('\n') for line in f)
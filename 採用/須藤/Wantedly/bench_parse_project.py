@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+求人ページHTMLのパース時間のベンチマーク
+従来のBeautifulSoup版と、lxmlで1回だけ走査する現在の parse_project_html を比較し、結果が一致するか確認する
+
+使い方:
+    python bench_parse_project.py                          # 合成した求人ページで比較
+    python bench_parse_project.py fixtures/ page.html      # 保存したHTML（フォルダなら*.html）で比較
+"""
+
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from scrape_wantedly import clean_text, parse_project_html
+
+
+def legacy_parse_project_html(html):
+    """比較用: BeautifulSoup（html.parser）で何度も木を走査していた従来の実装"""
+    # BeautifulSoupでパース
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # データを抽出
+    data = {}
+    
+    # タイトル
+    title_elem = soup.select_one('h1[data-testid="project-title"], h1.project-title, h1')
+    data['title'] = clean_text(title_elem.get_text()) if title_elem else ""
+    
+    # 会社名
+    company_elem = soup.select_one('a[href*="/companies/"], .company-name')
+    data['company'] = clean_text(company_elem.get_text()) if company_elem else ""
+    
+    # オープンポジションかどうか
+    open_position_elem = soup.find(string=re.compile('オープンポジション'))
+    data['is_open_position'] = open_position_elem is not None
+    
+    # エントリー数
+    entry_elem = soup.find(string=re.compile('エントリー'))
+    if entry_elem:
+        entry_text = entry_elem.find_parent().get_text() if hasattr(entry_elem, 'find_parent') else str(entry_elem)
+        entry_match = re.search(r'(\d+)\s*エントリー', entry_text)
+        data['entry_count'] = entry_match.group(1) if entry_match else ""
+    else:
+        data['entry_count'] = ""
+    
+    # メンバー情報
+    members = []
+    member_elems = soup.select('[data-testid="member-card"], .member-card, .project-member')
+    for member_elem in member_elems[:10]:  # 最初の10人まで
+        member_name = ""
+        member_role = ""
+        member_story_link = ""
+        
+        name_elem = member_elem.select_one('h3, .member-name, [data-testid="member-name"]')
+        if name_elem:
+            member_name = clean_text(name_elem.get_text())
+        
+        role_elem = member_elem.select_one('.member-role, [data-testid="member-role"]')
+        if role_elem:
+            member_role = clean_text(role_elem.get_text())
+        
+        story_link_elem = member_elem.select_one('a[href*="/stories/"]')
+        if story_link_elem:
+            member_story_link = story_link_elem.get('href', '')
+            if not member_story_link.startswith('http'):
+                member_story_link = f"https://www.wantedly.com{member_story_link}"
+        
+        if member_name:
+            members.append({
+                'name': member_name,
+                'role': member_role,
+                'story_link': member_story_link
+            })
+    
+    data['members'] = members
+    
+    # プロジェクトの説明（「なにをやっているのか」セクション）
+    description_sections = []
+    
+    # セクションタイトルと内容を抽出
+    section_titles = soup.select('h2, h3, [class*="section-title"], [class*="heading"]')
+    for title_elem in section_titles:
+        title_text = clean_text(title_elem.get_text())
+        if not title_text:
+            continue
+        
+        # 次の要素から内容を取得
+        content = []
+        next_elem = title_elem.find_next_sibling()
+        while next_elem and next_elem.name not in ['h2', 'h3', 'h1']:
+            if next_elem.name == 'p':
+                text = clean_text(next_elem.get_text())
+                if text:
+                    content.append(text)
+            elif next_elem.name == 'ul':
+                items = []
+                for li in next_elem.select('li'):
+                    item_text = clean_text(li.get_text())
+                    if item_text:
+                        items.append(f"- {item_text}")
+                if items:
+                    content.append('\n'.join(items))
+            next_elem = next_elem.find_next_sibling()
+        
+        if content:
+            description_sections.append({
+                'title': title_text,
+                'content': '\n\n'.join(content)
+            })
+    
+    data['description_sections'] = description_sections
+    
+    # 募集要項（「こんなことやります」セクション）
+    job_description = ""
+    job_desc_elem = soup.select_one('[class*="job-description"], [class*="project-description"], .project-content')
+    if job_desc_elem:
+        job_description = clean_text(job_desc_elem.get_text())
+    
+    data['job_description'] = job_description
+    
+    # 求める人物像
+    requirements = []
+    req_elem = soup.find(string=re.compile('求める人物像|こんな方におすすめ'))
+    if req_elem:
+        req_parent = req_elem.find_parent() if hasattr(req_elem, 'find_parent') else None
+        if req_parent:
+            req_items = req_parent.find_all('li')
+            for item in req_items:
+                req_text = clean_text(item.get_text())
+                if req_text:
+                    requirements.append(req_text)
+    
+    data['requirements'] = requirements
+    
+    # 生のHTMLも保存（念のため）
+    data['raw_html'] = html
+    
+    return data
+
+
+def make_project_html(n_sections=40, n_members=12, seed=0):
+    """合成の求人ページHTMLを生成（Wantedlyの求人ページと同じ要素構成）"""
+    rng = random.Random(seed)
+    words = ["マーケティング", "SEO", "コンテンツ", "分析", "改善", "チーム", "成長", "顧客", "提案", "運用"]
+
+    def sentence():
+        return "、".join(rng.choice(words) for _ in range(rng.randint(5, 20))) + "。"
+
+    parts = ['<!DOCTYPE html><html><head><title>求人</title>',
+             '<script>window.__DATA__ = {"label": "エントリー"};</script><style>.x{}</style></head><body>',
+             '<header><nav>' + "".join(f'<a href="/nav/{i}">メニュー{i}</a>' for i in range(30)) + '</nav></header>',
+             '<h1 data-testid="project-title">マーケティングコンサルタント募集</h1>',
+             '<a href="/companies/kaaan">株式会社KAAAN</a><span>オープンポジション</span>',
+             '<div class="project-meta"><span>42 エントリー</span></div><div class="members">']
+    for i in range(n_members):
+        parts.append(f'<div class="member-card"><img src="/m{i}.png"><h3>メンバー{i}</h3>'
+                     f'<div class="member-role">役職{i}</div><a href="/stories/{i}">ストーリー</a></div>')
+    parts.append('</div><div class="project-description">')
+    for i in range(n_sections):
+        parts.append(f'<h2 class="section-heading">セクション{i}</h2>')
+        for _ in range(rng.randint(1, 4)):
+            parts.append(f'<p>{sentence()}</p><!-- note -->')
+        if rng.random() < 0.5:
+            parts.append('<ul>' + "".join(f'<li>{sentence()}</li>' for _ in range(rng.randint(2, 6))) + '</ul>')
+    parts.append('</div><div><h3>求める人物像</h3><ul>')
+    parts.append("".join(f'<li>{sentence()}</li>' for _ in range(5)))
+    parts.append('</ul></div><footer>' + "".join(f'<p>{sentence()}</p>' for _ in range(50)) + '</footer></body></html>')
+    return "".join(parts)
+
+
+def load_fixtures(paths):
+    """指定されたファイル・フォルダ（*.html）からHTMLを読み込む"""
+    fixtures = []
+    for path in map(Path, paths):
+        files = sorted(path.glob("*.html")) if path.is_dir() else [path]
+        for file_path in files:
+            fixtures.append((file_path.name, file_path.read_text(encoding="utf-8", errors="ignore")))
+    return fixtures
+
+
+def best_time(func, html, repeat):
+    """repeat回実行した最短時間（秒）"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="求人ページHTMLのパース時間のベンチマーク")
+    parser.add_argument("fixtures", nargs="*", help="保存したHTMLファイルまたはフォルダ")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else [("合成ページ", make_project_html())]
+
+    legacy_total = current_total = 0.0
+    mismatches = 0
+    for name, html in fixtures:
+        legacy = legacy_parse_project_html(html)
+        current = parse_project_html(html)
+        identical = legacy == current
+        mismatches += not identical
+
+        legacy_time = best_time(legacy_parse_project_html, html, args.repeat)
+        current_time = best_time(parse_project_html, html, args.repeat)
+        legacy_total += legacy_time
+        current_total += current_time
+        print(f"{name} ({len(html) / 1024:,.0f} KB): BeautifulSoup {legacy_time * 1000:.1f} ms / "
+              f"lxml {current_time * 1000:.1f} ms / 結果一致: {'OK' if identical else 'NG'}")
+        if not identical:
+            for key in legacy:
+                if legacy[key] != current.get(key):
+                    print(f"    差分: {key}")
+
+    if legacy_total and current_total:
+        print(f"\n合計: BeautifulSoup {legacy_total * 1000:.1f} ms / lxml {current_total * 1000:.1f} ms "
+              f"（{legacy_total / current_total:.1f}倍）")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,68 @@
 """
 Wantedly求人ページスクレイピングスクリプト
 須藤さんが見た求人ページの内容を取得してMarkdownファイルに保存
+
+使い方:
+    python scrape_wantedly.py                                   # 須藤さんが見た求人を取得
+    python scrape_wantedly.py URL [URL ...] --concurrency 4     # 複数URLを並列に取得
+    python scrape_wantedly.py --urls-file urls.txt              # ファイル（1行1URL）から取得
+    python scrape_wantedly.py URL --no-block                    # 画像・フォント等もすべて読み込む（比較用）
+    python scrape_wantedly.py URL --offline                     # キャッシュしたHTMLだけで再解析
 """
 
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+from lxml import etree
+import lxml.html
 import re
+import sys
+import time
+import asyncio
+import argparse
+from urllib.parse import urlsplit
 from datetime import datetime
 from pathlib import Path
 
+# 共通のページキャッシュ（scripts/page_cache.py）を読み込む
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "scripts"))
+from page_cache import PageCache
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# ページの読み込み完了とみなす最低限の要素（求人タイトル）
+READY_SELECTOR = 'h1'
+# parse_project_html が読む本文の要素（メンバー・見出し・募集要項）。タイトルより後に描画されることがある
+CONTENT_SELECTOR = ', '.join([
+    "[data-testid='member-card']", '.member-card', '.project-member',
+    '.job-description', '.project-description', '.project-content', 'h2', 'h3',
+])
+PAGE_TIMEOUT = 60000
+# 本文の要素を待つ時間と、見つからないときに通信が落ち着くまで待つ時間（ミリ秒）
+CONTENT_TIMEOUT = 10000
+NETWORKIDLE_TIMEOUT = 10000
+
+# 複数URLを取得するときの同時に開くページ数
+DEFAULT_CONCURRENCY = 4
+
+# 抽出するメンバーの最大人数
+MAX_MEMBERS = 10
+
+# セクションの終わりとみなす見出し
+SECTION_END_TAGS = {'h1', 'h2', 'h3'}
+# get_text()で本文として扱わない要素
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+ENTRY_COUNT_PATTERN = re.compile(r'(\d+)\s*エントリー')
+REQUIREMENTS_PATTERN = re.compile('求める人物像|こんな方におすすめ')
+
+# 取得したHTMLのキャッシュ（有効期限内はブラウザを起動しない）
+cache = PageCache()
+
+# 解析に使わないため読み込みを止めるリソースの種類
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+# 読み込みを許可するドメイン（それ以外のドメインの解析タグ・広告などは止める）
+ALLOWED_DOMAINS = ('wantedly.com',)
+
 
 def clean_text(text):
     """テキストをクリーンアップ"""
@@ -20,160 +74,314 @@ def clean_text(text):
     return text
 
 
-def scrape_wantedly_project(url: str, output_path: str = None):
+def is_blocked_request(url, resource_type):
+    """読み込みを止めるリクエスト（画像・フォント・動画、Wantedly以外のドメイン）か判定"""
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https'):
+        return False
+    host = parts.hostname or ''
+    return not any(host == domain or host.endswith('.' + domain) for domain in ALLOWED_DOMAINS)
+
+
+def new_load_stats():
+    """1ページ分の読み込み統計（リクエスト数・ブロック数・転送バイト数・秒数）"""
+    return {'requests': 0, 'blocked': 0, 'bytes': 0, 'seconds': 0.0}
+
+
+def format_load_stats(stats):
+    """読み込み統計を1行で表示用に整形"""
+    return (f"{stats['bytes'] / 1024:,.0f} KB / {stats['requests']}リクエスト"
+            f"（ブロック {stats['blocked']}件） / {stats['seconds']:.1f}秒")
+
+
+def attach_resource_filter(page, stats, block_resources=True):
+    """ページに不要リソースのブロックと転送量の計測を設定"""
+    def on_route(route):
+        request = route.request
+        if is_blocked_request(request.url, request.resource_type):
+            stats['blocked'] += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    def on_request_finished(request):
+        try:
+            sizes = request.sizes()
+        except Exception:
+            return
+        stats['requests'] += 1
+        stats['bytes'] += sizes['responseHeadersSize'] + sizes['responseBodySize']
+
+    if block_resources:
+        page.route('**/*', on_route)
+    page.on('requestfinished', on_request_finished)
+
+
+async def attach_resource_filter_async(page, stats, block_resources=True):
+    """attach_resource_filter の非同期版"""
+    async def on_route(route):
+        request = route.request
+        if is_blocked_request(request.url, request.resource_type):
+            stats['blocked'] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def on_request_finished(request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        stats['requests'] += 1
+        stats['bytes'] += sizes['responseHeadersSize'] + sizes['responseBodySize']
+
+    if block_resources:
+        await page.route('**/*', on_route)
+    page.on('requestfinished', on_request_finished)
+
+
+def load_project_page(page, url, stats=None):
     """
-    Wantedlyの求人ページをスクレイピング
+    求人ページを開き、本文が描画されたらHTMLを返す（statsがあれば読み込み統計を記録）
     
-    Args:
-        url: WantedlyのプロジェクトURL
-        output_path: 出力先ファイルパス（指定しない場合は自動生成）
+    タイトル（h1）を待ったあと、parse_project_html が読む本文の要素を待つ。
+    本文の要素が時間内に現れないページでは、通信が落ち着くまで（最大 NETWORKIDLE_TIMEOUT）待つ。
     """
-    if output_path is None:
-        output_dir = Path(__file__).parent
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = output_dir / f"Wantedly求人_スクレイピング結果_{timestamp}.md"
+    if stats is not None:
+        stats.update(new_load_stats())
+    start = time.perf_counter()
+    page.goto(url, wait_until="domcontentloaded", timeout=PAGE_TIMEOUT)
+    page.wait_for_selector(READY_SELECTOR, timeout=PAGE_TIMEOUT)
+    try:
+        page.wait_for_selector(CONTENT_SELECTOR, timeout=CONTENT_TIMEOUT)
+    except PlaywrightTimeoutError:
+        try:
+            page.wait_for_load_state("networkidle", timeout=NETWORKIDLE_TIMEOUT)
+        except PlaywrightTimeoutError:
+            pass
+    html = page.content()
+    if stats is not None:
+        stats['seconds'] = time.perf_counter() - start
+    return html
+
+
+async def load_project_page_async(page, url, stats=None):
+    """load_project_page の非同期版"""
+    if stats is not None:
+        stats.update(new_load_stats())
+    start = time.perf_counter()
+    await page.goto(url, wait_until="domcontentloaded", timeout=PAGE_TIMEOUT)
+    await page.wait_for_selector(READY_SELECTOR, timeout=PAGE_TIMEOUT)
+    try:
+        await page.wait_for_selector(CONTENT_SELECTOR, timeout=CONTENT_TIMEOUT)
+    except PlaywrightTimeoutError:
+        try:
+            await page.wait_for_load_state("networkidle", timeout=NETWORKIDLE_TIMEOUT)
+        except PlaywrightTimeoutError:
+            pass
+    html = await page.content()
+    if stats is not None:
+        stats['seconds'] = time.perf_counter() - start
+    return html
+
+
+def get_text(elem):
+    """BeautifulSoupのget_text()と同じく、script・style・templateとコメントを除いたテキストを返す"""
+    parts = []
+    _collect_text(elem, parts)
+    return ''.join(parts)
+
+
+def _collect_text(elem, parts):
+    if elem.text and isinstance(elem.tag, str):
+        parts.append(elem.text)
+    for child in elem:
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def _class_attr(elem):
+    """class属性を空白1つ区切りに正規化した文字列"""
+    return ' '.join(elem.get('class', '').split())
+
+
+def _next_element_sibling(elem):
+    """次の兄弟要素（コメントは飛ばす）"""
+    elem = elem.getnext()
+    while elem is not None and not isinstance(elem.tag, str):
+        elem = elem.getnext()
+    return elem
+
+
+def _parse_member(member_elem):
+    """メンバーカードから名前・役職・ストーリーのリンクを取り出す"""
+    name_elem = role_elem = story_link_elem = None
+    for elem in member_elem.iterdescendants():
+        if not isinstance(elem.tag, str):
+            continue
+        classes = _class_attr(elem).split()
+        testid = elem.get('data-testid')
+        if name_elem is None and (elem.tag == 'h3' or 'member-name' in classes or testid == 'member-name'):
+            name_elem = elem
+        if role_elem is None and ('member-role' in classes or testid == 'member-role'):
+            role_elem = elem
+        if story_link_elem is None and elem.tag == 'a' and '/stories/' in elem.get('href', ''):
+            story_link_elem = elem
+
+    member_story_link = ""
+    if story_link_elem is not None:
+        member_story_link = story_link_elem.get('href', '')
+        if not member_story_link.startswith('http'):
+            member_story_link = f"https://www.wantedly.com{member_story_link}"
+    return {
+        'name': clean_text(get_text(name_elem)) if name_elem is not None else "",
+        'role': clean_text(get_text(role_elem)) if role_elem is not None else "",
+        'story_link': member_story_link,
+    }
+
+
+def _section_content(title_elem):
+    """見出しの後ろに続く段落・リストを次の見出しまで集める"""
+    content = []
+    next_elem = _next_element_sibling(title_elem)
+    while next_elem is not None and next_elem.tag not in SECTION_END_TAGS:
+        if next_elem.tag == 'p':
+            text = clean_text(get_text(next_elem))
+            if text:
+                content.append(text)
+        elif next_elem.tag == 'ul':
+            items = []
+            for li in next_elem.iterdescendants('li'):
+                item_text = clean_text(get_text(li))
+                if item_text:
+                    items.append(f"- {item_text}")
+            if items:
+                content.append('\n'.join(items))
+        next_elem = _next_element_sibling(next_elem)
+    return content
+
+
+def parse_project_html(html):
+    """
+    求人ページのHTMLから情報を抽出
     
-    print(f"スクレイピング開始: {url}")
+    lxmlでパースし、文書を1回走査するあいだにタイトル・会社名・エントリー数・メンバー・
+    見出し・募集要項・求める人物像の要素を見つける（以前のBeautifulSoup版と同じ結果を返す）。
+    """
+    title_elem = company_elem = job_desc_elem = None
+    entry_parent = req_parent = None
+    is_open_position = False
+    member_elems = []
+    section_elems = []
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        
-        # User-Agentを設定
-        page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
-        
-        # ページにアクセス
-        page.goto(url, wait_until="networkidle", timeout=60000)
+    root = lxml.html.document_fromstring(html) if html.strip() else None
+    events = etree.iterwalk(root, events=('start', 'end', 'comment', 'pi')) if root is not None else ()
+    for event, elem in events:
+        if event == 'end':
+            # 閉じタグの後ろのテキストは親要素に属する
+            strings = ((elem.tail, elem.getparent()),)
+        elif event != 'start':
+            # コメント（BeautifulSoupの文字列検索ではコメントも対象）
+            strings = ((elem.text, elem.getparent()), (elem.tail, elem.getparent()))
+        else:
+            tag = elem.tag
+            class_attr = _class_attr(elem)
+            classes = class_attr.split()
+            
+            if title_elem is None and tag == 'h1':
+                title_elem = elem
+            if company_elem is None and (
+                (tag == 'a' and '/companies/' in elem.get('href', '')) or 'company-name' in classes
+            ):
+                company_elem = elem
+            if len(member_elems) < MAX_MEMBERS and (
+                elem.get('data-testid') == 'member-card' or 'member-card' in classes or 'project-member' in classes
+            ):
+                member_elems.append(elem)
+            if tag in ('h2', 'h3') or 'section-title' in class_attr or 'heading' in class_attr:
+                section_elems.append(elem)
+            if job_desc_elem is None and (
+                'job-description' in class_attr or 'project-description' in class_attr or 'project-content' in classes
+            ):
+                job_desc_elem = elem
+            strings = ((elem.text, elem),)
         
-        # コンテンツが読み込まれるまで少し待機
-        page.wait_for_timeout(3000)
-        
-        # HTMLを取得
-        html = page.content()
-        browser.close()
-    
-    # BeautifulSoupでパース
-    soup = BeautifulSoup(html, 'html.parser')
+        for text, parent in strings:
+            if not text:
+                continue
+            if not is_open_position and 'オープンポジション' in text:
+                is_open_position = True
+            if entry_parent is None and 'エントリー' in text:
+                entry_parent = parent
+            if req_parent is None and REQUIREMENTS_PATTERN.search(text):
+                req_parent = parent
     
-    # データを抽出
     data = {}
     
-    # タイトル
-    title_elem = soup.select_one('h1[data-testid="project-title"], h1.project-title, h1')
-    data['title'] = clean_text(title_elem.get_text()) if title_elem else ""
-    
-    # 会社名
-    company_elem = soup.select_one('a[href*="/companies/"], .company-name')
-    data['company'] = clean_text(company_elem.get_text()) if company_elem else ""
+    # タイトル・会社名
+    data['title'] = clean_text(get_text(title_elem)) if title_elem is not None else ""
+    data['company'] = clean_text(get_text(company_elem)) if company_elem is not None else ""
     
     # オープンポジションかどうか
-    open_position_elem = soup.find(string=re.compile('オープンポジション'))
-    data['is_open_position'] = open_position_elem is not None
+    data['is_open_position'] = is_open_position
     
     # エントリー数
-    entry_elem = soup.find(string=re.compile('エントリー'))
-    if entry_elem:
-        entry_text = entry_elem.find_parent().get_text() if hasattr(entry_elem, 'find_parent') else str(entry_elem)
-        entry_match = re.search(r'(\d+)\s*エントリー', entry_text)
-        data['entry_count'] = entry_match.group(1) if entry_match else ""
-    else:
-        data['entry_count'] = ""
-    
-    # メンバー情報
-    members = []
-    member_elems = soup.select('[data-testid="member-card"], .member-card, .project-member')
-    for member_elem in member_elems[:10]:  # 最初の10人まで
-        member_name = ""
-        member_role = ""
-        member_story_link = ""
-        
-        name_elem = member_elem.select_one('h3, .member-name, [data-testid="member-name"]')
-        if name_elem:
-            member_name = clean_text(name_elem.get_text())
-        
-        role_elem = member_elem.select_one('.member-role, [data-testid="member-role"]')
-        if role_elem:
-            member_role = clean_text(role_elem.get_text())
-        
-        story_link_elem = member_elem.select_one('a[href*="/stories/"]')
-        if story_link_elem:
-            member_story_link = story_link_elem.get('href', '')
-            if not member_story_link.startswith('http'):
-                member_story_link = f"https://www.wantedly.com{member_story_link}"
-        
-        if member_name:
-            members.append({
-                'name': member_name,
-                'role': member_role,
-                'story_link': member_story_link
-            })
+    entry_match = ENTRY_COUNT_PATTERN.search(get_text(entry_parent)) if entry_parent is not None else None
+    data['entry_count'] = entry_match.group(1) if entry_match else ""
     
-    data['members'] = members
+    # メンバー情報（名前があるものだけ）
+    data['members'] = [m for m in map(_parse_member, member_elems) if m['name']]
     
-    # プロジェクトの説明（「なにをやっているのか」セクション）
+    # プロジェクトの説明（見出しごとのセクション）
     description_sections = []
-    
-    # セクションタイトルと内容を抽出
-    section_titles = soup.select('h2, h3, [class*="section-title"], [class*="heading"]')
-    for title_elem in section_titles:
-        title_text = clean_text(title_elem.get_text())
+    for title_elem in section_elems:
+        title_text = clean_text(get_text(title_elem))
         if not title_text:
             continue
-        
-        # 次の要素から内容を取得
-        content = []
-        next_elem = title_elem.find_next_sibling()
-        while next_elem and next_elem.name not in ['h2', 'h3', 'h1']:
-            if next_elem.name == 'p':
-                text = clean_text(next_elem.get_text())
-                if text:
-                    content.append(text)
-            elif next_elem.name == 'ul':
-                items = []
-                for li in next_elem.select('li'):
-                    item_text = clean_text(li.get_text())
-                    if item_text:
-                        items.append(f"- {item_text}")
-                if items:
-                    content.append('\n'.join(items))
-            next_elem = next_elem.find_next_sibling()
-        
+        content = _section_content(title_elem)
         if content:
             description_sections.append({
                 'title': title_text,
                 'content': '\n\n'.join(content)
             })
-    
     data['description_sections'] = description_sections
     
-    # 募集要項（「こんなことやります」セクション）
-    job_description = ""
-    job_desc_elem = soup.select_one('[class*="job-description"], [class*="project-description"], .project-content')
-    if job_desc_elem:
-        job_description = clean_text(job_desc_elem.get_text())
-    
-    data['job_description'] = job_description
+    # 募集要項
+    data['job_description'] = clean_text(get_text(job_desc_elem)) if job_desc_elem is not None else ""
     
     # 求める人物像
     requirements = []
-    req_elem = soup.find(string=re.compile('求める人物像|こんな方におすすめ'))
-    if req_elem:
-        req_parent = req_elem.find_parent() if hasattr(req_elem, 'find_parent') else None
-        if req_parent:
-            req_items = req_parent.find_all('li')
-            for item in req_items:
-                req_text = clean_text(item.get_text())
-                if req_text:
-                    requirements.append(req_text)
-    
+    if req_parent is not None:
+        for item in req_parent.iterdescendants('li'):
+            req_text = clean_text(get_text(item))
+            if req_text:
+                requirements.append(req_text)
     data['requirements'] = requirements
     
     # 生のHTMLも保存（念のため）
     data['raw_html'] = html
     
-    # Markdownファイルに出力
+    return data
+
+
+def load_cached_project(url, offline=False):
+    """有効期限内（offlineなら期限切れでも）のキャッシュがあれば (HTML, ハッシュ) を返す"""
+    entry = cache.lookup(url)
+    if entry is not None and (offline or cache.is_fresh(entry)):
+        html = cache.read(entry['hash'])
+        if html is not None:
+            return html, entry['hash']
+    if offline:
+        raise LookupError(f"キャッシュにありません: {url}")
+    return None
+
+
+def write_project_markdown(url, data, output_path, html_hash):
+    """抽出結果をMarkdownファイルに出力（生HTMLはキャッシュのハッシュで参照する）"""
     output_path = Path(output_path)
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(f"# Wantedly求人ページスクレイピング結果\n\n")
@@ -214,25 +422,219 @@ def scrape_wantedly_project(url: str, output_path: str = None):
         
         f.write("---\n\n")
         f.write("## 生HTML（参考用）\n\n")
-        f.write("<details>\n<summary>HTMLを表示</summary>\n\n")
-        f.write("```html\n")
-        f.write(html[:50000])  # 最初の50000文字のみ
-        f.write("\n```\n\n")
-        f.write("</details>\n")
+        f.write(f"- **キャッシュ**: `{html_hash}`\n")
+        f.write(f"- **表示**: `python scripts/page_cache.py show {html_hash[:12]}`\n")
+    
+    return output_path
+
+
+def scrape_wantedly_project(url: str, output_path: str = None, block_resources: bool = True,
+                            offline: bool = False):
+    """
+    Wantedlyの求人ページをスクレイピング
+    
+    Args:
+        url: WantedlyのプロジェクトURL
+        output_path: 出力先ファイルパス（指定しない場合は自動生成）
+        block_resources: 画像・フォント・外部ドメインの読み込みを止める
+        offline: ブラウザを起動せず、キャッシュしたHTMLだけを使う
+    """
+    if output_path is None:
+        output_dir = Path(__file__).parent
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = output_dir / f"Wantedly求人_スクレイピング結果_{timestamp}.md"
+    
+    print(f"スクレイピング開始: {url}")
+    
+    cached = load_cached_project(url, offline)
+    if cached:
+        html, html_hash = cached
+        print("読み込み: キャッシュを使用")
+    else:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            
+            # User-Agentを設定
+            page.set_extra_http_headers({'User-Agent': USER_AGENT})
+            
+            # 不要なリソースを止め、転送量を計測
+            stats = new_load_stats()
+            attach_resource_filter(page, stats, block_resources)
+            
+            # ページにアクセスし、タイトルが描画されたらHTMLを取得
+            html = load_project_page(page, url, stats)
+            browser.close()
+        
+        html_hash = cache.put(url, html)
+        print(f"読み込み: {format_load_stats(stats)}")
+    
+    data = parse_project_html(html)
+    output_path = write_project_markdown(url, data, output_path, html_hash)
     
     print(f"スクレイピング完了: {output_path}")
     return data, output_path
 
 
-if __name__ == "__main__":
-    url = "https://www.wantedly.com/projects/1061604"
-    output_path = Path(__file__).parent / "Wantedly求人_須藤さんが見た求人.md"
+def project_output_path(url, output_dir):
+    """URLの求人IDから出力先ファイルパスを生成"""
+    project_id = url.rstrip('/').rsplit('/', 1)[-1]
+    return Path(output_dir) / f"Wantedly求人_{project_id}.md"
+
+
+def save_project(url, html, html_hash, output_dir):
+    """HTMLを解析してMarkdownに書き出し、(data, 出力先) を返す"""
+    data = parse_project_html(html)
+    return data, write_project_markdown(url, data, project_output_path(url, output_dir), html_hash)
+
+
+async def iter_scrape_projects(urls, concurrency=DEFAULT_CONCURRENCY, output_dir=None, block_resources=True,
+                               offline=False):
+    """
+    複数の求人ページをスクレイピングし、終わったものから順に結果を返す
+    
+    ブラウザは1つだけ起動し、同時に開くページ（concurrency個）を使い回す。
+    有効期限内のキャッシュがあるページは読み込まない（offlineならブラウザ自体を起動しない）。
+    結果は {"url", "data", "output_path", "stats", "error"} の辞書（statsは読み込み統計、キャッシュ使用時はNone）。
+    """
+    output_dir = Path(output_dir) if output_dir else Path(__file__).parent
+    
+    if offline:
+        for url in urls:
+            result = {"url": url, "data": None, "output_path": None, "stats": None, "error": None}
+            try:
+                html, html_hash = load_cached_project(url, offline=True)
+                data, output_path = await asyncio.to_thread(save_project, url, html, html_hash, output_dir)
+                result.update(data=data, output_path=output_path)
+            except Exception as e:
+                result["error"] = str(e)
+            yield result
+        return
     
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    results = asyncio.Queue()
+    
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(user_agent=USER_AGENT)
+        
+        async def worker():
+            stats = new_load_stats()
+            try:
+                page = await context.new_page()
+                await attach_resource_filter_async(page, stats, block_resources)
+                page_error = None
+            except Exception as e:
+                page, page_error = None, e
+            
+            while not queue.empty():
+                url = queue.get_nowait()
+                result = {"url": url, "data": None, "output_path": None, "stats": None, "error": None}
+                try:
+                    cached = await asyncio.to_thread(load_cached_project, url)
+                    if cached:
+                        html, html_hash = cached
+                    else:
+                        if page is None:
+                            raise page_error
+                        html = await load_project_page_async(page, url, stats)
+                        result["stats"] = dict(stats)
+                        html_hash = await asyncio.to_thread(cache.put, url, html)
+                    # パース・書き出しは別スレッドで行い、その間も他のページの読み込みを進める
+                    data, output_path = await asyncio.to_thread(save_project, url, html, html_hash, output_dir)
+                    result.update(data=data, output_path=output_path)
+                except Exception as e:
+                    result["error"] = str(e)
+                await results.put(result)
+            
+            if page is not None:
+                await page.close()
+        
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(urls))))]
+        try:
+            for _ in range(len(urls)):
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await browser.close()
+
+
+def scrape_wantedly_projects(urls, concurrency=DEFAULT_CONCURRENCY, output_dir=None, block_resources=True,
+                             offline=False):
+    """iter_scrape_projects の同期版（終わったものから順に結果を返すジェネレータ）"""
+    loop = asyncio.new_event_loop()
+    results = iter_scrape_projects(urls, concurrency, output_dir, block_resources, offline)
     try:
-        data, saved_path = scrape_wantedly_project(url, str(output_path))
-        print(f"\n✅ 成功: {saved_path}")
-    except Exception as e:
-        print(f"\n❌ エラー: {e}")
-        import traceback
-        traceback.print_exc()
+        while True:
+            try:
+                yield loop.run_until_complete(results.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Wantedly求人ページをスクレイピング")
+    parser.add_argument("urls", nargs="*", help="求人ページのURL（複数指定可）")
+    parser.add_argument("--urls-file", help="URLを1行に1つずつ書いたファイル")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="同時に開くページ数")
+    parser.add_argument("--output-dir", help="出力先フォルダ（デフォルトはこのスクリプトと同じ場所）")
+    parser.add_argument("--no-block", action="store_true",
+                        help="画像・フォント・外部ドメインも読み込む（転送量の比較用）")
+    parser.add_argument("--offline", action="store_true",
+                        help="ブラウザを起動せず、キャッシュしたHTMLだけで再解析する")
+    parser.add_argument("--refresh", action="store_true", help="有効期限内のキャッシュがあっても読み込み直す")
+    return parser.parse_args()
 
+
+def main_multi(urls, concurrency, output_dir, block_resources=True, offline=False):
+    """複数URLを並列にスクレイピングし、終わった順に表示"""
+    print(f"スクレイピング開始: {len(urls)}件（同時{concurrency}ページ）")
+    failed = 0
+    total = new_load_stats()
+    results = scrape_wantedly_projects(urls, concurrency, output_dir, block_resources, offline)
+    for i, result in enumerate(results, 1):
+        if result["error"]:
+            failed += 1
+            print(f"[{i}/{len(urls)}] ❌ {result['url']}: {result['error']}")
+        else:
+            print(f"[{i}/{len(urls)}] ✅ {result['url']} -> {result['output_path']}")
+            if result['stats'] is None:
+                print("    キャッシュを使用")
+                continue
+            print(f"    {format_load_stats(result['stats'])}")
+            for key in total:
+                total[key] += result['stats'][key]
+    print(f"\n完了: 成功 {len(urls) - failed}件 / 失敗 {failed}件")
+    print(f"読み込み合計: {format_load_stats(total)}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.refresh:
+        cache.ttl = 0
+    urls = list(args.urls)
+    if args.urls_file:
+        with open(args.urls_file, encoding='utf-8') as f:
+            urls.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    
+    if urls:
+        main_multi(urls, args.concurrency, args.output_dir, not args.no_block, args.offline)
+    else:
+        url = "https://www.wantedly.com/projects/1061604"
+        output_path = Path(__file__).parent / "Wantedly求人_須藤さんが見た求人.md"
+        
+        try:
+            data, saved_path = scrape_wantedly_project(url, str(output_path), not args.no_block, args.offline)
+            print(f"\n✅ 成功: {saved_path}")
+        except Exception as e:
+            print(f"\n❌ エラー: {e}")
+            import traceback
+            traceback.print_exc()